@@ -18,9 +18,37 @@ from serpapi import GoogleSearch
 from collections import Counter
 import re
 import math
+import hashlib
 import spacy
 import openai
 import googlemaps
+from upstream_client import call_upstream, get_upstream_stats
+from serp_cache import SerpCache
+from locations import canonicalize_location
+import travel_times
+from travel_estimator import estimator as travel_estimator, CALIBRATION_ENABLED
+from reverse_geocoder import reverse_geocoder
+from geo_index import GeoGridIndex
+from cache_store import PersistentTTLCache
+from postings_store import PostingsStore, posting_id, title_core, salary_text as posting_salary_text
+from salary_stats import SalaryStats, parse_salary_texts, default_title_key
+from skill_ranking import SkillDocumentFrequency, rank_skills
+from skill_extractor import skill_extractor, get_skill_lexicon
+from industry_classifier import IndustryClassifier
+from typeahead import TypeaheadIndex, TYPEAHEAD_KINDS
+from spell_corrector import SpellCorrector
+from title_normalizer import TitleNormalizer
+from title_taxonomy import TitleTaxonomy
+from skill_taxonomy import SkillTaxonomy
+from phrase_clusters import dedup_phrases
+from skill_relevance import SkillRelevance
+from cascade_scorer import CascadeScorer, word_jaccard
+from topk_ranking import top_k
+from profile_store import ProfileStore, VersionConflict, InvalidVersion, DOCUMENT_KINDS
+from profile_vectors import embed_fields, cosine, unit
+from job_scoring import skill_names, document_jobs, map_phrases, pair_base_points, pair_skills_points, best_job_score, match_components
+from candidate_index import CandidateIndex, candidate_vector
+from availability import availability_mask, overlap_hours
 
 lock = threading.Lock()
 last_request_time = datetime.now() - timedelta(seconds=60)  # Initialize to allow immediate first request
@@ -110,6 +138,15 @@ industry_jobs = {
 # Load the English language model
 nlp = spacy.load('en_core_web_md')
 
+# Shared SerpApi response cache (persists across restarts)
+serp_cache = SerpCache()
+
+# Every google_jobs posting we pay for is kept for later skill/salary/title queries
+postings_store = PostingsStore(extract_skills=skill_extractor.extract_many)
+
+# Salary percentile tables per title x location, rebuilt from the corpus as it grows
+salary_stats = SalaryStats(postings_store)
+
 # Add after other environment variables
 GOOGLE_MAPS_API_KEY = os.getenv('GOOGLE_MAPS_API_KEY')
 gmaps = googlemaps.Client(key=GOOGLE_MAPS_API_KEY) if GOOGLE_MAPS_API_KEY else None
@@ -137,10 +174,12 @@ def generate_fallback_analysis(job_data, user_data):
     
     return " ".join(analysis)
 
-def make_openai_request(messages, max_tokens=300, temperature=0.7):
+def make_openai_request(messages, max_tokens=300, temperature=0.7, route='openai'):
     """Centralized function for making OpenAI API calls with error handling"""
     try:
-        response = client.chat.completions.create(
+        response = call_upstream(
+            f"{route}:openai",
+            client.chat.completions.create,
             model="gpt-3.5-turbo",
             messages=messages,
             temperature=temperature,
@@ -154,6 +193,33 @@ def make_openai_request(messages, max_tokens=300, temperature=0.7):
         print(f"Unexpected error in OpenAI request: {str(e)}")
         raise e
 
+def ingest_postings(jobs_results, params):
+    """Store fetched postings in the local corpus without failing the request"""
+    try:
+        added = postings_store.ingest(
+            jobs_results,
+            query=params.get('q'),
+            location_id=canonicalize_location(params.get('location')).id
+        )
+        print(f"Stored {added} new postings ({len(jobs_results)} fetched)")
+    except Exception as e:
+        print(f"Error storing postings: {str(e)}")
+
+def serp_search(params, route='serpapi', cache=True):
+    """Run a SerpApi search through the shared response cache and upstream client"""
+    def fetch():
+        results = call_upstream(
+            f"{route}:{params.get('engine', 'serpapi')}",
+            lambda: GoogleSearch(dict(params)).get_dict()
+        )
+        if params.get('engine') == 'google_jobs' and results.get('jobs_results'):
+            ingest_postings(results['jobs_results'], params)
+        return results
+
+    if not cache:
+        return fetch()
+    return serp_cache.get_or_fetch(params, fetch)
+
 def calculate_semantic_similarity(text1, text2):
     """Calculate semantic similarity between two texts using word embeddings"""
     if not text1 or not text2:
@@ -183,75 +249,34 @@ def analyze_pay_range(job_pay, user_prefs):
     except:
         return 0.0
 
+def text_match_components(job_data, user_data):
+    """Title, industry, skills and overview similarity for /analyze-job-match from raw documents"""
+    user_jobs = document_jobs('profile', user_data)
+    industry_prefs = [industry for industry in user_data.get('industryPrefs', []) if industry]
+    components = match_components(document_jobs('job', job_data)[0], user_jobs, industry_prefs, text_similarities)
+    overview_score = calculate_semantic_similarity(overview_text(job_data), overview_text(user_data))
+    return components['title'], components['industry'], components['skills'], overview_score
+
 @app.route('/analyze-job-match', methods=['POST'])
 def analyze_job_match():
     try:
         data = request.json
-        job_data = data.get('job', {})
-        user_data = data.get('user', {})
+        try:
+            job_data, job_derived = load_document(data, 'job', 'jobId', 'jobVersion', 'job')
+            user_data, user_derived = load_document(data, 'user', 'userId', 'userVersion', 'profile')
+        except DOCUMENT_ERRORS as e:
+            return document_error(e)
         
         # Initialize score components
-        title_score = 0.0
-        industry_score = 0.0
-        skills_score = 0.0
-        overview_score = 0.0
         pay_score = 0.0
         
-        # 1. Job Title Match (25%)
-        if job_data.get('jobTitle') and user_data.get('selectedJobs'):
-            title_similarities = [
-                calculate_semantic_similarity(
-                    job_data['jobTitle'],
-                    user_job.get('title', '')
-                )
-                for user_job in user_data['selectedJobs']
-            ]
-            title_score = max(title_similarities) if title_similarities else 0.0
-        
-        # 2. Industry Match (20%)
-        if job_data.get('industry') and user_data.get('industryPrefs'):
-            # Check both industry and industryPrefs arrays
-            all_user_industries = user_data['industryPrefs']
-            industry_similarities = [
-                calculate_semantic_similarity(
-                    job_data['industry'],
-                    industry
-                )
-                for industry in all_user_industries
-            ]
-            industry_score = max(industry_similarities) if industry_similarities else 0.0
-        
-        # 3. Skills Match (25%)
-        if job_data.get('requiredSkills') and user_data.get('selectedJobs'):
-            all_user_skills = []
-            for job in user_data['selectedJobs']:
-                all_user_skills.extend(job.get('skills', []))
-            
-            skill_scores = []
-            for req_skill in job_data['requiredSkills']:
-                skill_name = req_skill.get('name', '')
-                skill_years = req_skill.get('yearsOfExperience', 0)
-                
-                skill_similarities = [
-                    calculate_semantic_similarity(
-                        skill_name,
-                        user_skill
-                    )
-                    for user_skill in all_user_skills
-                ]
-                max_similarity = max(skill_similarities) if skill_similarities else 0.0
-                skill_scores.append(max_similarity)
-            
-            skills_score = sum(skill_scores) / len(skill_scores) if skill_scores else 0.0
-        
-        # 4. Overview Match (15%)
-        if job_data.get('job_overview') and user_data.get('overviewResponses'):
-            # Combine all overview responses into a single string
-            user_overview = ' '.join(user_data['overviewResponses'].values())
-            overview_score = calculate_semantic_similarity(
-                job_data['job_overview'],
-                user_overview
-            )
+        if job_derived and user_derived:
+            # Titles, industries, skills and overviews were resolved and embedded when the documents were saved
+            components = vector_match_components(job_derived, user_derived)
+            title_score, industry_score = components['title'], components['industry']
+            skills_score, overview_score = components['skills'], components['overview']
+        else:
+            title_score, industry_score, skills_score, overview_score = text_match_components(job_data, user_data)
         
         # 5. Pay Range Analysis (15%)
         if job_data.get('estPayRangeMin') is not None and job_data.get('estPayRangeMax') is not None:
@@ -420,7 +445,9 @@ def generate_chat_suggestions():
                 {"role": "user", "content": user_content}
             ]
             
-            response = client.chat.completions.create(
+            response = call_upstream(
+                '/generate-chat-suggestions:openai',
+                client.chat.completions.create,
                 model="gpt-3.5-turbo",
                 messages=messages,
                 temperature=1.0,  # Maximum creativity
@@ -726,18 +753,8 @@ def get_pytrends_client():
 
 def format_location(location, try_city=False):
     """Helper function to format location for SERP API"""
-    if not location:
-        return 'United States'
-        
-    # If location contains a comma (city, state/region format)
-    if ',' in location:
-        city, region = location.split(',')
-        # For non-US locations, just use the country name
-        if region.strip() not in ['US', 'USA', 'United States']:
-            return location.split(',')[0].strip()  # Return just the city name
-            
-    # If it's a single word, assume it's a country name
-    return location.strip()
+    # Every spelling of a place maps to one canonical SerpApi location string
+    return canonicalize_location(location).display
 
 @app.route('/trending-industries', methods=['GET'])
 def get_trending_industries():
@@ -762,8 +779,7 @@ def get_trending_industries():
                 "chips": "date_posted:today"
             }
             
-            search = GoogleSearch(params)
-            results = search.get_dict()
+            results = serp_search(params, route='/trending-industries')
             
             if 'jobs_results' in results:
                 print(f"Found additional results for search term: {search_term}")
@@ -785,7 +801,7 @@ def get_trending_industries():
 def get_trending_jobs():
     try:
         industry = request.args.get('industry', '')
-        search_term = request.args.get('searchTerm', '').lower()
+        search_term = correct_search_term(request.args.get('searchTerm', '')).lower()
         user_location = request.args.get('location', 'United States')
         
         print(f"\n=== Getting Jobs for industry: '{industry}', search: '{search_term}' ===")
@@ -809,8 +825,7 @@ def get_trending_jobs():
                 "chips": "date_posted:today"
             }
             
-            search = GoogleSearch(params)
-            results = search.get_dict()
+            results = serp_search(params, route='/trending-jobs')
             
             if 'jobs_results' in results:
                 print(f"Found additional results for search term: {search_term}")
@@ -829,7 +844,7 @@ def get_trending_jobs():
 @app.route('/trending-skills', methods=['GET'])
 def get_trending_skills():
     try:
-        job_title = request.args.get('jobTitle', '')
+        job_title = correct_search_term(request.args.get('jobTitle', ''))
         industry = request.args.get('industry', '')
         user_location = request.args.get('location', 'United States')
         
@@ -846,10 +861,15 @@ def get_trending_skills():
         
         print(f"Returning skills: {skills}")
         
-        return jsonify({
+        # Ranking is deterministic, so identical requests can revalidate with If-None-Match
+        response = jsonify({
             "success": True,
             "skills": skills
         })
+        response.set_etag(hashlib.sha1(response.get_data()).hexdigest())
+        response.cache_control.public = True
+        response.cache_control.max_age = TRENDING_SKILLS_MAX_AGE
+        return response.make_conditional(request)
         
     except Exception as e:
         print(f"Error in get_trending_skills: {str(e)}")
@@ -918,7 +938,7 @@ def clean_skill_name(skill):
 @app.route('/suggest-skills', methods=['GET'])
 def suggest_skills():
     try:
-        job_title = request.args.get('jobTitle', '')
+        job_title = correct_search_term(request.args.get('jobTitle', ''))
         industry = request.args.get('industry', '')
         location = request.args.get('location', '')
         
@@ -928,7 +948,9 @@ def suggest_skills():
         print(f"Location: {location}")
         
         # First get raw skills from OpenAI
-        response = client.chat.completions.create(
+        response = call_upstream(
+            '/suggest-skills:openai',
+            client.chat.completions.create,
             model="gpt-3.5-turbo",
             messages=[
                 {
@@ -957,13 +979,19 @@ def suggest_skills():
         # Parse the initial skills
         raw_skills = [skill.strip() for skill in response.choices[0].message.content.split(',')]
         print(f"Raw skills: {raw_skills}")
+
+        # Collapse near-duplicates ("Teamwork"/"Team Work") before normalizing each one
+        raw_skills = dedup_skills(raw_skills)
+        print(f"Deduplicated skills: {raw_skills}")
         
         # Normalize each skill
         normalized_skills = []
         for skill in raw_skills:
             try:
                 # Use OpenAI to normalize each skill
-                normalize_response = client.chat.completions.create(
+                normalize_response = call_upstream(
+                    '/suggest-skills:openai-normalize',
+                    client.chat.completions.create,
                     model="gpt-3.5-turbo",
                     messages=[
                         {
@@ -1005,7 +1033,7 @@ def suggest_skills():
                     normalized_skills.append(skill)
         
         # Remove duplicates and sort
-        unique_skills = sorted(list(set(normalized_skills)))
+        unique_skills = sorted(dedup_skills(normalized_skills))
         
         # Ensure we have enough skills
         if len(unique_skills) < 5:
@@ -1062,62 +1090,60 @@ def check_skill_relevance():
         skill1 = data['skill1']
         skill2 = data['skill2']
         
-        # First check exact match
-        if skill1.lower() == skill2.lower():
-            return jsonify({"isRelevant": True})
-            
-        # Define skill categories and their related terms
-        skill_categories = {
-            "manual_labor": [
-                "manual labor", "physical work", "hands-on", "working with hands",
-                "manual dexterity", "physical strength", "lifting", "construction",
-                "assembly", "manufacturing", "mechanical"
-            ],
-            "customer_service": [
-                "customer service", "client relations", "people skills",
-                "interpersonal", "communication", "customer support",
-                "client interaction", "public relations"
-            ],
-            # Add more categories as needed
-        }
-        
-        # Check if skills are in the same category
-        for category in skill_categories.values():
-            if any(term in skill1.lower() for term in category) and \
-               any(term in skill2.lower() for term in category):
-                return jsonify({"isRelevant": True})
+        relevant = skill_relevance.is_relevant(skill1, skill2)
+        if relevant is None:
+            return jsonify({
+                "success": False,
+                "error": "Skill relevance is temporarily unavailable"
+            }), 503
+
+        return jsonify({"isRelevant": relevant})
         
-        # If not found in predefined categories, use OpenAI to check relevance
-        messages = [
-            {"role": "system", "content": """You are a skill matching expert. 
-             Determine if two skills are relevant or similar to each other.
-             Consider both direct and indirect relationships.
-             For example: 'Manual Labor' is relevant to 'Working with Hands'."""},
-            {"role": "user", "content": f"""Are these two skills related or relevant to each other?
-             Skill 1: {skill1}
-             Skill 2: {skill2}
-             
-             Answer with only 'true' or 'false'."""}
-        ]
+    except Exception as e:
+        print(f"Error checking skill relevance: {str(e)}")
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+@app.route('/check-skill-relevance-batch', methods=['POST'])
+def check_skill_relevance_batch():
+    """Relevance matrix for every pair across two skill lists"""
+    try:
+        data = request.json or {}
+        skills1 = [skill for skill in data.get('skills1', []) if isinstance(skill, str) and skill.strip()]
+        skills2 = [skill for skill in data.get('skills2', []) if isinstance(skill, str) and skill.strip()]
         
-        response = make_openai_request(messages)
-        is_relevant = response.strip().lower() == 'true'
+        if not skills1 or not skills2:
+            return jsonify({
+                "success": False,
+                "error": "skills1 and skills2 must be non-empty lists of skills"
+            }), 400
+        if len(skills1) * len(skills2) > MAX_RELEVANCE_PAIRS:
+            return jsonify({
+                "success": False,
+                "error": f"At most {MAX_RELEVANCE_PAIRS} skill pairs per request"
+            }), 400
         
-        # Cache the result for future use
-        cache_key = f"{skill1.lower()}_{skill2.lower()}"
-        skill_relevance_cache[cache_key] = is_relevant
+        # Pairs the LLM couldn't answer are null in the matrix and counted under sources.unresolved
+        matrix, sources = skill_relevance.matrix(skills1, skills2)
+        print(f"Skill relevance matrix {len(skills1)}x{len(skills2)} sources: {sources}")
         
-        return jsonify({"isRelevant": is_relevant})
+        return jsonify({
+            "success": True,
+            "skills1": skills1,
+            "skills2": skills2,
+            "matrix": matrix,
+            "sources": sources
+        })
         
     except Exception as e:
-        print(f"Error checking skill relevance: {str(e)}")
+        print(f"Error checking skill relevance batch: {str(e)}")
         return jsonify({
             "success": False,
             "error": str(e)
         }), 500
 
-# Initialize a cache for skill relevance results
-skill_relevance_cache = {}
 
 def clean_job_title(query):
     """Clean and validate job titles"""
@@ -1234,41 +1260,25 @@ def get_trending_industries_serp(search_term='', location='United States'):
         }
         
         print(f"Search params: {params}")
-        search = GoogleSearch(params)
-        results = search.get_dict()
+        results = serp_search(params, route='trending_industries')
         
-        industries = set()
+        votes = Counter()
         
         if 'jobs_results' in results:
             for job in results['jobs_results']:
-                # Extract from description
-                if 'description' in job:
-                    desc = job['description'].lower()
-                    # Look for industry keywords
-                    for industry in INDUSTRY_KEYWORDS:
-                        if industry.lower() in desc:
-                            industries.add(industry)
-                
-                # Extract from company info
-                if 'company_name' in job:
-                    company = job['company_name'].lower()
-                    for industry in INDUSTRY_KEYWORDS:
-                        if industry.lower() in company:
-                            industries.add(industry)
+                # Title and company outweigh the description; benefits boilerplate doesn't vote
+                votes.update(industry_classifier.score_posting(job))
+        
+        industries = [industry for industry, _ in sorted(votes.items(), key=lambda item: (-item[1], item[0]))]
         
         # If we don't have enough industries, add common ones
         if len(industries) < 5:
-            industries.update([
-                'Technology',
-                'Healthcare',
-                'Finance',
-                'Education',
-                'Manufacturing',
-                'Retail',
-                'Entertainment'
-            ])
-        
-        final_industries = sorted(list(industries))[:10]
+            for industry in ['Technology', 'Healthcare', 'Finance', 'Education',
+                             'Manufacturing', 'Retail', 'Entertainment']:
+                if industry not in industries:
+                    industries.append(industry)
+        
+        final_industries = industries[:10]
         print(f"Final industries list: {final_industries}")
         return final_industries
 
@@ -1297,8 +1307,7 @@ def get_trending_jobs_serp(industry, location='United States'):
         
         print(f"Search params: {params}")
         
-        search = GoogleSearch(params)
-        results = search.get_dict()
+        results = serp_search(params, route='trending_jobs')
         
         if 'error' in results:
             print(f"SERP API error: {results.get('error')}")
@@ -1326,6 +1335,16 @@ def get_trending_jobs_serp(industry, location='United States'):
         print(f"Full traceback: {traceback.format_exc()}")
         return get_default_jobs(industry)
 
+TRENDING_SKILLS_MAX_POSTINGS = 200
+TRENDING_SKILLS_MAX_AGE = int(os.getenv('TRENDING_SKILLS_MAX_AGE', '300'))
+
+def extract_description_skills(description):
+    """Set of canonical skill names mentioned in one posting description"""
+    return skill_extractor.extract(description)
+
+# Corpus-wide skill document frequencies for TF-IDF ranking
+skill_document_frequency = SkillDocumentFrequency(postings_store, extract_description_skills)
+
 def get_trending_skills_serp(job_title, industry, location='United States'):
     try:
         print(f"\n=== Getting Trending Skills ===")
@@ -1344,44 +1363,32 @@ def get_trending_skills_serp(job_title, industry, location='United States'):
         }
 
         print("Querying SERP API with params:", params)
-        search = GoogleSearch(params)
-        results = search.get_dict()
-        
-        skills_set = set()
+        results = serp_search(params, route='trending_skills')
+        
+        # Earlier postings for the same title and location add evidence, with the skills found at ingestion
+        location_id = canonicalize_location(location).id
+        documents = {
+            posting['posting_id']: posting['skills'] or []
+            for posting in postings_store.find(title=job_title, location_id=location_id,
+                                               limit=TRENDING_SKILLS_MAX_POSTINGS, columns=['posting_id', 'skills'])
+        }
         
+        # Only SerpApi results not already in the corpus are extracted here
         if 'error' not in results and 'jobs_results' in results:
             jobs = results.get('jobs_results', [])
             print(f"Found {len(jobs)} job results")
-            
             for job in jobs:
-                description = job.get('description', '').lower()
-                
-                # Extract skills from requirements/qualifications sections
-                skill_patterns = [
-                    r'(?:requirements|qualifications|skills required|what you\'ll need)[:]\s*(.*?)(?=\n\n|\Z)',
-                    r'(?:•|\*)\s*([\w\s]+)',  # Bullet points
-                    r'(?:proficiency|experience) (?:in|with)\s+([\w\s,]+)',
-                    r'knowledge of\s+([\w\s,]+)',
-                    r'(\w+) skills'
-                ]
-                
-                for pattern in skill_patterns:
-                    matches = re.finditer(pattern, description, re.IGNORECASE | re.DOTALL)
-                    for match in matches:
-                        skill_text = match.group(1)
-                        # Split by common delimiters
-                        for skill in re.split(r'[,;.]', skill_text):
-                            cleaned_skill = clean_skill_name(skill)
-                            if cleaned_skill:
-                                skills_set.add(cleaned_skill)
-                                print(f"Found skill: {cleaned_skill}")
+                if posting_id(job) not in documents:
+                    documents[posting_id(job)] = extract_description_skills(job.get('description', ''))
+
+        # Corpus counts are folded in off the request path; ranking uses whatever is counted so far
+        skill_document_frequency.refresh_in_background()
+        ranked = rank_skills(list(documents.values()), skill_document_frequency)
 
         # If we found skills from SERP API, use them
-        if len(skills_set) >= 5:
-            print(f"Using {len(skills_set)} skills found from SERP API")
-            final_skills = list(skills_set)
-            random.shuffle(final_skills)
-            return final_skills[:15]
+        if len(ranked) >= 5:
+            print(f"Ranked {len(ranked)} skills from {len(documents)} postings")
+            return [skill for skill, _ in ranked]
 
         print("Not enough skills found from SERP API, using industry-specific fallback")
         
@@ -1418,7 +1425,6 @@ def get_trending_skills_serp(job_title, industry, location='United States'):
 
         # Combine industry-specific and common skills
         all_skills = industry_skills.get(industry, []) + common_skills
-        random.shuffle(all_skills)
         
         final_skills = list(dict.fromkeys(all_skills))[:15]
         print(f"Returning fallback skills: {final_skills}")
@@ -1479,6 +1485,10 @@ INDUSTRY_KEYWORDS = [
     'Telecommunications'
 ]
 
+# Compiled once from the tiered search terms; also tags each ingested posting
+industry_classifier = IndustryClassifier(industry_search_terms, INDUSTRY_KEYWORDS)
+postings_store.classify_industry = industry_classifier.classify_posting
+
 SKILL_KEYWORDS = [
     'Python', 'Java', 'JavaScript', 'SQL', 'AWS', 'Azure', 'Docker',
     'Kubernetes', 'React', 'Angular', 'Node.js', 'Machine Learning',
@@ -1487,6 +1497,190 @@ SKILL_KEYWORDS = [
     # Add more skills as needed
 ]
 
+# Autocomplete over industries, titles and skills, grown from ingested postings
+typeahead_index = TypeaheadIndex()
+
+# Typo correction over the same title and skill vocabularies; words spaCy knows are never "fixed"
+spell_corrector = SpellCorrector(is_word=lambda word: nlp.vocab.has_vector(word))
+
+def add_vocabulary(kind, text, tags=(), aliases=()):
+    """Add a term to the typeahead and, for titles and skills, to the spell corrector"""
+    typeahead_index.add(kind, text, tags=tags, aliases=aliases)
+    if kind in ('title', 'skill'):
+        spell_corrector.add(kind, text)
+        for alias in aliases:
+            spell_corrector.add(kind, alias, canonical=text)
+
+def index_postings(postings):
+    """Add titles, skills and industries from newly stored postings to the vocabularies"""
+    for posting in postings:
+        industry = posting.get('industry')
+        add_vocabulary('title', title_core(posting.get('title')), tags=[industry])
+        for skill in posting.get('skills') or []:
+            add_vocabulary('skill', skill)
+        if industry:
+            add_vocabulary('industry', industry)
+
+def seed_typeahead():
+    """Seed vocabularies from the static tables, then from the postings corpus"""
+    for industry in INDUSTRY_KEYWORDS:
+        add_vocabulary('industry', industry)
+    for industry, titles in industry_jobs.items():
+        add_vocabulary('industry', industry)
+        for title in titles:
+            add_vocabulary('title', title, tags=[industry])
+    for title in get_default_jobs(''):
+        add_vocabulary('title', title)
+    for entry in title_taxonomy.entries:
+        add_vocabulary('title', entry['title'], tags=entry['industries'], aliases=entry['aliases'])
+    for entry in get_skill_lexicon():
+        add_vocabulary('skill', entry['skill'], aliases=entry['aliases'])
+    for skill in SKILL_KEYWORDS + [skill for skills in skill_keywords.values() for skill in skills]:
+        add_vocabulary('skill', skill)
+
+    index_postings(
+        {'title': title, 'skills': skills, 'industry': industry}
+        for title, skills, industry in postings_store.facets()
+    )
+    postings_store.add_listener(index_postings)
+    print(f"Typeahead index seeded: {typeahead_index.get_stats()}")
+
+# Rule-based title cleanup, scored against the same title vocabulary
+title_normalizer = TitleNormalizer(spell_corrector)
+
+# Canonical title ids shared by normalization, matching and caches
+title_taxonomy = TitleTaxonomy(normalize_title=lambda title: title_normalizer.normalize(title)['title'])
+title_taxonomy.precompute_similarity(lambda title: nlp(title.lower()).vector)
+
+def title_key_for(title):
+    """Cache key for a title: its canonical id when known, else its cleaned text"""
+    entry = title_taxonomy.resolve(title)
+    return entry['id'] if entry else default_title_key(title)
+
+# Salary cells collapse every spelling of a title onto one canonical id
+salary_stats.title_key_fn = title_key_for
+
+# First builds of the salary tables and skill frequencies scan the corpus; keep them off requests
+salary_stats.refresh_in_background()
+skill_document_frequency.refresh_in_background()
+
+@lru_cache(maxsize=4096)
+def cached_semantic_similarity(text1, text2):
+    return calculate_semantic_similarity(text1, text2)
+
+def title_id_for(title):
+    entry = title_taxonomy.resolve(title)
+    return entry['id'] if entry else None
+
+def embed_similarity(text1, text2):
+    return cached_semantic_similarity(*sorted((text1.lower(), text2.lower())))
+
+# Pairwise matching tries exact text, canonical ids and word overlap before embeddings
+title_scorer = CascadeScorer(
+    embed=lambda title1, title2: embed_similarity(default_title_key(title1), default_title_key(title2)),
+    resolve=title_id_for,
+    id_similarity=title_taxonomy.similarity
+)
+industry_scorer = CascadeScorer(embed=embed_similarity)
+
+# Canonical skill ids and categories; related-skill scores are precomputed per id pair
+skill_taxonomy = SkillTaxonomy(extractor=skill_extractor)
+skill_taxonomy.precompute_relatedness(lambda skill: nlp(skill.lower()).vector)
+
+def skill_id_for(skill):
+    entry = skill_taxonomy.resolve(skill)
+    return entry['id'] if entry else None
+
+skill_scorer = CascadeScorer(
+    embed=embed_similarity,
+    resolve=skill_id_for,
+    id_similarity=skill_taxonomy.relatedness
+)
+
+@lru_cache(maxsize=4096)
+def phrase_vector(text):
+    return nlp(text.lower()).vector
+
+# Job scoring runs the same cascades over request text and over phrases stored at save time
+phrase_scorers = {'title': title_scorer, 'industry': industry_scorer, 'skills': skill_scorer}
+text_similarities = {field: scorer.score for field, scorer in phrase_scorers.items()}
+stored_similarities = {field: scorer.score_phrases for field, scorer in phrase_scorers.items()}
+# What each scorer's embedding stage compares, given a normalized key
+phrase_embedders = {
+    'title': lambda key: phrase_vector(default_title_key(key)),
+    'industry': phrase_vector,
+    'skills': phrase_vector
+}
+
+def stored_phrase(field, text):
+    return phrase_scorers[field].phrase(text, phrase_embedders[field])
+
+def dedup_titles(titles):
+    """Collapse near-duplicate titles to one representative each"""
+    return dedup_phrases(titles, phrase_vector, key_fn=title_id_for)
+
+def dedup_skills(skills):
+    """Collapse near-duplicate skills to one representative each"""
+    return dedup_phrases(skills, phrase_vector, key_fn=skill_id_for)
+
+# Skill relevance: exact/cache/taxonomy/category/embedding first, batched LLM for the rest
+MAX_RELEVANCE_PAIRS = 2500
+skill_relevance = SkillRelevance(
+    skill_taxonomy,
+    similarity=embed_similarity,
+    ask_llm=lambda messages: make_openai_request(
+        messages, max_tokens=1000, temperature=0, route='/check-skill-relevance'
+    ),
+    cache=PersistentTTLCache('skill_relevance')
+)
+
+def correct_search_term(text, kind='title'):
+    """
+    Fix typos in a title or skill before it reaches caches or upstream APIs.
+    Only spelling changes: a term is never swapped for a different canonical
+    role, so "Paramedic" or "Senior Accountant" reach upstream as typed.
+    """
+    if not text:
+        return text
+    # Only terms the vocabulary has nothing for are corrected
+    if typeahead_index.search(kind, text, limit=1):
+        return text
+    corrected = spell_corrector.correct(text, kind)
+    if corrected != text:
+        print(f"Corrected {kind} '{text}' -> '{corrected}'")
+    return corrected
+
+seed_typeahead()
+
+@app.route('/typeahead', methods=['GET'])
+def typeahead():
+    """Prefix/infix completion for industries, job titles or skills"""
+    kind = request.args.get('kind', 'title')
+    if kind not in TYPEAHEAD_KINDS:
+        return jsonify({
+            "success": False,
+            "error": f"kind must be one of {', '.join(TYPEAHEAD_KINDS)}"
+        }), 400
+    try:
+        limit = min(50, max(1, int(request.args.get('limit', 10))))
+    except ValueError:
+        return jsonify({
+            "success": False,
+            "error": "limit must be an integer"
+        }), 400
+
+    results = typeahead_index.search(
+        kind,
+        request.args.get('q', ''),
+        limit=limit,
+        tag=request.args.get('industry') or None
+    )
+    return jsonify({
+        "success": True,
+        "kind": kind,
+        "results": results
+    })
+
 # Add this new route after your other routes
 @app.route('/suggest-industries', methods=['GET', 'POST'])
 def suggest_industries():
@@ -1497,21 +1691,11 @@ def suggest_industries():
         else:
             search_term = request.json.get('searchText', '').lower()
         
-        # Filter industries based on search term
-        filtered_industries = [
-            industry for industry in INDUSTRY_KEYWORDS
-            if not search_term or search_term in industry.lower()
+        # Answer from the typeahead index; no upstream calls per keystroke
+        all_industries = [
+            result['text'] for result in typeahead_index.search('industry', search_term, limit=15)
         ]
         
-        # Add trending industries from Google Jobs API if available
-        try:
-            location = request.args.get('location', 'United States')
-            trending_industries = get_trending_industries_serp(search_term, location)
-            # Combine and remove duplicates
-            all_industries = list(set(filtered_industries + trending_industries))
-        except:
-            all_industries = filtered_industries
-        
         return jsonify({
             "success": True,
             "industries": all_industries[:15]  # Limit to 15 suggestions
@@ -1536,16 +1720,41 @@ def suggest_jobs():
         print(f"Search: {search_term}")
         print(f"Location: {location}")
         
+        # While the user is typing, complete from the typeahead index (retrying with typos fixed)
+        if search_term:
+            completions = typeahead_index.search('title', search_term, limit=15, tag=industry or None)
+            if not completions:
+                completions = typeahead_index.search(
+                    'title', correct_search_term(search_term), limit=15, tag=industry or None
+                )
+            if completions:
+                return jsonify({
+                    "success": True,
+                    "jobs": [completion['text'] for completion in completions]
+                })
+        
         # Get initial job suggestions using your existing function
         raw_jobs = get_trending_jobs_serp(industry, location)
         print(f"Raw jobs: {raw_jobs}")
+
+        # Collapse near-duplicates ("IT Support Specialist"/"IT Specialist") before normalizing each one
+        raw_jobs = dedup_titles(raw_jobs)
+        print(f"Deduplicated jobs: {raw_jobs}")
         
         # Normalize each job title
         normalized_jobs = []
         for job_title in raw_jobs:
             try:
+                local = title_normalizer.normalize(job_title)
+                if title_normalizer.is_confident(local):
+                    print(f"Normalized locally '{job_title}' → '{local['title']}'")
+                    normalized_jobs.append(local['title'])
+                    continue
+
                 # Use new OpenAI API format
-                response = client.chat.completions.create(
+                response = call_upstream(
+                    '/suggest-jobs:openai',
+                    client.chat.completions.create,
                     model="gpt-3.5-turbo",
                     messages=[
                         {
@@ -1583,7 +1792,7 @@ def suggest_jobs():
                 normalized_jobs.append(job_title)
         
         # Remove duplicates
-        unique_jobs = list(set(normalized_jobs))
+        unique_jobs = dedup_titles(normalized_jobs)
         print(f"Final normalized jobs: {unique_jobs}")
         
         return jsonify({
@@ -1611,15 +1820,30 @@ def reverse_geocode():
                 "error": "Missing latitude or longitude"
             }), 400
 
-        search = GoogleSearch({
+        # Answer from the bundled gazetteer when a known city is close enough
+        try:
+            local_match = reverse_geocoder.lookup(lat, lng)
+        except ValueError:
+            return jsonify({
+                "success": False,
+                "error": "Invalid latitude or longitude"
+            }), 400
+
+        if local_match:
+            return jsonify({
+                "success": True,
+                "city": local_match['city'],
+                "state": local_match['state'],
+                "source": "local"
+            })
+
+        result = serp_search({
             "engine": "google_maps_reverse_geocoding",
             "lat": lat,
             "lng": lng,
             "type": "address",
             "api_key": os.getenv('SERP_API_KEY')
-        })
-        
-        result = search.get_dict()
+        }, route='/reverse-geocode')
         
         if 'place_results' in result:
             address_components = result['place_results'].get('address_components', [])
@@ -1672,26 +1896,8 @@ def calculate_job_similarity(job1, job2):
         print("Missing job titles")
         return 0.0
     
-    # Split titles into words and remove common words
-    common_words = {'and', 'or', 'the', 'in', 'at', 'of', 'for', 'to', 'with'}
-    words1 = set(w for w in title1.split() if w not in common_words)
-    words2 = set(w for w in title2.split() if w not in common_words)
-    
-    print(f"Words from title 1: {words1}")
-    print(f"Words from title 2: {words2}")
-    
-    # Calculate word overlap
-    if not words1 or not words2:
-        print("No valid words found after filtering")
-        return 0.0
-        
-    common_words = words1.intersection(words2)
-    unique_words = words1.union(words2)
-    
-    similarity = len(common_words) / len(unique_words)
-    
-    print(f"Common words: {common_words}")
-    print(f"All unique words: {unique_words}")
+    # Word overlap, the same lexical stage the match cascade uses
+    similarity = word_jaccard(title1, title2)
     print(f"Similarity score: {similarity:.2f}")
     
     return similarity
@@ -1704,6 +1910,32 @@ def test_backend():
         "message": "Backend is working"
     })
 
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Expose upstream latency and hedging counters"""
+    return jsonify({
+        "success": True,
+        "upstream": get_upstream_stats(),
+        "serpCache": serp_cache.get_stats(),
+        "travelCache": travel_times.travel_cache.get_stats(),
+        "travelEstimator": travel_estimator.get_stats(),
+        "postings": postings_store.count(),
+        "salaryTables": salary_stats.get_stats(),
+        "skillFrequencies": skill_document_frequency.get_stats(),
+        "typeahead": typeahead_index.get_stats(),
+        "spellCorrector": spell_corrector.get_stats(),
+        "titleTaxonomy": title_taxonomy.get_stats(),
+        "skillTaxonomy": skill_taxonomy.get_stats(),
+        "skillRelevance": skill_relevance.get_stats(),
+        "profileStore": profile_store.get_stats(),
+        "candidateIndex": candidate_index.get_stats(),
+        "matchScoring": {
+            "title": title_scorer.get_stats(),
+            "industry": industry_scorer.get_stats(),
+            "skill": skill_scorer.get_stats()
+        }
+    })
+
 def calculate_distance(lat1, lon1, lat2, lon2):
     """Calculate distance between two points in meters using Haversine formula"""
     if not all([lat1, lon1, lat2, lon2]):
@@ -1725,6 +1957,308 @@ def calculate_distance(lat1, lon1, lat2, lon2):
     
     return R * c  # Distance in meters
 
+# Spatial index over job locations, used to pre-filter candidates by radius
+job_geo_index = GeoGridIndex()
+job_location_store = PersistentTTLCache('job_locations')
+
+def load_job_locations():
+    """Rebuild the job geo index from stored locations"""
+    for job_id, location, _ in job_location_store.items():
+        job_geo_index.upsert(job_id, location['lat'], location['lng'])
+    print(f"Loaded {len(job_geo_index)} job locations into geo index")
+
+load_job_locations()
+
+def jobs_within_radius(lat, lng, radius_km):
+    """Return [(job_id, distance_m)] for indexed jobs within radius_km, nearest first"""
+    return job_geo_index.within(lat, lng, float(radius_km) * 1000)
+
+@app.route('/jobs/locations', methods=['POST'])
+def update_job_locations():
+    try:
+        data = request.get_json() or {}
+
+        # Validate every entry before applying any, so a bad entry can't leave a partial update
+        changes = []
+        errors = []
+        for index, job in enumerate(data.get('jobs', [])):
+            if not isinstance(job, dict):
+                errors.append({"index": index, "error": "Entry must be an object"})
+                continue
+            job_id = job.get('id')
+            if not job_id:
+                continue
+            if job.get('removed'):
+                changes.append((str(job_id), None))
+                continue
+            try:
+                changes.append((str(job_id), parse_coordinates(job.get('location') or job)))
+            except (TypeError, ValueError, AttributeError):
+                errors.append({"index": index, "id": str(job_id), "error": "Invalid coordinates"})
+
+        if errors:
+            return jsonify({
+                "success": False,
+                "error": "Invalid job locations; nothing was updated",
+                "errors": errors
+            }), 400
+
+        updated = 0
+        removed = 0
+        for job_id, coordinates in changes:
+            if coordinates is None:
+                job_geo_index.remove(job_id)
+                job_location_store.delete(job_id)
+                removed += 1
+                continue
+            lat, lng = coordinates
+            job_geo_index.upsert(job_id, lat, lng)
+            job_location_store.set(job_id, {'lat': lat, 'lng': lng})
+            updated += 1
+
+        return jsonify({
+            "success": True,
+            "updated": updated,
+            "removed": removed,
+            "indexed": len(job_geo_index)
+        })
+
+    except Exception as e:
+        print(f"Error in update_job_locations: {str(e)}")
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+@app.route('/jobs/nearby', methods=['GET'])
+def get_nearby_jobs():
+    try:
+        lat = request.args.get('lat')
+        lng = request.args.get('lng')
+        radius_km = request.args.get('radius_km', '25')
+        limit = int(request.args.get('limit', '200'))
+
+        if not lat or not lng:
+            return jsonify({
+                "success": False,
+                "error": "Missing latitude or longitude"
+            }), 400
+
+        nearby = jobs_within_radius(lat, lng, radius_km)[:limit]
+
+        return jsonify({
+            "success": True,
+            "jobs": [
+                {"id": job_id, "distanceKm": round(distance / 1000, 2)}
+                for job_id, distance in nearby
+            ]
+        })
+
+    except Exception as e:
+        print(f"Error in get_nearby_jobs: {str(e)}")
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+def overview_text(document):
+    """A profile's joined overview responses, or a job's overview"""
+    if document.get('overviewResponses'):
+        return ' '.join(str(value) for value in document['overviewResponses'].values())
+    return document.get('job_overview') or document.get('user_overview') or ''
+
+def canonical_title_text(title):
+    entry = title_taxonomy.resolve(title)
+    return entry['title'] if entry else title_core(title)
+
+def canonical_skill_text(skill):
+    entry = skill_taxonomy.resolve(skill)
+    return entry['name'] if entry else skill
+
+def derive_document(kind, document):
+    """Canonical ids, flattened skills, scoring phrases and per-field embeddings, computed once per saved version"""
+    jobs = document_jobs(kind, document)
+    skills = skill_names([skill for job in jobs for skill in job['skills']])
+    if kind == 'job':
+        industries = [document['industry']] if document.get('industry') else []
+        industry_prefs = []
+    else:
+        industries = [job['industry'] for job in jobs if job['industry']]
+        industry_prefs = [industry for industry in document.get('industryPrefs', []) if industry]
+        industries += [industry for industry in industry_prefs if industry not in industries]
+    text = overview_text(document)
+
+    # Aliases embed as their canonical text, so "RN" and "Registered Nurse" get one vector
+    vectors = embed_fields(
+        [
+            {
+                'title': canonical_title_text(job['title']) if job['title'] else '',
+                'industry': job['industry'],
+                'skills': [canonical_skill_text(skill).lower() for skill in job['skills']]
+            }
+            for job in jobs
+        ],
+        text,
+        phrase_vector
+    )
+    return {
+        'titleIds': [title_id_for(job['title']) for job in jobs],
+        'skills': skills,
+        'skillIds': [skill_id_for(skill) for skill in skills],
+        'industries': industries,
+        'overviewText': text,
+        # Keys, canonical ids and embeddings for the same cascades text scoring runs
+        'phrases': {
+            'jobs': map_phrases(jobs, stored_phrase),
+            'industryPrefs': [stored_phrase('industry', industry) for industry in industry_prefs]
+        },
+        'vectors': vectors
+    }
+
+def vector_job_score(user_derived, item_derived):
+    """calculate_job_score over the phrases stored with two saved profiles"""
+    return best_job_score(user_derived['phrases']['jobs'], item_derived['phrases']['jobs'], stored_similarities)
+
+def vector_match_components(job_derived, user_derived):
+    """Title, industry, skills and overview similarity for /analyze-job-match from stored phrases and vectors"""
+    components = match_components(
+        job_derived['phrases']['jobs'][0], user_derived['phrases']['jobs'], user_derived['phrases']['industryPrefs'], stored_similarities
+    )
+    components['overview'] = cosine(job_derived['vectors']['overview'], user_derived['vectors']['overview'])
+    return components
+
+# Saved profiles and jobs, so match requests can send ids instead of full documents
+# derive_version 2 adds per-field vectors and centroids, 3 the scoring phrases
+profile_store = ProfileStore(derive=derive_document, derive_version=3)
+# Unknown id (404), stale version (409) or malformed version (400)
+DOCUMENT_ERRORS = (LookupError, VersionConflict, InvalidVersion)
+
+def load_document(data, payload_key, id_key, version_key, kind):
+    """
+    (document, derived) from the request payload, or from the profile store when
+    the request names the document by id (and optionally version).
+    Raises LookupError for unknown ids, VersionConflict for stale versions and
+    InvalidVersion for versions that aren't positive integers.
+    """
+    doc_id = data.get(id_key)
+    if doc_id is None:
+        return data.get(payload_key) or {}, None
+    entry = profile_store.get(kind, doc_id, data.get(version_key))
+    if entry is None:
+        raise LookupError(f"Unknown {kind} {doc_id}")
+    return entry['document'], entry['derived']
+
+def document_error(e):
+    """Response for an unknown id, a stale version or a malformed version"""
+    if isinstance(e, InvalidVersion):
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+    if isinstance(e, VersionConflict):
+        return jsonify({
+            "success": False,
+            "error": str(e),
+            "storedVersion": e.stored_version
+        }), 409
+    return jsonify({
+        "success": False,
+        "error": str(e)
+    }), 404
+
+@app.route('/documents/<kind>/<doc_id>', methods=['GET', 'PUT', 'DELETE'])
+def document(kind, doc_id):
+    """Save, fetch or delete a profile or job document"""
+    try:
+        if kind not in DOCUMENT_KINDS:
+            return jsonify({
+                "success": False,
+                "error": f"kind must be one of {', '.join(DOCUMENT_KINDS)}"
+            }), 400
+
+        if request.method == 'PUT':
+            data = request.get_json() or {}
+            if not isinstance(data.get('document'), dict):
+                return jsonify({
+                    "success": False,
+                    "error": "Missing document"
+                }), 400
+            version = profile_store.put(kind, doc_id, data['document'], data.get('version'))
+            return jsonify({
+                "success": True,
+                "id": doc_id,
+                "version": version
+            })
+
+        if request.method == 'DELETE':
+            profile_store.delete(kind, doc_id)
+            return jsonify({"success": True})
+
+        entry = profile_store.get(kind, doc_id, request.args.get('version'))
+        if entry is None:
+            raise LookupError(f"Unknown {kind} {doc_id}")
+        return jsonify({
+            "success": True,
+            "id": doc_id,
+            "version": entry['version'],
+            "document": entry['document']
+        })
+
+    except DOCUMENT_ERRORS as e:
+        return document_error(e)
+    except Exception as e:
+        print(f"Error in document: {str(e)}")
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+@app.route('/profile-embeddings', methods=['POST'])
+def profile_embeddings():
+    """Compute and store per-field vectors and centroids for a profile or job as it is saved"""
+    try:
+        data = request.get_json() or {}
+        kind = data.get('kind', 'profile')
+        doc_id = data.get('id')
+        if kind not in DOCUMENT_KINDS or doc_id is None:
+            return jsonify({
+                "success": False,
+                "error": f"Requires an id and a kind of {', '.join(DOCUMENT_KINDS)}"
+            }), 400
+
+        if isinstance(data.get('document'), dict):
+            profile_store.put(kind, doc_id, data['document'], data.get('version'))
+            entry = profile_store.get(kind, doc_id)
+        else:
+            entry = profile_store.get(kind, doc_id, data.get('version'))
+            if entry is None:
+                raise LookupError(f"Unknown {kind} {doc_id}")
+            profile_store.rederive(entry)
+
+        vectors = entry['derived']['vectors']
+        result = {
+            "success": True,
+            "id": str(doc_id),
+            "version": entry['version'],
+            "fields": {
+                "jobs": len(vectors['jobs']),
+                "skills": sum(len(job['skills']) for job in vectors['jobs']),
+                "overview": vectors['overview'] is not None
+            }
+        }
+        if data.get('includeVectors'):
+            result["centroids"] = vectors['centroids']
+        return jsonify(result)
+
+    except DOCUMENT_ERRORS as e:
+        return document_error(e)
+    except Exception as e:
+        print(f"Error in profile_embeddings: {str(e)}")
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
 @app.route('/calculate-match', methods=['POST'])
 def calculate_match():
     try:
@@ -1732,11 +2266,17 @@ def calculate_match():
         print("\n=== Starting Calculate Match ===")
         print("Received data:", json.dumps(data, indent=2))
         
-        user_data = data.get('userData', {})
-        item_data = data.get('itemData', {})
-        
-        # Calculate job score only (40% weight)
-        job_score = calculate_job_score(user_data, item_data)
+        try:
+            user_data, user_derived = load_document(data, 'userData', 'userId', 'userVersion', 'profile')
+            item_data, item_derived = load_document(data, 'itemData', 'itemId', 'itemVersion', 'profile')
+        except DOCUMENT_ERRORS as e:
+            return document_error(e)
+        
+        # Calculate job score only (40% weight), from stored phrases when both documents have them
+        if user_derived and item_derived:
+            job_score = vector_job_score(user_derived, item_derived)
+        else:
+            job_score = calculate_job_score(user_data, item_data)
         
         # Return only the job score since location and availability are calculated client-side
         return jsonify({
@@ -1749,57 +2289,92 @@ def calculate_match():
         return jsonify({'error': str(e)}), 500
 
 def calculate_job_score(user_data, item_data):
-    """Calculate overall job match score"""
-    max_score = 40  # 40% weight for job matching
-    
-    user_jobs = user_data.get('selectedJobs', [])
-    candidate_jobs = item_data.get('selectedJobs', [])
-    
-    if not user_jobs or not candidate_jobs:
-        return 0
-    
-    max_job_score = 0
-    
-    for user_job in user_jobs:
-        for candidate_job in candidate_jobs:
-            # Calculate title similarity (50% of job score)
-            title_sim = calculate_semantic_similarity(
-                user_job.get('title', ''),
-                candidate_job.get('title', '')
-            )
-            title_score = title_sim * 20  # Max 20 points
-            
-            # Calculate industry similarity (25% of job score)
-            industry_sim = calculate_semantic_similarity(
-                user_job.get('industry', ''),
-                candidate_job.get('industry', '')
-            )
-            industry_score = industry_sim * 10  # Max 10 points
-            
-            # Calculate skills match (25% of job score)
-            user_skills = [skill.get('name', '').lower() for skill in user_job.get('skills', [])]
-            candidate_skills = [skill.get('name', '').lower() for skill in candidate_job.get('skills', [])]
-            
-            if user_skills and candidate_skills:
-                skills_scores = []
-                for user_skill in user_skills:
-                    skill_scores = [calculate_semantic_similarity(user_skill, cand_skill) 
-                                  for cand_skill in candidate_skills]
-                    skills_scores.append(max(skill_scores))
-                skills_score = (sum(skills_scores) / len(skills_scores)) * 10
-            else:
-                skills_score = 0
-            
-            total_score = title_score + industry_score + skills_score
-            print("\nJob Match Details:")
-            print(f"Title Score: {title_score:.2f}/20")
-            print(f"Industry Score: {industry_score:.2f}/10")
-            print(f"Skills Score: {skills_score:.2f}/10")
-            print(f"Total Job Score: {total_score:.2f}/40")
-            
-            max_job_score = max(max_job_score, total_score)
-    
-    return max_job_score
+    """Calculate overall job match score (max 40: title 20, industry 10, skills 10)"""
+    user_jobs = document_jobs('profile', user_data)
+    candidate_jobs = document_jobs('profile', item_data)
+    score = best_job_score(user_jobs, candidate_jobs, text_similarities)
+    print(f"Total Job Score: {score:.2f}/40")
+    return score
+
+# Skills points never exceed 10; the slack covers embeddings a hair above 1.0
+SKILLS_SCORE_CEILING = 10 * (1 + 1e-6)
+
+def rank_job_matches(user_data, candidates, k):
+    """
+    Top k candidates by calculate_job_score, in the same order exhaustive scoring gives.
+    Title and industry points are computed for every pair; the skill matrix only
+    for pairs whose title + industry + skills ceiling can still change the result.
+    Returns ([(index, score)], evaluated).
+    """
+    user_jobs = document_jobs('profile', user_data)
+
+    def prepare(item_data):
+        pairs = []
+        for user_job in user_jobs:
+            for candidate_job in document_jobs('profile', item_data):
+                title_score, industry_score = pair_base_points(user_job, candidate_job, text_similarities)
+                has_skills = bool(user_job['skills']) and bool(candidate_job['skills'])
+                ceiling = title_score + industry_score + (SKILLS_SCORE_CEILING if has_skills else 0)
+                pairs.append((ceiling, title_score, industry_score, user_job, candidate_job))
+        pairs.sort(key=lambda pair: -pair[0])
+        return pairs
+
+    def upper_bound(pairs):
+        return max([0] + [pair[0] for pair in pairs])
+
+    def score(pairs):
+        max_job_score = 0
+        for ceiling, title_score, industry_score, user_job, candidate_job in pairs:
+            if ceiling <= max_job_score:
+                break
+            skills_score = pair_skills_points(user_job, candidate_job, text_similarities)
+            max_job_score = max(max_job_score, title_score + industry_score + skills_score)
+        return max_job_score
+
+    return top_k([prepare(item_data) for item_data in candidates], k, upper_bound, score)
+
+@app.route('/rank-matches', methods=['POST'])
+def rank_matches():
+    """Top k candidates by job score, optionally limited to jobs near a point"""
+    try:
+        data = request.get_json() or {}
+        user_data = data.get('userData', {})
+        candidates = [item for item in data.get('candidates', []) if isinstance(item, dict)]
+        k = int(data.get('k', 10))
+        
+        # Geo pre-filter: only indexed jobs inside the radius are scored
+        if data.get('lat') is not None and data.get('lng') is not None:
+            nearby = {
+                job_id: distance
+                for job_id, distance in jobs_within_radius(data['lat'], data['lng'], data.get('radius_km', 25))
+            }
+            candidates = [item for item in candidates if str(item.get('id')) in nearby]
+        else:
+            nearby = None
+        
+        ranked, evaluated = rank_job_matches(user_data, candidates, k)
+        print(f"Ranked {len(candidates)} candidates, fully scored {evaluated}")
+        
+        matches = []
+        for index, score in ranked:
+            match = {'id': candidates[index].get('id'), 'score': score, 'jobScore': score}
+            if nearby is not None:
+                match['distanceKm'] = round(nearby[str(candidates[index].get('id'))] / 1000, 2)
+            matches.append(match)
+        
+        return jsonify({
+            "success": True,
+            "matches": matches,
+            "candidates": len(candidates),
+            "evaluated": evaluated
+        })
+        
+    except Exception as e:
+        print(f"Error in rank_matches: {str(e)}")
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
 
 @app.route('/normalize-job-title', methods=['POST'])
 def normalize_job_title():
@@ -1826,8 +2401,26 @@ def normalize_job_title():
                 "normalizedTitle": None
             }), 400
 
+        original_title = job_title
+        job_title = correct_search_term(job_title)
+
+        # Mechanical rewrites are handled locally; only low-confidence titles go to the LLM
+        local = title_normalizer.normalize(job_title)
+        if title_normalizer.is_confident(local):
+            entry = title_taxonomy.resolve(local['title'])
+            print(f"Normalized locally: '{job_title}' → '{local['title']}' ({local['confidence']})")
+            return jsonify({
+                "originalTitle": original_title,
+                "normalizedTitle": title_taxonomy.display_title(local['title']) or local['title'],
+                "titleId": entry['id'] if entry else None,
+                "confidence": local['confidence'],
+                "source": "rules"
+            })
+
         # Call OpenAI to normalize the job title
-        response = client.chat.completions.create(
+        response = call_upstream(
+            '/normalize-job-title:openai',
+            client.chat.completions.create,
             model="gpt-3.5-turbo",
             messages=[
                 {
@@ -1860,9 +2453,12 @@ def normalize_job_title():
         
         print(f"Successfully normalized: '{job_title}' → '{normalized_title}'")
         
+        entry = title_taxonomy.resolve(normalized_title)
         return jsonify({
-            "originalTitle": job_title,
-            "normalizedTitle": normalized_title
+            "originalTitle": original_title,
+            "normalizedTitle": title_taxonomy.display_title(normalized_title) or normalized_title,
+            "titleId": entry['id'] if entry else None,
+            "source": "llm"
         })
 
     except Exception as e:
@@ -1876,7 +2472,7 @@ def normalize_job_title():
 @app.route('/suggest-salary', methods=['GET'])
 def suggest_salary():
     try:
-        job_title = request.args.get('jobTitle', '')
+        job_title = correct_search_term(request.args.get('jobTitle', ''))
         industry = request.args.get('industry', '')
         location = request.args.get('location', '')
         skills = request.args.get('skills', '').split(',')
@@ -1887,62 +2483,57 @@ def suggest_salary():
         print(f"Location: {location}")
         print(f"Skills: {skills}")
 
-        # Get real job postings from SERP API
-        search_query = f"{job_title} jobs in {location}"
+        canonical_location = canonicalize_location(location)
+
+        # Answer from the precomputed corpus tables when the cell has enough postings
+        stats, scope = salary_stats.lookup(job_title, canonical_location.id)
+        if stats:
+            where = canonical_location.short if scope == 'local' else 'the US'
+            print(f"Answering from salary tables ({scope}, {stats['count']} postings)")
+            return jsonify({
+                "success": True,
+                "salary": {
+                    "minPay": stats['p25'],
+                    "maxPay": stats['p75'],
+                    "explanation": f"Based on {stats['count']} recent {job_title} postings in {where}: "
+                                   f"median ${stats['p50']:.2f}/hr, middle half between "
+                                   f"${stats['p25']:.2f} and ${stats['p75']:.2f}/hr.",
+                    "marketData": {
+                        "avgMin": stats['avgMin'],
+                        "avgMax": stats['avgMax'],
+                        "p25": stats['p25'],
+                        "p50": stats['p50'],
+                        "p75": stats['p75'],
+                        "sampleSize": stats['count'],
+                        "scope": scope
+                    }
+                },
+                "source": "table"
+            })
+
+        # Sparse cell: get real job postings from SERP API
+        search_query = f"{job_title} jobs in {canonical_location.short}"
         params = {
             "engine": "google_jobs",
             "q": search_query,
-            "location": location,
+            "location": canonical_location.display,
             "hl": "en",
             "api_key": os.getenv('SERP_API_KEY')
         }
 
         try:
-            search = GoogleSearch(params)
-            results = search.get_dict()
+            results = serp_search(params, route='/suggest-salary')
             jobs_list = results.get("jobs_results", [])
-            
-            # Extract salary information from job postings
-            salary_data = []
-            for job in jobs_list:
-                if "salary" in job:
-                    salary_info = job["salary"]
-                    # Convert salary to hourly if needed
-                    try:
-                        # Extract min and max from the salary string
-                        salary_text = salary_info.get("text", "").lower()
-                        
-                        # Skip if no clear salary information
-                        if not any(term in salary_text for term in ['hour', 'hr', 'year', 'yr', 'month', 'mo']):
-                            continue
-                            
-                        # Extract numbers from the string
-                        numbers = re.findall(r'\d+\.?\d*', salary_text)
-                        if len(numbers) >= 2:
-                            min_sal = float(numbers[0])
-                            max_sal = float(numbers[1])
-                            
-                            # Convert to hourly rate if needed
-                            if 'year' in salary_text or 'yr' in salary_text:
-                                min_sal = min_sal / (52 * 40)  # Convert yearly to hourly
-                                max_sal = max_sal / (52 * 40)
-                            elif 'month' in salary_text or 'mo' in salary_text:
-                                min_sal = min_sal / (4 * 40)   # Convert monthly to hourly
-                            
-                            salary_data.append({
-                                "min": min_sal,
-                                "max": max_sal
-                            })
-                    except Exception as e:
-                        print(f"Error parsing salary: {str(e)}")
-                        continue
-
-            print(f"Found {len(salary_data)} salary data points")
-            
+
+            # Extract hourly salary ranges from job postings
+            parsed = parse_salary_texts([posting_salary_text(job) for job in jobs_list])
+            parsed = parsed.dropna(subset=['min_hourly', 'max_hourly'])
+            print(f"Found {len(parsed)} salary data points")
+
             # Calculate average ranges from real job postings
-            if salary_data:
-                avg_min = sum(s["min"] for s in salary_data) / len(salary_data)
-                avg_max = sum(s["max"] for s in salary_data) / len(salary_data)
+            if not parsed.empty:
+                avg_min = float(parsed['min_hourly'].mean())
+                avg_max = float(parsed['max_hourly'].mean())
                 print(f"Average salary range from postings: ${avg_min:.2f} - ${avg_max:.2f}/hr")
             else:
                 avg_min = None
@@ -1965,9 +2556,8 @@ def suggest_salary():
         if avg_min is not None and avg_max is not None:
             prompt_content += f"\nMarket data shows an average range of ${avg_min:.2f} - ${avg_max:.2f}/hr in this area."
 
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
+        suggestion = make_openai_request(
+            [
                 {
                     "role": "system",
                     "content": """You are a compensation analyst specializing in salary recommendations.
@@ -1992,13 +2582,13 @@ def suggest_salary():
                     "content": prompt_content
                 }
             ],
+            max_tokens=200,
             temperature=0.3,
-            max_tokens=200
+            route='/suggest-salary'
         )
         
         # Parse the response
-        suggestion = response.choices[0].message.content.strip()
-        salary_data = json.loads(suggestion)
+        salary_data = json.loads(suggestion.strip())
         
         # Add market data to the response
         if avg_min is not None and avg_max is not None:
@@ -2011,7 +2601,8 @@ def suggest_salary():
         
         return jsonify({
             "success": True,
-            "salary": salary_data
+            "salary": salary_data,
+            "source": "live"
         })
         
     except Exception as e:
@@ -2024,6 +2615,60 @@ def suggest_salary():
         }), 500
 
 
+def fetch_serp_directions(origin, destination, mode, arrival_time=None, route='/travel-times'):
+    """Get duration and distance for one mode from SerpApi directions, or None"""
+    params = {
+        "engine": "google_maps_directions",
+        "api_key": SERP_API_KEY,
+        "origin": f"{origin[0]},{origin[1]}",
+        "destination": f"{destination[0]},{destination[1]}",
+        "travel_mode": mode,
+        "hl": "en"
+    }
+    if arrival_time and mode != 'walking':
+        params["arrival_time"] = arrival_time
+
+    data = serp_search(params, route=route)
+
+    if 'directions' in data and data['directions']:
+        leg = data['directions'][0]['legs'][0]  # First leg of the first route
+        return {
+            'duration': leg.get('duration', {}).get('text', 'N/A'),
+            'distance': leg.get('distance', {}).get('text', 'N/A')
+        }
+    return None
+
+def fetch_distance_matrix(origin, destinations, mode, arrival_time=None):
+    """Get one mode for many destinations with a single Distance Matrix call"""
+    kwargs = {
+        'origins': [origin],
+        'destinations': destinations,
+        'mode': mode,
+        'units': 'imperial'
+    }
+    # The Distance Matrix API only honours arrival_time for transit
+    if arrival_time and mode == 'transit':
+        kwargs['arrival_time'] = int(float(arrival_time))
+
+    response = call_upstream('/travel-times/matrix:distance_matrix', gmaps.distance_matrix, **kwargs)
+    elements = response.get('rows', [{}])[0].get('elements', [])
+
+    return [
+        {
+            'duration': element['duration']['text'],
+            'distance': element['distance']['text']
+        } if element.get('status') == 'OK' else None
+        for element in elements
+    ]
+
+def parse_coordinates(point):
+    """Read (lat, lng) from a dict using either lat/lng or latitude/longitude keys"""
+    lat = point.get('lat', point.get('latitude'))
+    lng = point.get('lng', point.get('longitude'))
+    if lat is None or lng is None:
+        raise ValueError("Missing coordinates")
+    return float(lat), float(lng)
+
 @app.route('/travel-times', methods=['GET'])
 def get_travel_times():
     try:
@@ -2033,6 +2678,7 @@ def get_travel_times():
         dest_lat = request.args.get('dest_lat')
         dest_lng = request.args.get('dest_lng')
         arrival_time = request.args.get('arrival_time')
+        estimate_only = request.args.get('estimate', '').lower() in ('1', 'true', 'yes')
 
         if not all([origin_lat, origin_lng, dest_lat, dest_lng]):
             return jsonify({
@@ -2040,53 +2686,39 @@ def get_travel_times():
                 "error": "Missing coordinates"
             }), 400
 
-        # Format coordinates
-        origin = f"{origin_lat},{origin_lng}"
-        destination = f"{dest_lat},{dest_lng}"
+        try:
+            origin = (float(origin_lat), float(origin_lng))
+            destination = (float(dest_lat), float(dest_lng))
+        except ValueError:
+            return jsonify({
+                "success": False,
+                "error": "Invalid coordinates"
+            }), 400
 
-        # Set up SERP API parameters
-        base_params = {
-            "engine": "google_maps_directions",
-            "api_key": SERP_API_KEY,
-            "origin": origin,
-            "destination": destination,
-            "hl": "en"
-        }
+        distance_m = calculate_distance(*origin, *destination)
 
-        # Get directions for different modes
-        modes = ['driving', 'transit', 'walking']
-        results = {}
+        # Fast path: local estimates only, no upstream calls
+        if estimate_only:
+            return jsonify({
+                "success": True,
+                "travel_times": travel_estimator.estimate_all(distance_m, travel_times.TRAVEL_MODES),
+                "estimated": True
+            })
 
-        for mode in modes:
-            try:
-                params = base_params.copy()
-                params["travel_mode"] = mode
-                if arrival_time and mode != 'walking':
-                    params["arrival_time"] = arrival_time
+        def fetch_mode(mode):
+            return fetch_serp_directions(origin, destination, mode, arrival_time)
 
-                search = GoogleSearch(params)
-                data = search.get_dict()
+        def observe(mode, result):
+            travel_estimator.observe(mode, distance_m, result.get('duration'))
 
-                if 'directions' in data and data['directions']:
-                    route = data['directions'][0]  # Get first route
-                    leg = route['legs'][0]  # Get first leg
-                    
-                    results[mode] = {
-                        'duration': leg.get('duration', {}).get('text', 'N/A'),
-                        'distance': leg.get('distance', {}).get('text', 'N/A')
-                    }
-                else:
-                    results[mode] = {
-                        'duration': 'N/A',
-                        'distance': 'N/A'
-                    }
+        # Driving, transit and walking are fetched concurrently and cached per grid cell;
+        # only fresh upstream answers calibrate the estimator, so cache hits aren't counted twice
+        start_travel_calibration()
+        results = travel_times.get_travel_times(origin, destination, arrival_time, fetch_mode,
+                                                on_fetched=observe)
 
-            except Exception as e:
-                print(f"Error getting {mode} directions: {str(e)}")
-                results[mode] = {
-                    'duration': 'N/A',
-                    'distance': 'N/A'
-                }
+        # Estimate whatever upstream couldn't answer
+        travel_estimator.fill_missing(distance_m, results)
 
         return jsonify({
             "success": True,
@@ -2100,6 +2732,223 @@ def get_travel_times():
             "error": str(e)
         }), 500
 
+MAX_MATRIX_DESTINATIONS = int(os.getenv('MAX_MATRIX_DESTINATIONS', '100'))
+
+@app.route('/travel-times/matrix', methods=['POST'])
+def get_travel_time_matrix():
+    try:
+        data = request.get_json() or {}
+        arrival_time = data.get('arrival_time')
+        estimate_only = bool(data.get('estimate'))
+        modes = [mode for mode in data.get('modes', travel_times.TRAVEL_MODES)
+                 if mode in travel_times.TRAVEL_MODES]
+
+        try:
+            origin = parse_coordinates(data.get('origin') or {})
+            destinations = [
+                (str(dest.get('id', index)), parse_coordinates(dest))
+                for index, dest in enumerate(data.get('destinations') or [])
+            ]
+        except (AttributeError, TypeError, ValueError):
+            return jsonify({
+                "success": False,
+                "error": "Invalid coordinates"
+            }), 400
+
+        if not destinations or not modes:
+            return jsonify({
+                "success": False,
+                "error": "Missing destinations or modes"
+            }), 400
+
+        # Without gmaps every destination x mode miss is its own SerpApi call
+        if len(destinations) > MAX_MATRIX_DESTINATIONS:
+            return jsonify({
+                "success": False,
+                "error": f"At most {MAX_MATRIX_DESTINATIONS} destinations per request"
+            }), 400
+
+        dest_ids = [dest_id for dest_id, _ in destinations]
+        duplicates = sorted({dest_id for dest_id in dest_ids if dest_ids.count(dest_id) > 1})
+        if duplicates:
+            return jsonify({
+                "success": False,
+                "error": f"Duplicate destination ids: {', '.join(duplicates)}"
+            }), 400
+
+        distances = {dest_id: calculate_distance(*origin, *dest) for dest_id, dest in destinations}
+
+        # Fast path for feeds: estimate every card without upstream cost
+        if estimate_only:
+            return jsonify({
+                "success": True,
+                "travel_times": {
+                    dest_id: travel_estimator.estimate_all(distance_m, modes)
+                    for dest_id, distance_m in distances.items()
+                },
+                "estimated": True
+            })
+
+        def fetch_mode(destination, mode):
+            return fetch_serp_directions(origin, destination, mode, arrival_time,
+                                         route='/travel-times/matrix')
+
+        def batch_fetch(mode, batch):
+            return fetch_distance_matrix(origin, batch, mode, arrival_time)
+
+        def observe(dest_id, mode, result):
+            travel_estimator.observe(mode, distances[dest_id], result.get('duration'))
+
+        # Use the Distance Matrix API for misses when it's configured, SerpApi otherwise
+        start_travel_calibration()
+        results = travel_times.get_travel_time_matrix(
+            origin, destinations, arrival_time, fetch_mode,
+            batch_fetch=batch_fetch if gmaps else None,
+            modes=modes,
+            on_fetched=observe
+        )
+
+        for dest_id, dest_results in results.items():
+            travel_estimator.fill_missing(distances[dest_id], dest_results)
+
+        return jsonify({
+            "success": True,
+            "travel_times": results
+        })
+
+    except Exception as e:
+        print(f"Error in get_travel_time_matrix: {str(e)}")
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+def calibrate_travel_estimator():
+    """Seed travel-time estimate calibration from previously cached real answers"""
+    try:
+        count = 0
+        for origin, destination, mode, result in travel_times.cached_answers():
+            if not result.get('estimated'):
+                travel_estimator.observe(mode, calculate_distance(*origin, *destination), result.get('duration'))
+                count += 1
+        print(f"Calibrated travel estimator from {count} cached answers")
+    except Exception as e:
+        print(f"Error calibrating travel estimator: {str(e)}")
+
+travel_calibration_started = False
+travel_calibration_lock = threading.Lock()
+
+def start_travel_calibration():
+    """Seed calibration once, in the background, on the first travel-time request"""
+    global travel_calibration_started
+    if not CALIBRATION_ENABLED or travel_calibration_started:
+        return
+    with travel_calibration_lock:
+        if travel_calibration_started:
+            return
+        travel_calibration_started = True
+    threading.Thread(target=calibrate_travel_estimator, daemon=True).start()
+
+# Worker profiles searchable by employers: vectors, locations and weekly availability
+candidate_index = CandidateIndex()
+worker_geo_index = GeoGridIndex()
+worker_availability = {}  # worker id -> availability mask
+MAX_CANDIDATE_RESULTS = 500
+# One half-hour block of shared weekly availability by default
+MIN_OVERLAP_HOURS = 0.5
+
+def index_worker(kind, doc_id, entry):
+    """Keep the candidate, geo and availability indexes in step with saved worker profiles"""
+    if kind != 'profile':
+        return
+    if entry is None or entry['document'].get('role') == 'employer':
+        candidate_index.remove(doc_id)
+        worker_geo_index.remove(doc_id)
+        worker_availability.pop(doc_id, None)
+        return
+    candidate_index.upsert(doc_id, candidate_vector(entry['derived']['vectors']['centroids']))
+    try:
+        lat, lng = parse_coordinates(entry['document'].get('location') or {})
+        worker_geo_index.upsert(doc_id, lat, lng)
+    except (TypeError, ValueError):
+        worker_geo_index.remove(doc_id)
+    worker_availability[doc_id] = availability_mask(entry['document'].get('availability'))
+
+def load_candidate_index():
+    """Index stored worker profiles at startup, then follow profile writes"""
+    for entry in profile_store.entries('profile'):
+        index_worker('profile', entry['id'], entry)
+    profile_store.add_listener(index_worker)
+    print(f"Loaded {len(candidate_index)} worker profiles into candidate index")
+
+load_candidate_index()
+
+@app.route('/candidates/search', methods=['POST'])
+def search_candidates():
+    """Top k workers for a job, limited to a radius and to overlapping availability"""
+    try:
+        data = request.get_json() or {}
+        try:
+            job, job_derived = load_document(data, 'job', 'jobId', 'jobVersion', 'job')
+        except DOCUMENT_ERRORS as e:
+            return document_error(e)
+        if not job:
+            return jsonify({
+                "success": False,
+                "error": "Missing job or jobId"
+            }), 400
+        if not job_derived:
+            job_derived = derive_document('job', job)
+        k = min(int(data.get('k', 50)), MAX_CANDIDATE_RESULTS)
+
+        # Geo pre-filter: the request's point, or the job's own location when only a radius is given
+        nearby = None
+        if data.get('radius_km') is not None or data.get('lat') is not None:
+            lat, lng = data.get('lat'), data.get('lng')
+            if lat is None or lng is None:
+                lat, lng = parse_coordinates(job.get('location') or {})
+            nearby = dict(worker_geo_index.within(lat, lng, float(data.get('radius_km', 25)) * 1000))
+
+        # Availability filter: workers must share enough weekly hours with the job's schedule
+        job_mask = availability_mask(data.get('availability') or job.get('availability'))
+        min_overlap = float(data.get('minOverlapHours', MIN_OVERLAP_HOURS))
+
+        def allowed(worker_id):
+            return overlap_hours(job_mask, worker_availability.get(worker_id, 0)) >= min_overlap
+
+        # Workers inside the radius are the candidate set; a small one is scored exactly
+        query = candidate_vector(job_derived['vectors']['centroids'])
+        ranked, examined = candidate_index.search(query, k, allowed if job_mask else None, candidates=nearby)
+        print(f"Candidate search: {len(ranked)} of {len(candidate_index)} workers, examined {examined}")
+
+        candidates = []
+        for worker_id, score in ranked:
+            candidate = {'id': worker_id, 'score': round(score, 4)}
+            if nearby is not None:
+                candidate['distanceKm'] = round(nearby[worker_id] / 1000, 2)
+            if job_mask:
+                candidate['overlapHours'] = overlap_hours(job_mask, worker_availability.get(worker_id, 0))
+            candidates.append(candidate)
+
+        return jsonify({
+            "success": True,
+            "candidates": candidates,
+            "examined": examined,
+            "indexed": len(candidate_index)
+        })
+
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+    except Exception as e:
+        print(f"Error in search_candidates: {str(e)}")
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
 def truncate_text(text, max_length=200):
     if len(text) <= max_length:
         return text
@@ -2109,11 +2958,17 @@ def truncate_text(text, max_length=200):
 def analyze_job_fit():
     try:
         data = request.json
-        job_data = data.get('job', {})
-        user_data = data.get('user', {})
+        try:
+            job_data, job_derived = load_document(data, 'job', 'jobId', 'jobVersion', 'job')
+            user_data, _ = load_document(data, 'user', 'userId', 'userVersion', 'profile')
+        except DOCUMENT_ERRORS as e:
+            return document_error(e)
 
         # Gather all the analysis points
-        job_skills = [s.get('name') if isinstance(s, dict) else s for s in job_data.get('requiredSkills', [])]
+        if job_derived:
+            job_skills = job_derived['skills']
+        else:
+            job_skills = [s.get('name') if isinstance(s, dict) else s for s in job_data.get('requiredSkills', [])]
         user_skills = user_data.get('skills', [])
         
         # Calculate distance if locations are available
@@ -2159,7 +3014,9 @@ def analyze_job_fit():
         )
 
         # Get detailed analysis first
-        detailed_response = client.chat.completions.create(
+        detailed_response = call_upstream(
+            '/analyze-job-fit:openai',
+            client.chat.completions.create,
             model="gpt-3.5-turbo",
             messages=[
                 {
@@ -2198,7 +3055,9 @@ def analyze_job_fit():
         """
 
         # Get condensed summaries
-        summary_response = client.chat.completions.create(
+        summary_response = call_upstream(
+            '/analyze-job-fit:openai-summary',
+            client.chat.completions.create,
             model="gpt-3.5-turbo",
             messages=[
                 {
@@ -2243,23 +3102,32 @@ def analyze_job_fit():
 def analyze_employee_fit():
     try:
         data = request.json
-        job = data.get('job')  # This will be the employee data
-        user = data.get('user')  # This will be the employer data
+        try:
+            job, job_derived = load_document(data, 'job', 'employeeId', 'employeeVersion', 'profile')  # This will be the employee data
+            user, user_derived = load_document(data, 'user', 'employerId', 'employerVersion', 'profile')  # This will be the employer data
+        except DOCUMENT_ERRORS as e:
+            return document_error(e)
         
         if not job or not user:
             return jsonify({'success': False, 'error': 'Missing data'})
 
         # Extract relevant data for the prompt
         employee_name = job.get('name', 'Candidate')
-        employee_skills = []
-        for selected_job in job.get('selectedJobs', []):
-            if selected_job.get('skills'):
-                employee_skills.extend([skill.get('name', '') for skill in selected_job['skills']])
+        if job_derived:
+            employee_skills = job_derived['skills']
+        else:
+            employee_skills = []
+            for selected_job in job.get('selectedJobs', []):
+                if selected_job.get('skills'):
+                    employee_skills.extend([skill.get('name', '') for skill in selected_job['skills']])
 
-        employer_skills = []
-        for selected_job in user.get('selectedJobs', []):
-            if selected_job.get('skills'):
-                employer_skills.extend([skill.get('name', '') for skill in selected_job['skills']])
+        if user_derived:
+            employer_skills = user_derived['skills']
+        else:
+            employer_skills = []
+            for selected_job in user.get('selectedJobs', []):
+                if selected_job.get('skills'):
+                    employer_skills.extend([skill.get('name', '') for skill in selected_job['skills']])
 
         # Construct the prompt
         prompt = (
@@ -2284,7 +3152,9 @@ def analyze_employee_fit():
         )
 
         # Get detailed analysis first
-        detailed_response = client.chat.completions.create(
+        detailed_response = call_upstream(
+            '/analyze-employee-fit:openai',
+            client.chat.completions.create,
             model="gpt-3.5-turbo",
             messages=[
                 {
@@ -2323,7 +3193,9 @@ def analyze_employee_fit():
         """
 
         # Get condensed summaries
-        summary_response = client.chat.completions.create(
+        summary_response = call_upstream(
+            '/analyze-employee-fit:openai-summary',
+            client.chat.completions.create,
             model="gpt-3.5-turbo",
             messages=[
                 {
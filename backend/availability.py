@@ -0,0 +1,56 @@
+"""
+Weekly availability as a bitmask of half-hour blocks.
+
+Profiles and jobs store availability as
+{date: {repeatType, slots: [{startTime, endTime}]}} keyed by ISO date. Each
+slot is folded onto its weekday as a set of half-hour blocks in one 336-bit
+integer, so "is this worker free when this job needs them" is a single AND
+and popcount instead of a walk over both calendars. Every date is treated
+as recurring on its weekday, which is how the app uses weekly and biweekly
+availability; one-off dates are folded the same way, so the filter can
+over-admit but never drops a worker the slot-by-slot comparison would keep.
+"""
+from datetime import date
+
+BLOCK_MINUTES = 30
+BLOCKS_PER_DAY = 24 * 60 // BLOCK_MINUTES
+
+
+def _minutes(value):
+    """Minutes past midnight for "14:30" or a 12-hour "02:30 PM" / "2:30 p.m." as the app writes it"""
+    text = ''.join(str(value or '').lower().replace('.', '').split())
+    suffix = text[-2:] if text[-2:] in ('am', 'pm') else ''
+    hours, _, minutes = text[:len(text) - len(suffix)].partition(':')
+    hours = int(hours)
+    if suffix:
+        if not 1 <= hours <= 12:
+            raise ValueError(f"Invalid 12-hour time: {value}")
+        hours = hours % 12 + (12 if suffix == 'pm' else 0)
+    return hours * 60 + int(minutes[:2] or 0)
+
+
+def availability_mask(availability):
+    """Bitmask of the weekly half-hour blocks covered by any slot; 0 when nothing parses"""
+    mask = 0
+    for day, day_data in (availability or {}).items():
+        try:
+            weekday = date.fromisoformat(str(day)[:10]).weekday()
+        except ValueError:
+            continue
+        slots = day_data.get('slots', []) if isinstance(day_data, dict) else day_data
+        for slot in slots or []:
+            try:
+                start, end = _minutes(slot.get('startTime')), _minutes(slot.get('endTime'))
+            except (AttributeError, ValueError):
+                continue
+            if end <= start:
+                end = 24 * 60  # Slots running past midnight are cut at the end of the day
+            first = weekday * BLOCKS_PER_DAY + start // BLOCK_MINUTES
+            last = weekday * BLOCKS_PER_DAY + (end + BLOCK_MINUTES - 1) // BLOCK_MINUTES
+            mask |= ((1 << (last - first)) - 1) << first
+    return mask
+
+
+def overlap_hours(mask1, mask2):
+    """Weekly hours two availability masks share"""
+    return bin(mask1 & mask2).count('1') * BLOCK_MINUTES / 60
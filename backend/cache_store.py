@@ -0,0 +1,104 @@
+"""
+Small persistent key/value cache backed by SQLite.
+
+Values are JSON-serialisable objects stored with the time they were written,
+so callers decide freshness themselves (TTL, stale-while-revalidate, ...).
+An in-memory dict sits in front of SQLite so hot keys never touch disk.
+Callers get copies, so mutating a returned value never changes the cache.
+"""
+import copy
+import json
+import os
+import sqlite3
+import threading
+import time
+
+CACHE_DIR = os.getenv('CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache'))
+CACHE_DB_PATH = os.getenv('CACHE_DB_PATH', os.path.join(CACHE_DIR, 'cache.sqlite3'))
+
+
+class PersistentTTLCache:
+    """Namespaced cache whose entries survive restarts"""
+
+    def __init__(self, namespace, db_path=CACHE_DB_PATH, max_memory_entries=5000):
+        self.namespace = namespace
+        self.db_path = db_path
+        self.max_memory_entries = max_memory_entries
+        self.memory = {}
+        self.lock = threading.Lock()
+        self.conn = None
+        try:
+            if db_path != ':memory:':
+                os.makedirs(os.path.dirname(db_path), exist_ok=True)
+            self.conn = sqlite3.connect(db_path, check_same_thread=False)
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+                "stored_at REAL NOT NULL, PRIMARY KEY (namespace, key))"
+            )
+            self.conn.commit()
+        except sqlite3.Error as e:
+            # Fall back to memory-only caching rather than failing requests
+            print(f"Error opening cache database {db_path}: {str(e)}")
+            self.conn = None
+
+    def get(self, key):
+        """Return (a copy of value, stored_at) or (None, None) if the key is unknown"""
+        with self.lock:
+            if key in self.memory:
+                value, stored_at = self.memory[key]
+                return copy.deepcopy(value), stored_at
+            if not self.conn:
+                return None, None
+            row = self.conn.execute(
+                "SELECT value, stored_at FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key)
+            ).fetchone()
+            if not row:
+                return None, None
+            self._remember(key, (json.loads(row[0]), row[1]))
+            return json.loads(row[0]), row[1]
+
+    def set(self, key, value, stored_at=None):
+        entry = (copy.deepcopy(value), stored_at if stored_at is not None else time.time())
+        with self.lock:
+            self._remember(key, entry)
+            if self.conn:
+                try:
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO cache_entries (namespace, key, value, stored_at) VALUES (?, ?, ?, ?)",
+                        (self.namespace, key, json.dumps(value), entry[1])
+                    )
+                    self.conn.commit()
+                except sqlite3.Error as e:
+                    print(f"Error writing cache entry {key}: {str(e)}")
+
+    def delete(self, key):
+        with self.lock:
+            self.memory.pop(key, None)
+            if self.conn:
+                try:
+                    self.conn.execute(
+                        "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                        (self.namespace, key)
+                    )
+                    self.conn.commit()
+                except sqlite3.Error as e:
+                    print(f"Error deleting cache entry {key}: {str(e)}")
+
+    def items(self):
+        """Iterate over every (key, value, stored_at) in this namespace"""
+        with self.lock:
+            if not self.conn:
+                return [(key, copy.deepcopy(value), stored_at) for key, (value, stored_at) in self.memory.items()]
+            rows = self.conn.execute(
+                "SELECT key, value, stored_at FROM cache_entries WHERE namespace = ?",
+                (self.namespace,)
+            ).fetchall()
+        return [(key, json.loads(value), stored_at) for key, value, stored_at in rows]
+
+    def _remember(self, key, entry):
+        if len(self.memory) >= self.max_memory_entries and key not in self.memory:
+            # Drop the oldest insertion to keep memory bounded
+            self.memory.pop(next(iter(self.memory)))
+        self.memory[key] = entry
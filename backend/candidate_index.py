@@ -0,0 +1,212 @@
+"""
+Approximate top-k search over stored worker profile vectors.
+
+Each worker is one vector: their title, skills and overview centroids,
+each scaled by the square root of its weight and concatenated, so a dot
+product with a job's vector built the same way is the weighted sum of the
+three field cosines. Workers are partitioned into inverted lists around
+k-means centres (IVF). A search scores only the workers in the lists
+nearest the query and widens the probe when filters (radius,
+availability) leave fewer than k. Small populations, and candidate sets
+(workers inside a radius) smaller than the lists a probe would walk, are
+scored exactly. The lists are rebuilt on a background thread as the
+population grows; searches use the previous lists until it finishes.
+"""
+import math
+import os
+import threading
+
+import numpy as np
+
+CANDIDATE_FIELD_WEIGHTS = {'title': 0.4, 'skills': 0.4, 'overview': 0.2}
+# Below this many workers an exact scan is cheaper than maintaining lists
+CANDIDATE_INDEX_MIN_POINTS = int(os.getenv('CANDIDATE_INDEX_MIN_POINTS', '1000'))
+CANDIDATE_INDEX_PROBES = int(os.getenv('CANDIDATE_INDEX_PROBES', '8'))
+KMEANS_ITERATIONS = 10
+
+
+def candidate_vector(centroids, weights=CANDIDATE_FIELD_WEIGHTS):
+    """Weighted concatenation of field centroids, or None when every field is missing"""
+    present = [centroids.get(field) for field in weights if centroids.get(field) is not None]
+    if not present:
+        return None
+    dimension = len(present[0])
+    parts = []
+    for field, weight in weights.items():
+        vector = centroids.get(field)
+        parts.append(np.zeros(dimension) if vector is None else math.sqrt(weight) * np.asarray(vector, dtype=np.float64))
+    return np.concatenate(parts)
+
+
+def _kmeans(matrix, count, iterations=KMEANS_ITERATIONS, seed=0):
+    """Spherical k-means: unit centres, points assigned by largest dot product"""
+    rng = np.random.default_rng(seed)
+    centres = matrix[rng.choice(len(matrix), count, replace=False)].copy()
+    for _ in range(iterations):
+        norms = np.linalg.norm(centres, axis=1, keepdims=True)
+        centres = centres / np.where(norms == 0, 1, norms)
+        assignments = np.argmax(matrix @ centres.T, axis=1)
+        for i in range(count):
+            members = matrix[assignments == i]
+            if len(members):
+                centres[i] = members.mean(axis=0)
+    norms = np.linalg.norm(centres, axis=1, keepdims=True)
+    centres = centres / np.where(norms == 0, 1, norms)
+    return centres, np.argmax(matrix @ centres.T, axis=1)
+
+
+class CandidateIndex:
+    """IVF index of worker vectors with filtered approximate top-k search"""
+
+    def __init__(self, min_points=CANDIDATE_INDEX_MIN_POINTS, probes=CANDIDATE_INDEX_PROBES):
+        self.min_points = min_points
+        self.probes = probes
+        self.vectors = {}  # worker id -> vector
+        self.centres = None
+        self.lists = []  # list number -> set of worker ids
+        self.assignments = {}  # worker id -> list number
+        self.trained_size = 0
+        self.training = None  # background training thread while one runs
+        self.searches = 0
+        self.examined = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.vectors)
+
+    def upsert(self, worker_id, vector):
+        with self.lock:
+            self._remove(worker_id)
+            if vector is None:
+                return
+            self.vectors[worker_id] = np.asarray(vector, dtype=np.float64)
+            if self.centres is not None:
+                self._assign(worker_id)
+            if (self.training is None and len(self.vectors) >= self.min_points
+                    and len(self.vectors) >= 2 * self.trained_size):
+                self.training = threading.Thread(target=self.train, daemon=True)
+                self.training.start()
+
+    def remove(self, worker_id):
+        with self.lock:
+            self._remove(worker_id)
+
+    def _remove(self, worker_id):
+        self.vectors.pop(worker_id, None)
+        list_number = self.assignments.pop(worker_id, None)
+        if list_number is not None:
+            self.lists[list_number].discard(worker_id)
+
+    def _assign(self, worker_id):
+        list_number = int(np.argmax(self.centres @ self.vectors[worker_id]))
+        self.assignments[worker_id] = list_number
+        self.lists[list_number].add(worker_id)
+
+    def train(self):
+        """
+        Rebuild the lists around ~sqrt(n) centres; upsert reruns it whenever the population doubles.
+        k-means runs on a snapshot outside the lock; workers written meanwhile are assigned at the swap.
+        """
+        try:
+            with self.lock:
+                snapshot = dict(self.vectors)
+            ids = list(snapshot)
+            matrix = np.asarray([snapshot[worker_id] for worker_id in ids])
+            centres, assignments = _kmeans(matrix, max(1, int(math.sqrt(len(ids)))))
+            with self.lock:
+                self.centres = centres
+                self.lists = [set() for _ in range(len(centres))]
+                self.assignments = {}
+                for worker_id, list_number in zip(ids, assignments):
+                    if self.vectors.get(worker_id) is snapshot[worker_id]:
+                        self.assignments[worker_id] = int(list_number)
+                        self.lists[int(list_number)].add(worker_id)
+                for worker_id in self.vectors:
+                    if worker_id not in self.assignments:
+                        self._assign(worker_id)
+                self.trained_size = len(ids)
+            print(f"Candidate index trained: {len(ids)} workers in {len(centres)} lists")
+        except Exception as e:
+            print(f"Error training candidate index: {str(e)}")
+        finally:
+            with self.lock:
+                self.training = None
+
+    def search(self, query, k, allowed=None, candidates=None):
+        """
+        Return ([(worker_id, score)], examined) for the best k workers that pass allowed(worker_id),
+        limited to the candidates collection of ids when one is given. examined counts the ids
+        filtered or scored. Exact below min_points and for candidate sets smaller than the lists
+        the first probe would walk; otherwise probes the nearest lists, widening until k pass.
+        Ids and vectors are read under the lock and filtered after releasing it; upsert replaces
+        a worker's vector rather than changing it in place, so the references stay valid.
+        """
+        if query is None or k <= 0:
+            return [], 0
+        query = np.asarray(query, dtype=np.float64)
+
+        def passes(worker_id):
+            if candidates is not None and worker_id not in candidates:
+                return False
+            return allowed is None or allowed(worker_id)
+
+        with self.lock:
+            lists = self.lists
+            order = None if self.centres is None else np.argsort(-(self.centres @ query))
+            first_probe = 0 if order is None else sum(len(lists[i]) for i in order[:self.probes])
+            if candidates is not None and (order is None or len(candidates) < first_probe):
+                examined = len(candidates)
+                members = [(worker_id, self.vectors[worker_id]) for worker_id in candidates if worker_id in self.vectors]
+                probes = None
+            elif order is None:
+                examined = len(self.vectors)
+                members = list(self.vectors.items())
+                probes = None
+            else:
+                probes = min(self.probes, len(order))
+                members = self._members(lists, order[:probes])
+                examined = len(members)
+
+        seen = set()
+        found = []
+        while True:
+            for worker_id, vector in members:
+                # A worker re-upserted between probes can turn up in a later list too
+                if worker_id not in seen and passes(worker_id):
+                    found.append((worker_id, vector))
+                seen.add(worker_id)
+            if probes is None or len(found) >= k or probes == len(order):
+                break
+            probed, probes = probes, min(len(order), probes * 2)
+            with self.lock:
+                members = self._members(lists, order[probed:probes])
+            examined += len(members)
+
+        with self.lock:
+            self.searches += 1
+            self.examined += examined
+        if not found:
+            return [], examined
+        scores = np.asarray([vector for _, vector in found]) @ query
+        top = np.argsort(-scores, kind='stable')[:k]
+        return [(found[i][0], float(scores[i])) for i in top], examined
+
+    def _members(self, lists, list_numbers):
+        """(worker_id, vector) for the still-stored workers of the given lists; call under the lock"""
+        return [
+            (worker_id, self.vectors[worker_id])
+            for list_number in list_numbers
+            for worker_id in lists[list_number]
+            if worker_id in self.vectors
+        ]
+
+    def get_stats(self):
+        with self.lock:
+            return {
+                'workers': len(self.vectors),
+                'lists': len(self.lists),
+                'trained': self.centres is not None,
+                'training': self.training is not None,
+                'searches': self.searches,
+                'avgExamined': round(self.examined / self.searches, 1) if self.searches else 0.0
+            }
@@ -0,0 +1,120 @@
+"""
+Cheap-first similarity for short phrases (titles, industries, skills).
+
+A comparison walks the stages in cost order and stops at the first one
+that is decisive:
+
+1. exact: same normalized text
+2. canonical: both resolve to taxonomy ids (equal ids, or the precomputed
+   id-pair table)
+3. lexical: word Jaccard that is high; low or no overlap says nothing
+   ("Server" and "Waiter" share no words), so it falls through
+4. embedding: the spaCy similarity, only for what is left
+
+Saved documents keep each phrase's key, canonical id and the vector the
+embedding stage would compare (phrase()), and score_phrases() walks the
+same stages over those, with a dot product in place of the embedder.
+
+Per-stage hit counts show how often the embedder is still reached.
+"""
+import threading
+
+from profile_vectors import cosine, to_list, unit
+from typeahead import normalize
+
+STAGES = ('empty', 'exact', 'canonical', 'lexical', 'embedding', 'vector')
+
+# Same stopwords calculate_job_similarity drops
+COMMON_WORDS = {'and', 'or', 'the', 'in', 'at', 'of', 'for', 'to', 'with', '&', '/', '-'}
+# Word overlap at or above this scores as the overlap itself without embedding
+LEXICAL_MATCH_THRESHOLD = 0.75
+
+
+def content_words(text):
+    return {word for word in normalize(text).replace('/', ' ').split() if word not in COMMON_WORDS}
+
+
+def word_jaccard(text1, text2):
+    """Jaccard similarity of the content words of two phrases"""
+    words1, words2 = content_words(text1), content_words(text2)
+    if not words1 or not words2:
+        return 0.0
+    return len(words1 & words2) / len(words1 | words2)
+
+
+class CascadeScorer:
+    """Phrase similarity in [0, 1] from the cheapest decisive stage"""
+
+    def __init__(self, embed, resolve=None, id_similarity=None, lexical_threshold=LEXICAL_MATCH_THRESHOLD):
+        # embed: (text1, text2) -> similarity, the expensive fallback
+        # resolve: text -> canonical id or None
+        # id_similarity: (id1, id2) -> similarity for two distinct resolved ids
+        self.embed = embed
+        self.resolve = resolve
+        self.id_similarity = id_similarity
+        self.lexical_threshold = lexical_threshold
+        self.counts = {stage: 0 for stage in STAGES}
+        self.lock = threading.Lock()
+
+    def score(self, text1, text2):
+        key1, key2 = normalize(text1), normalize(text2)
+        return self._count(*self._score(
+            key1, key2,
+            lambda: (self.resolve(text1), self.resolve(text2)),
+            lambda: (self.embed(*sorted((key1, key2))), 'embedding')
+        ))
+
+    def phrase(self, text, vector=None):
+        """
+        What score_phrases needs of a text, worked out once when a document is saved:
+        {'key', 'id', 'vector'}. vector: normalized key -> the vector the embedder compares.
+        """
+        key = normalize(text)
+        return {
+            'key': key,
+            'id': self.resolve(text) if key and self.resolve is not None else None,
+            'vector': to_list(unit(vector(key))) if key and vector is not None else None
+        }
+
+    def score_phrases(self, phrase1, phrase2):
+        """score() over two stored phrases; unresolved pairs compare their stored vectors"""
+        return self._count(*self._score(
+            phrase1['key'], phrase2['key'],
+            lambda: (phrase1['id'], phrase2['id']),
+            lambda: (cosine(phrase1['vector'], phrase2['vector']), 'vector')
+        ))
+
+    def _count(self, similarity, stage):
+        with self.lock:
+            self.counts[stage] += 1
+        return similarity
+
+    def _score(self, key1, key2, ids, embed):
+        if not key1 or not key2:
+            return 0.0, 'empty'
+        if key1 == key2:
+            return 1.0, 'exact'
+
+        if self.resolve is not None:
+            id1, id2 = ids()
+            if id1 is not None and id1 == id2:
+                return 1.0, 'canonical'
+            if id1 is not None and id2 is not None and self.id_similarity is not None:
+                return self.id_similarity(id1, id2), 'canonical'
+
+        overlap = word_jaccard(key1, key2)
+        if overlap >= self.lexical_threshold:
+            return overlap, 'lexical'
+
+        return embed()
+
+    def get_stats(self):
+        with self.lock:
+            total = sum(self.counts.values())
+            return {
+                'comparisons': total,
+                'stages': {
+                    stage: {'hits': hits, 'hitRate': round(hits / total, 4) if total else 0.0}
+                    for stage, hits in self.counts.items()
+                }
+            }
@@ -0,0 +1,101 @@
+"""
+Vectorized distance math and a grid-bucket spatial index for job locations.
+
+haversine_distances() computes distances from one point to many in a single
+NumPy pass. GeoGridIndex buckets job coordinates into fixed-size lat/lng
+cells so "all jobs within R km of this worker" only touches the cells that
+overlap the search circle, and can run as a cheap pre-filter before any
+semantic scoring.
+"""
+import math
+import os
+import threading
+
+import numpy as np
+
+EARTH_RADIUS_M = 6371000.0
+GEO_INDEX_CELL_DEGREES = float(os.getenv('GEO_INDEX_CELL_DEGREES', '0.1'))  # Roughly 11km of latitude
+
+
+def haversine_distances(lat, lng, lats, lngs):
+    """Distances in meters from (lat, lng) to every point in the lats/lngs arrays"""
+    lat = np.radians(float(lat))
+    lng = np.radians(float(lng))
+    lats = np.radians(np.asarray(lats, dtype=np.float64))
+    lngs = np.radians(np.asarray(lngs, dtype=np.float64))
+
+    a = np.sin((lats - lat) / 2) ** 2 + np.cos(lat) * np.cos(lats) * np.sin((lngs - lng) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class GeoGridIndex:
+    """Fixed-size lat/lng buckets over point ids"""
+
+    def __init__(self, cell_degrees=GEO_INDEX_CELL_DEGREES):
+        self.cell_degrees = cell_degrees
+        self.cells = {}  # (lat_index, lng_index) -> set of ids
+        self.points = {}  # id -> (lat, lng)
+        self.lock = threading.Lock()
+
+    def _cell(self, lat, lng):
+        return (math.floor(lat / self.cell_degrees), math.floor(lng / self.cell_degrees))
+
+    def upsert(self, point_id, lat, lng):
+        lat, lng = float(lat), float(lng)
+        with self.lock:
+            self._remove(point_id)
+            self.points[point_id] = (lat, lng)
+            self.cells.setdefault(self._cell(lat, lng), set()).add(point_id)
+
+    def remove(self, point_id):
+        with self.lock:
+            self._remove(point_id)
+
+    def _remove(self, point_id):
+        previous = self.points.pop(point_id, None)
+        if previous is not None:
+            cell = self._cell(*previous)
+            members = self.cells.get(cell)
+            if members:
+                members.discard(point_id)
+                if not members:
+                    del self.cells[cell]
+
+    def __len__(self):
+        return len(self.points)
+
+    def candidates(self, lat, lng, radius_m):
+        """Ids in every cell overlapping the bounding box of the search circle"""
+        lat_span = math.degrees(radius_m / EARTH_RADIUS_M)
+        cos_lat = max(math.cos(math.radians(min(89.9, abs(lat) + lat_span))), 1e-6)
+        lng_span = min(180.0, lat_span / cos_lat)
+
+        min_lat, min_lng = self._cell(lat - lat_span, lng - lng_span)
+        max_lat, max_lng = self._cell(lat + lat_span, lng + lng_span)
+
+        found = []
+        with self.lock:
+            if (max_lat - min_lat + 1) * (max_lng - min_lng + 1) > len(self.cells):
+                # Huge radius: cheaper to scan the occupied cells
+                for (cell_lat, cell_lng), members in self.cells.items():
+                    if min_lat <= cell_lat <= max_lat and min_lng <= cell_lng <= max_lng:
+                        found.extend(members)
+            else:
+                for cell_lat in range(min_lat, max_lat + 1):
+                    for cell_lng in range(min_lng, max_lng + 1):
+                        found.extend(self.cells.get((cell_lat, cell_lng), ()))
+            positions = [self.points[point_id] for point_id in found]
+        return found, positions
+
+    def within(self, lat, lng, radius_m):
+        """Return [(id, distance_m)] for points within radius_m, nearest first"""
+        lat, lng = float(lat), float(lng)
+        ids, positions = self.candidates(lat, lng, radius_m)
+        if not ids:
+            return []
+
+        coords = np.asarray(positions, dtype=np.float64)
+        distances = haversine_distances(lat, lng, coords[:, 0], coords[:, 1])
+        inside = np.nonzero(distances <= radius_m)[0]
+        order = inside[np.argsort(distances[inside], kind='stable')]
+        return [(ids[i], float(distances[i])) for i in order]
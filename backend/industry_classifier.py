@@ -0,0 +1,115 @@
+"""
+Keyword industry classifier.
+
+Built once from the tiered industry_search_terms table (broad terms first,
+more specific terms in later tiers) plus the plain industry names. All terms
+are compiled into one KeywordMatcher, so a description is classified in a
+single scan: each distinct term found casts a weighted vote for its
+industries, with specific tiers weighing more than broad ones.
+
+Postings are scored field by field. A term in the title or company name
+says far more about the employer than one in the description, and
+benefits boilerplate ("medical, dental and vision") is dropped from the
+description before it is scanned, since it names Healthcare terms in
+every industry's postings.
+"""
+import re
+
+from keyword_matcher import KeywordMatcher
+
+# Vote weight by tier position in industry_search_terms; later tiers reuse the last weight
+TIER_WEIGHTS = (1.0, 1.5, 2.0)
+NAME_WEIGHT = 1.0
+MIN_INDUSTRY_SCORE = 1.0
+
+# Vote multiplier by posting field; a term votes once, at its heaviest field
+POSTING_FIELD_WEIGHTS = (('title', 3.0), ('company_name', 2.0), ('description', 1.0))
+
+# Sentences and lines about compensation and perks rather than the work itself
+BENEFITS_SENTENCE = re.compile(
+    r'\b(?:benefits?|insurance|401\s*\(?k\)?|paid time off|pto|perks|retirement|tuition|'
+    r'employee discounts?|medical, dental|dental and vision|health savings)\b',
+    re.IGNORECASE
+)
+# A "Benefits:" / "What we offer" heading; the lines under it up to a blank line are boilerplate too
+BENEFITS_HEADING = re.compile(
+    r'^\W*(?:benefits|perks|what we offer|we offer|compensation\s*(?:and|&)\s*benefits)(?:\s+include)?\s*:?\s*$',
+    re.IGNORECASE
+)
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+
+def strip_benefits(description):
+    """description without benefits sections and sentences"""
+    kept = []
+    in_section = False
+    for line in str(description or '').split('\n'):
+        if BENEFITS_HEADING.match(line):
+            in_section = True
+            continue
+        if not line.strip():
+            in_section = False
+            continue
+        if in_section:
+            continue
+        sentences = [sentence for sentence in SENTENCE_END.split(line) if not BENEFITS_SENTENCE.search(sentence)]
+        if sentences:
+            kept.append(' '.join(sentences))
+    return '\n'.join(kept)
+
+
+class IndustryClassifier:
+    """Weighted keyword votes per industry"""
+
+    def __init__(self, search_terms, industry_names=(), tier_weights=TIER_WEIGHTS):
+        votes = {}  # term -> {industry: weight}
+
+        def add(term, industry, weight):
+            term = term.strip()
+            # Acronyms keep their casing so the matcher stays case-sensitive for them
+            term_votes = votes.setdefault(term if term.isupper() else term.lower(), {})
+            term_votes[industry] = max(weight, term_votes.get(industry, 0))
+
+        for industry, tiers in search_terms.items():
+            for tier, terms in enumerate(tiers):
+                weight = tier_weights[min(tier, len(tier_weights) - 1)]
+                for term in terms:
+                    add(term, industry, weight)
+        for industry in industry_names:
+            add(industry, industry, NAME_WEIGHT)
+
+        self.industries = sorted({industry for term_votes in votes.values() for industry in term_votes})
+        self.matcher = KeywordMatcher(
+            (term, (term, tuple(sorted(term_votes.items())))) for term, term_votes in votes.items()
+        )
+
+    def classify(self, text):
+        """{industry: score} from one scan of text; each distinct term votes once"""
+        scores = {}
+        for _, term_votes in self.matcher.find_all(text):
+            for industry, weight in term_votes:
+                scores[industry] = scores.get(industry, 0) + weight
+        return scores
+
+    def score_posting(self, job):
+        """{industry: score} for a SerpApi job posting, weighting title and company above the description"""
+        term_weights = {}  # term votes -> heaviest field it appeared in
+        for field, field_weight in POSTING_FIELD_WEIGHTS:
+            text = job.get(field) or ''
+            if field == 'description':
+                text = strip_benefits(text)
+            for found in self.matcher.find_all(text):
+                term_weights[found] = max(field_weight, term_weights.get(found, 0))
+        scores = {}
+        for (_, term_votes), field_weight in term_weights.items():
+            for industry, weight in term_votes:
+                scores[industry] = scores.get(industry, 0) + weight * field_weight
+        return scores
+
+    def classify_posting(self, job, min_score=MIN_INDUSTRY_SCORE):
+        """Best industry for a SerpApi job posting, or None"""
+        scores = self.score_posting(job)
+        if not scores:
+            return None
+        industry, score = min(scores.items(), key=lambda item: (-item[1], item[0]))
+        return industry if score >= min_score else None
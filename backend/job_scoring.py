@@ -0,0 +1,99 @@
+"""
+Job match scores from pairwise phrase similarities.
+
+calculate_job_score and /analyze-job-match combine title, industry and
+skill similarities the same way whether the documents arrive in full or
+are named by id. The arithmetic lives here and takes the similarity per
+field as a callable: the cascade scorers over raw text for request
+payloads, or over the phrases stored when a document was saved (canonical
+ids plus the vector the embedding stage would use). Both walk the same
+cascade, so a document scores the same either way.
+"""
+# Points per field for one user job x candidate job pair; 40 in total
+TITLE_POINTS = 20
+INDUSTRY_POINTS = 10
+SKILLS_POINTS = 10
+
+
+def skill_names(skills):
+    """Skill names from a list of {'name': ...} dicts or plain strings"""
+    names = []
+    for skill in skills or []:
+        name = skill.get('name', '') if isinstance(skill, dict) else skill
+        if isinstance(name, str) and name.strip() and name not in names:
+            names.append(name)
+    return names
+
+
+def document_jobs(kind, document):
+    """
+    [{'title', 'industry', 'skills': [names]}] for a document: one entry for a
+    job posting, one per selected job for a profile.
+    """
+    if kind == 'job':
+        return [{
+            'title': document.get('jobTitle') or '',
+            'industry': document.get('industry') or '',
+            'skills': skill_names(document.get('requiredSkills'))
+        }]
+    return [
+        {
+            'title': job.get('title') or '',
+            'industry': job.get('industry') or '',
+            'skills': skill_names(job.get('skills'))
+        }
+        for job in document.get('selectedJobs', [])
+    ]
+
+
+def map_phrases(jobs, phrase):
+    """jobs with every title, industry and skill replaced by phrase(field, text)"""
+    return [
+        {
+            'title': phrase('title', job['title']),
+            'industry': phrase('industry', job['industry']),
+            'skills': [phrase('skills', skill) for skill in job['skills']]
+        }
+        for job in jobs
+    ]
+
+
+def best_similarity_mean(required, offered, similarity):
+    """Mean over required phrases of the best similarity to any offered phrase; 0 when either is empty"""
+    if not required or not offered:
+        return 0.0
+    return sum(max(similarity(first, second) for second in offered) for first in required) / len(required)
+
+
+def pair_base_points(user_job, candidate_job, similarities):
+    """Title (max 20) and industry (max 10) points for one user job x candidate job pair"""
+    return (
+        similarities['title'](user_job['title'], candidate_job['title']) * TITLE_POINTS,
+        similarities['industry'](user_job['industry'], candidate_job['industry']) * INDUSTRY_POINTS
+    )
+
+
+def pair_skills_points(user_job, candidate_job, similarities):
+    """Skills points (max 10) for one user job x candidate job pair"""
+    return best_similarity_mean(user_job['skills'], candidate_job['skills'], similarities['skills']) * SKILLS_POINTS
+
+
+def best_job_score(user_jobs, candidate_jobs, similarities):
+    """Best title + industry + skills points over every user job x candidate job pair"""
+    max_job_score = 0
+    for user_job in user_jobs:
+        for candidate_job in candidate_jobs:
+            title_points, industry_points = pair_base_points(user_job, candidate_job, similarities)
+            total = title_points + industry_points + pair_skills_points(user_job, candidate_job, similarities)
+            max_job_score = max(max_job_score, total)
+    return max_job_score
+
+
+def match_components(job, user_jobs, industry_prefs, similarities):
+    """Title, industry and skills similarity in [0, 1] between a job posting and a profile"""
+    user_skills = [skill for user_job in user_jobs for skill in user_job['skills']]
+    return {
+        'title': max([similarities['title'](job['title'], user_job['title']) for user_job in user_jobs] or [0.0]),
+        'industry': max([similarities['industry'](job['industry'], industry) for industry in industry_prefs] or [0.0]),
+        'skills': best_similarity_mean(job['skills'], user_skills, similarities['skills'])
+    }
@@ -0,0 +1,130 @@
+"""
+Compiled multi-keyword matcher over tokenized text.
+
+Keywords are tokenized once and stored in a token trie, so a document is
+scanned in a single left-to-right pass: at each token we follow the trie as
+far as it goes and keep the longest keyword that ends there. Matching on
+tokens rather than characters gives word boundaries for free ("IT" does not
+match inside "with"). Short all-caps keywords such as "IT", "AI" or ".NET"
+only match when the text uses the same casing, so "net income" is not .NET.
+
+Keywords that are also everyday words ("React", "Excel", "Shipping") can be
+added as ambiguous, with a group of related keywords. They only count when the text spells them the
+way the keyword does somewhere other than the start of a sentence ("built
+in React"), or when an unambiguous keyword of the same group is matched
+nearby ("React, Redux and Node.js"), so "react quickly" or "Excel in a
+team" are not skills.
+"""
+import bisect
+import re
+
+TOKEN_PATTERN = re.compile(r"[A-Za-z0-9][A-Za-z0-9+#']*(?:[./-][A-Za-z0-9+#]+)*[+#]*")
+
+# All-caps keywords up to this length are matched case-sensitively
+CASE_SENSITIVE_MAX_LENGTH = 4
+# How many tokens away an unambiguous keyword of the same group confirms a context keyword
+CONTEXT_WINDOW = 8
+# Punctuation that starts a new sentence or list item, where capitalization says nothing
+SENTENCE_BREAK = re.compile(r'[.!?:;\n\u2022*]')
+
+_END = object()
+
+
+def tokenize(text):
+    """Return [(token, lowercased token)] for a piece of text"""
+    return [(token, token.lower()) for token in TOKEN_PATTERN.findall(text or '')]
+
+
+def _sentence_starts(text):
+    """Set of token positions that open a sentence or list item"""
+    starts = set()
+    previous_end = 0
+    for position, match in enumerate(TOKEN_PATTERN.finditer(text or '')):
+        if position == 0 or SENTENCE_BREAK.search(text, previous_end, match.start()):
+            starts.add(position)
+        previous_end = match.end()
+    return starts
+
+
+class KeywordMatcher:
+    """Leftmost-longest, non-overlapping keyword matching with per-keyword payloads"""
+
+    def __init__(self, keywords=None):
+        self.root = {}
+        self.size = 0
+        for keyword, payload in (keywords or []):
+            self.add(keyword, payload)
+
+    def add(self, keyword, payload, group=None, ambiguous=False):
+        """
+        Add a keyword. group: optional name shared by related keywords;
+        ambiguous: the keyword is also an everyday word and only matches in
+        context (see the module docstring).
+        """
+        tokens = tokenize(keyword)
+        if not tokens:
+            return
+        case_sensitive = keyword.isupper() and len(keyword.replace(' ', '')) <= CASE_SENSITIVE_MAX_LENGTH
+        node = self.root
+        for _, lowered in tokens:
+            node = node.setdefault(lowered, {})
+        exact = tuple(token for token, _ in tokens) if case_sensitive else None
+        spelled = tuple(token for token, _ in tokens) if ambiguous else None
+        node.setdefault(_END, []).append((exact, payload, group, spelled))
+        self.size += 1
+
+    def __len__(self):
+        return self.size
+
+    def matches(self, text, require_context=True):
+        """
+        Yield (payload, start_token, end_token) for every keyword occurrence.
+        require_context=False also accepts ambiguous keywords without context,
+        for short phrases that are known to name a keyword.
+        """
+        tokens = tokenize(text)
+        found = []  # (start, end, payload, group, spelled); spelled is set for ambiguous keywords
+        position = 0
+        while position < len(tokens):
+            node = self.root
+            best = None
+            cursor = position
+            while cursor < len(tokens):
+                node = node.get(tokens[cursor][1])
+                if node is None:
+                    break
+                cursor += 1
+                for exact, payload, group, spelled in node.get(_END, ()):
+                    if exact is None or exact == tuple(token for token, _ in tokens[position:cursor]):
+                        best = (position, cursor, payload, group, spelled)
+                        break
+            if best is None:
+                position += 1
+                continue
+            found.append(best)
+            position = best[1]
+
+        if require_context and any(spelled is not None for *_, spelled in found):
+            sentence_starts = _sentence_starts(text)
+            starts = [match[0] for match in found]
+            found = [match for match in found
+                     if match[4] is None or self._in_context(tokens, found, starts, sentence_starts, match)]
+        for start, end, payload, _, _ in found:
+            yield payload, start, end
+
+    @staticmethod
+    def _in_context(tokens, found, starts, sentence_starts, match):
+        start, end, _, group, spelled = match
+        # Written the way the keyword is, where capitalization means something
+        if start not in sentence_starts and tuple(token for token, _ in tokens[start:end]) == spelled:
+            return True
+        # Or near an unambiguous keyword of the same group
+        low = bisect.bisect_left(starts, start - CONTEXT_WINDOW)
+        high = bisect.bisect_right(starts, end + CONTEXT_WINDOW)
+        return group is not None and any(
+            other[4] is None and other[3] == group for other in found[low:high]
+        )
+
+    def find_all(self, text, require_context=True):
+        """Set of payloads found in text"""
+        return {payload for payload, _, _ in self.matches(text, require_context)}
@@ -0,0 +1,213 @@
+"""
+Location canonicalization backed by a bundled US gazetteer.
+
+Maps free-form input such as "San Jose, CA", "san jose,ca" or
+"San Jose, California, USA" to one stable location id and the display string
+SerpApi expects ("San Jose, California, United States"), so every spelling
+of a place shares caches and upstream queries.
+"""
+import csv
+import os
+import re
+import string
+from collections import namedtuple
+from functools import lru_cache
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+CanonicalLocation = namedtuple(
+    'CanonicalLocation',
+    ['id', 'display', 'short', 'city', 'state', 'country', 'lat', 'lng']
+)
+
+COUNTRY_ALIASES = {
+    'us', 'usa', 'u s', 'u s a', 'united states', 'united states of america', 'america'
+}
+
+# Common nicknames that don't follow the "City, State" pattern
+CITY_ALIASES = {
+    'nyc': ('new york', 'NY'),
+    'new york city': ('new york', 'NY'),
+    'sf': ('san francisco', 'CA'),
+    'san fran': ('san francisco', 'CA'),
+    'philly': ('philadelphia', 'PA'),
+    'vegas': ('las vegas', 'NV'),
+    'dc': ('washington', 'DC'),
+    'd c': ('washington', 'DC'),
+    'washington dc': ('washington', 'DC'),
+    'nola': ('new orleans', 'LA'),
+    'slc': ('salt lake city', 'UT'),
+    'okc': ('oklahoma city', 'OK'),
+}
+
+UNITED_STATES = CanonicalLocation('us', 'United States', 'United States', None, None, 'US', None, None)
+
+_states_by_code = {}
+_states_by_key = {}
+_cities_by_key = {}
+_cities_by_name = {}
+
+
+def name_key(text):
+    """Normalize a place name for lookups: case, punctuation and saint/fort/mount spellings"""
+    text = str(text).lower().replace('.', ' ').replace("'", '').replace('-', ' ')
+    words = text.split()
+    replacements = {'saint': 'st', 'fort': 'ft', 'mount': 'mt'}
+    return ' '.join(replacements.get(word, word) for word in words)
+
+
+def slugify(text):
+    return re.sub(r'[^a-z0-9]+', '-', name_key(text)).strip('-')
+
+
+def _load_gazetteer():
+    if _states_by_code:
+        return
+
+    with open(os.path.join(DATA_DIR, 'us_states.csv'), newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            _states_by_code[row['code']] = row['name']
+            _states_by_key[name_key(row['name'])] = row['code']
+
+    with open(os.path.join(DATA_DIR, 'us_cities.csv'), newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            city = {
+                'city': row['city'],
+                'state': row['state'],
+                'lat': float(row['lat']),
+                'lng': float(row['lng']),
+                'population': int(row['population'])
+            }
+            key = name_key(row['city'])
+            _cities_by_key[(key, row['state'])] = city
+            _cities_by_name.setdefault(key, []).append(city)
+
+    for cities in _cities_by_name.values():
+        cities.sort(key=lambda c: c['population'], reverse=True)
+
+
+def get_cities():
+    """All gazetteer cities as dicts with city, state, lat, lng and population"""
+    _load_gazetteer()
+    return list(_cities_by_key.values())
+
+
+def _lookup_state(text):
+    key = name_key(text)
+    if key.upper() in _states_by_code:
+        return key.upper()
+    return _states_by_key.get(key)
+
+
+def _city_location(city):
+    state = _states_by_code[city['state']]
+    return CanonicalLocation(
+        id=f"us-{city['state'].lower()}-{slugify(city['city'])}",
+        display=f"{city['city']}, {state}, United States",
+        short=f"{city['city']}, {city['state']}",
+        city=city['city'],
+        state=city['state'],
+        country='US',
+        lat=city['lat'],
+        lng=city['lng']
+    )
+
+
+def _state_location(code):
+    state = _states_by_code[code]
+    return CanonicalLocation(f"us-{code.lower()}", f"{state}, United States", state, None, code, 'US', None, None)
+
+
+def _tidy(text):
+    """Keep the user's capitalisation if they used any, otherwise capitalise words"""
+    text = ' '.join(text.split())
+    return text if text != text.lower() else string.capwords(text)
+
+
+def _find_city(key, state=None):
+    if key in CITY_ALIASES:
+        alias_key, alias_state = CITY_ALIASES[key]
+        if state in (None, alias_state):
+            return _cities_by_key.get((alias_key, alias_state))
+    if state:
+        return _cities_by_key.get((key, state))
+    matches = _cities_by_name.get(key)
+    return matches[0] if matches else None
+
+
+@lru_cache(maxsize=4096)
+def _canonicalize(text):
+    _load_gazetteer()
+
+    # A zip next to a city or state doesn't change the place we search in; a bare zip is the place
+    zip_match = re.search(r'\b\d{5}(?:-\d{4})?\b', text)
+    text = re.sub(r'\b\d{5}(?:-\d{4})?\b', '', text)
+    parts = [part.strip() for part in text.split(',') if part.strip()]
+
+    # Drop trailing "USA" / "United States"
+    while parts and name_key(parts[-1]) in COUNTRY_ALIASES:
+        parts.pop()
+    if not parts:
+        if zip_match:
+            code = zip_match.group(0)
+            return CanonicalLocation(f"us-zip-{code[:5]}", code, code, None, None, 'US', None, None)
+        return UNITED_STATES
+
+    # "Toronto, ON, Canada": a trailing country comes off before the region is read
+    country = None
+    if len(parts) >= 3 and not _lookup_state(parts[-1]):
+        country = _tidy(parts.pop())
+
+    if len(parts) == 1:
+        key = name_key(parts[0])
+        if key in CITY_ALIASES:
+            return _city_location(_find_city(key))
+        state = _lookup_state(parts[0])
+        if state:
+            return _state_location(state)
+        city = _find_city(key)
+        if city:
+            return _city_location(city)
+
+        # "San Jose CA" / "San Jose California" without a comma
+        words = parts[0].split()
+        for split in (1, 2):
+            if len(words) > split:
+                state = _lookup_state(' '.join(words[-split:]))
+                city = _find_city(name_key(' '.join(words[:-split])), state) if state else None
+                if city:
+                    return _city_location(city)
+
+        return CanonicalLocation(f"raw-{slugify(parts[0])}", _tidy(parts[0]), _tidy(parts[0]),
+                                 None, None, None, None, None)
+
+    # "123 Main St, San Jose, CA": the city and region are the last two parts, anything before is street
+    city_text, region = parts[-2], parts[-1]
+    state = _lookup_state(region)
+    if state:
+        city = _find_city(name_key(city_text), state)
+        if city:
+            return _city_location(city)
+        # Unknown city in a known state still gets a stable id
+        city_name = _tidy(city_text)
+        return CanonicalLocation(
+            f"us-{state.lower()}-{slugify(city_text)}",
+            f"{city_name}, {_states_by_code[state]}, United States",
+            f"{city_name}, {state}",
+            city_name, state, 'US', None, None
+        )
+
+    # Non-US locations: SerpApi does best with just the city name
+    city_name = _tidy(city_text)
+    if country:
+        return CanonicalLocation(f"intl-{slugify(country)}-{slugify(region)}-{slugify(city_text)}",
+                                 city_name, city_name, city_name, None, country, None, None)
+    return CanonicalLocation(f"intl-{slugify(region)}-{slugify(city_text)}", city_name, city_name,
+                             city_name, None, _tidy(region), None, None)
+
+
+def canonicalize_location(location):
+    """Map free-form location text to a CanonicalLocation"""
+    if not location or not str(location).strip():
+        return UNITED_STATES
+    return _canonicalize(' '.join(str(location).split()))
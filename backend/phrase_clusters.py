@@ -0,0 +1,70 @@
+"""
+Near-duplicate collapsing for short phrases (job titles, skills).
+
+Exact-string dedup keeps "IT Support Specialist" next to "IT Specialist" and
+"Teamwork" next to "Team Work", and each survivor costs its own LLM call
+downstream. Phrases are clustered greedily: one that shares a canonical id
+with an earlier representative, or whose embedding is within the cosine
+threshold of one, joins that cluster; otherwise it starts a new one. Two
+phrases with different canonical ids are never merged, however close their
+embeddings.
+"""
+import os
+
+import numpy as np
+
+DEDUP_SIMILARITY_THRESHOLD = float(os.getenv('DEDUP_SIMILARITY_THRESHOLD', '0.9'))
+
+
+def cluster_phrases(phrases, vector_fn, threshold=DEDUP_SIMILARITY_THRESHOLD, key_fn=None):
+    """
+    Group phrases into clusters of near-duplicates, keeping input order.
+    vector_fn maps a phrase to its embedding; key_fn optionally maps it to a
+    canonical id (or None). Returns a list of clusters, each a list of phrases
+    whose first element is the representative.
+    """
+    clusters = []
+    keys = []
+    vectors = []
+    by_text = {}
+    for phrase in phrases:
+        text = ' '.join(str(phrase or '').split())
+        if not text:
+            continue
+        lowered = text.lower()
+        if lowered in by_text:
+            clusters[by_text[lowered]].append(text)
+            continue
+
+        key = key_fn(text) if key_fn is not None else None
+        vector = np.asarray(vector_fn(text), dtype=np.float64)
+        norm = np.linalg.norm(vector)
+        vector = vector / norm if norm else vector
+
+        match = None
+        if key is not None and key in keys:
+            match = keys.index(key)
+        elif vectors:
+            similarities = np.asarray(vectors) @ vector
+            # Representatives with a different canonical id are never candidates
+            if key is not None:
+                similarities[[other is not None and other != key for other in keys]] = -1.0
+            best = int(np.argmax(similarities))
+            if similarities[best] >= threshold:
+                match = best
+
+        if match is None:
+            match = len(clusters)
+            clusters.append([])
+            keys.append(key)
+            vectors.append(vector)
+        elif keys[match] is None:
+            keys[match] = key
+        clusters[match].append(text)
+        by_text[lowered] = match
+    return clusters
+
+
+def dedup_phrases(phrases, vector_fn, threshold=DEDUP_SIMILARITY_THRESHOLD, key_fn=None):
+    """One representative per near-duplicate cluster, in input order"""
+    return [cluster[0] for cluster in cluster_phrases(phrases, vector_fn, threshold, key_fn)]
@@ -0,0 +1,182 @@
+"""
+Local corpus of job postings captured from SerpApi google_jobs responses.
+
+Every jobs_results posting we pay for is stored once (deduplicated by
+posting id) with its title, company, location, description, salary text,
+extracted skills, industry and fetch time, so later skill, salary and title
+questions can be answered from accumulated data instead of new API calls.
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from cache_store import CACHE_DIR
+
+POSTINGS_DB_PATH = os.getenv('POSTINGS_DB_PATH', os.path.join(CACHE_DIR, 'postings.sqlite3'))
+
+POSTING_COLUMNS = [
+    'posting_id', 'title', 'title_key', 'company', 'location', 'location_id',
+    'description', 'salary_text', 'schedule_type', 'query', 'fetched_at', 'skills', 'industry'
+]
+
+# Row layout used by ingest(), as passed to listeners
+INGEST_COLUMNS = POSTING_COLUMNS[:-2] + ['raw', 'skills', 'industry']
+
+
+def posting_id(job):
+    """SerpApi's job_id, or a stable hash of title/company/location when it's missing"""
+    if job.get('job_id'):
+        return str(job['job_id'])
+    raw = '|'.join(str(job.get(field, '')).strip().lower() for field in ('title', 'company_name', 'location'))
+    return 'h:' + hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def salary_text(job):
+    """Salary text from either the legacy 'salary' field or detected_extensions"""
+    salary = job.get('salary')
+    if isinstance(salary, dict) and salary.get('text'):
+        return salary['text']
+    if isinstance(salary, str) and salary:
+        return salary
+    return (job.get('detected_extensions') or {}).get('salary')
+
+
+def title_key(title):
+    return ' '.join(str(title or '').lower().split())
+
+
+def title_core(title):
+    """Posting title without suffixes after ' - ', '(', ',' or '|' ("Nurse (Nights) - Acme" -> "Nurse")"""
+    title = re.split(r'\s+-\s+|\(|,|\||\s/\s', str(title or ''))[0]
+    return ' '.join(title.split())
+
+
+class PostingsStore:
+    """SQLite-backed posting corpus with dedup by posting id"""
+
+    def __init__(self, db_path=POSTINGS_DB_PATH, extract_skills=None, classify_industry=None):
+        # extract_skills: optional batch callable, list of descriptions -> list of skill sets
+        # classify_industry: optional callable, job dict -> industry name or None
+        self.extract_skills = extract_skills
+        self.classify_industry = classify_industry
+        self.listeners = []
+        self.lock = threading.Lock()
+        if db_path != ':memory:':
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(
+            "CREATE TABLE IF NOT EXISTS postings ("
+            "posting_id TEXT PRIMARY KEY, title TEXT, title_key TEXT, company TEXT, "
+            "location TEXT, location_id TEXT, description TEXT, salary_text TEXT, "
+            "schedule_type TEXT, query TEXT, fetched_at REAL, raw TEXT, skills TEXT, industry TEXT);"
+            "CREATE INDEX IF NOT EXISTS idx_postings_title ON postings (title_key);"
+            "CREATE INDEX IF NOT EXISTS idx_postings_location ON postings (location_id);"
+        )
+        self.conn.commit()
+
+    def ingest(self, jobs_results, query=None, location_id=None):
+        """Store new postings from a jobs_results list; returns how many were new"""
+        now = time.time()
+        jobs = [job for job in jobs_results or [] if isinstance(job, dict) and job.get('title')]
+        skills = [None] * len(jobs)
+        if self.extract_skills and jobs:
+            skills = [sorted(found) for found in self.extract_skills([job.get('description') or '' for job in jobs])]
+
+        rows = []
+        for job, job_skills in zip(jobs, skills):
+            rows.append((
+                posting_id(job),
+                job.get('title'),
+                title_key(job.get('title')),
+                job.get('company_name'),
+                job.get('location'),
+                location_id,
+                job.get('description'),
+                salary_text(job),
+                (job.get('detected_extensions') or {}).get('schedule_type'),
+                query,
+                now,
+                json.dumps(job),
+                None if job_skills is None else json.dumps(job_skills),
+                self.classify_industry(job) if self.classify_industry else None
+            ))
+        if not rows:
+            return 0
+
+        new_postings = []
+        with self.lock:
+            for row in rows:
+                cursor = self.conn.execute(
+                    "INSERT OR IGNORE INTO postings (posting_id, title, title_key, company, location, "
+                    "location_id, description, salary_text, schedule_type, query, fetched_at, raw, skills, industry) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    row
+                )
+                if cursor.rowcount == 1:
+                    posting = dict(zip(INGEST_COLUMNS, row))
+                    posting['skills'] = json.loads(posting['skills']) if posting['skills'] else None
+                    new_postings.append(posting)
+            self.conn.commit()
+
+        for listener in self.listeners:
+            try:
+                listener(new_postings)
+            except Exception as e:
+                print(f"Error in postings listener: {str(e)}")
+        return len(new_postings)
+
+    def add_listener(self, listener):
+        """Call listener(new_postings) after each ingest with the postings that were new"""
+        self.listeners.append(listener)
+
+    def facets(self):
+        """Yield (title, skills, industry) for every stored posting"""
+        with self.lock:
+            rows = self.conn.execute("SELECT title, skills, industry FROM postings").fetchall()
+        for row in rows:
+            yield row['title'], json.loads(row['skills']) if row['skills'] else [], row['industry']
+
+    def find(self, title=None, location_id=None, since=None, with_salary=False, limit=None, columns=None):
+        """Return matching postings as dicts, newest first; columns limits what is read (default all)"""
+        columns = list(columns or POSTING_COLUMNS)
+        unknown = set(columns) - set(POSTING_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown posting columns: {', '.join(sorted(unknown))}")
+        clauses, params = [], []
+        if title:
+            # Escape LIKE wildcards so user text matches literally
+            pattern = title_key(title).replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            clauses.append("title_key LIKE ? ESCAPE '\\'")
+            params.append(f"%{pattern}%")
+        if location_id:
+            clauses.append("location_id = ?")
+            params.append(location_id)
+        if since:
+            clauses.append("fetched_at >= ?")
+            params.append(since)
+        if with_salary:
+            clauses.append("salary_text IS NOT NULL AND salary_text != ''")
+
+        sql = f"SELECT {', '.join(columns)} FROM postings"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY fetched_at DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+
+        with self.lock:
+            rows = [dict(row) for row in self.conn.execute(sql, params).fetchall()]
+        if 'skills' in columns:
+            for row in rows:
+                row['skills'] = json.loads(row['skills']) if row['skills'] else None
+        return rows
+
+    def count(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0]
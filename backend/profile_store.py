@@ -0,0 +1,223 @@
+"""
+Server-side store of worker/employer profiles and job documents.
+
+Clients save a document once and then refer to it by id and version, so
+match endpoints no longer receive (and re-parse) the full selectedJobs,
+skills and overview payload on every call. Derived data (canonical ids,
+flattened skills, overview embedding) is computed when a document is
+written and stored next to it. Derived data written by an older
+derivation is recomputed on first read.
+
+Decoded entries are kept in memory, but every read checks the stored
+version in SQLite first, so a write from another process is never served
+stale. Callers get copies and can't change the cached entry.
+"""
+import copy
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from cache_store import CACHE_DIR
+
+PROFILES_DB_PATH = os.getenv('PROFILES_DB_PATH', os.path.join(CACHE_DIR, 'profiles.sqlite3'))
+
+DOCUMENT_KINDS = ('profile', 'job')
+
+
+class VersionConflict(Exception):
+    """The requested or submitted version doesn't match the stored one"""
+
+    def __init__(self, message, stored_version):
+        super().__init__(message)
+        self.stored_version = stored_version
+
+
+class InvalidVersion(ValueError):
+    """A version that isn't a positive integer"""
+
+
+def parse_version(version):
+    """Positive int from an int or a digit string; None passes through"""
+    if version is None:
+        return None
+    if isinstance(version, bool) or not isinstance(version, (int, str)):
+        raise InvalidVersion(f"version must be a positive integer, not {version!r}")
+    if isinstance(version, str) and not version.strip().isdigit():
+        raise InvalidVersion(f"version must be a positive integer, not {version!r}")
+    if int(version) < 1:
+        raise InvalidVersion(f"version must be a positive integer, not {version!r}")
+    return int(version)
+
+
+class ProfileStore:
+    """SQLite-backed versioned documents with derived data computed at write time"""
+
+    def __init__(self, db_path=PROFILES_DB_PATH, derive=None, derive_version=1):
+        # derive: optional callable (kind, document) -> JSON-serialisable dict
+        # derive_version: bump when derive changes so stored derived data is recomputed
+        self.derive = derive
+        self.derive_version = derive_version
+        self.memory = {}  # (kind, doc_id) -> entry
+        self.listeners = []
+        self.lock = threading.Lock()
+        if db_path != ':memory:':
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            "kind TEXT NOT NULL, doc_id TEXT NOT NULL, version INTEGER NOT NULL, "
+            "document TEXT NOT NULL, derived TEXT, derive_version INTEGER, updated_at REAL NOT NULL, "
+            "PRIMARY KEY (kind, doc_id))"
+        )
+        self.conn.commit()
+
+    def _derive(self, kind, document):
+        return self.derive(kind, document) if self.derive else {}
+
+    def put(self, kind, doc_id, document, version=None):
+        """
+        Store a document and its derived data; returns the new version.
+        A submitted version must be newer than the stored one; without one
+        the stored version is incremented.
+        """
+        doc_id = str(doc_id)
+        version = parse_version(version)
+        derived = self._derive(kind, document)
+        with self.lock:
+            current = self._load(kind, doc_id)
+            stored_version = current['version'] if current else 0
+            if version is None:
+                version = stored_version + 1
+            elif version <= stored_version:
+                raise VersionConflict(
+                    f"{kind} {doc_id} is at version {stored_version}; version {version} is not newer",
+                    stored_version
+                )
+            entry = {
+                'id': doc_id,
+                'kind': kind,
+                'version': version,
+                'document': document,
+                'derived': derived,
+                'deriveVersion': self.derive_version,
+                'updatedAt': time.time()
+            }
+            self.conn.execute(
+                "INSERT OR REPLACE INTO documents "
+                "(kind, doc_id, version, document, derived, derive_version, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (kind, doc_id, entry['version'], json.dumps(document), json.dumps(derived),
+                 self.derive_version, entry['updatedAt'])
+            )
+            self.conn.commit()
+            self.memory[(kind, doc_id)] = copy.deepcopy(entry)
+        self._notify(kind, doc_id, entry)
+        return entry['version']
+
+    def get(self, kind, doc_id, version=None):
+        """
+        Copy of the entry dict {'id', 'kind', 'version', 'document', 'derived', ...} or None.
+        Raises VersionConflict when a version is given and the stored one differs,
+        and InvalidVersion when the given version isn't a positive integer.
+        """
+        doc_id = str(doc_id)
+        version = parse_version(version)
+        with self.lock:
+            entry = self._load(kind, doc_id)
+            entry = copy.deepcopy(entry) if entry is not None else None
+        if entry is None:
+            return None
+        if version is not None and version != entry['version']:
+            raise VersionConflict(f"{kind} {doc_id} is at version {entry['version']}, not {version}", entry['version'])
+        if entry['deriveVersion'] != self.derive_version:
+            self.rederive(entry)
+        return entry
+
+    def rederive(self, entry):
+        """Recompute and store an entry's derived data with the current derivation"""
+        derived = self._derive(entry['kind'], entry['document'])
+        with self.lock:
+            entry['derived'] = derived
+            entry['deriveVersion'] = self.derive_version
+            entry['updatedAt'] = time.time()
+            cursor = self.conn.execute(
+                "UPDATE documents SET derived = ?, derive_version = ?, updated_at = ? "
+                "WHERE kind = ? AND doc_id = ? AND version = ?",
+                (json.dumps(derived), self.derive_version, entry['updatedAt'],
+                 entry['kind'], entry['id'], entry['version'])
+            )
+            self.conn.commit()
+            if cursor.rowcount:
+                self.memory[(entry['kind'], entry['id'])] = copy.deepcopy(entry)
+            else:
+                # A newer version was written meanwhile; don't cache this one over it
+                self.memory.pop((entry['kind'], entry['id']), None)
+        self._notify(entry['kind'], entry['id'], entry)
+
+    def delete(self, kind, doc_id):
+        doc_id = str(doc_id)
+        with self.lock:
+            self.memory.pop((kind, doc_id), None)
+            self.conn.execute("DELETE FROM documents WHERE kind = ? AND doc_id = ?", (kind, doc_id))
+            self.conn.commit()
+        self._notify(kind, doc_id, None)
+
+    def add_listener(self, listener):
+        """Call listener(kind, doc_id, entry) after every write; entry is None for deletes"""
+        self.listeners.append(listener)
+
+    def _notify(self, kind, doc_id, entry):
+        for listener in self.listeners:
+            try:
+                listener(kind, doc_id, entry)
+            except Exception as e:
+                print(f"Error in document listener: {str(e)}")
+
+    def _load(self, kind, doc_id):
+        """Cached entry, reused only while SQLite still holds the same write of it"""
+        key = (kind, doc_id)
+        cached = self.memory.get(key)
+        if cached is not None:
+            stamp = self.conn.execute(
+                "SELECT version, derive_version, updated_at FROM documents WHERE kind = ? AND doc_id = ?",
+                (kind, doc_id)
+            ).fetchone()
+            if stamp == (cached['version'], cached['deriveVersion'], cached['updatedAt']):
+                return cached
+            self.memory.pop(key, None)
+            if not stamp:
+                return None
+        row = self.conn.execute(
+            "SELECT version, document, derived, derive_version, updated_at FROM documents "
+            "WHERE kind = ? AND doc_id = ?",
+            (kind, doc_id)
+        ).fetchone()
+        if not row:
+            return None
+        entry = {
+            'id': doc_id,
+            'kind': kind,
+            'version': row[0],
+            'document': json.loads(row[1]),
+            'derived': json.loads(row[2]) if row[2] else {},
+            'deriveVersion': row[3],
+            'updatedAt': row[4]
+        }
+        self.memory[key] = entry
+        return entry
+
+    def entries(self, kind):
+        """Every stored entry of a kind"""
+        with self.lock:
+            ids = [row[0] for row in self.conn.execute("SELECT doc_id FROM documents WHERE kind = ?", (kind,))]
+        return [entry for entry in (self.get(kind, doc_id) for doc_id in ids) if entry is not None]
+
+    def get_stats(self):
+        with self.lock:
+            counts = dict(self.conn.execute("SELECT kind, COUNT(*) FROM documents GROUP BY kind").fetchall())
+            return {
+                'documents': {kind: counts.get(kind, 0) for kind in DOCUMENT_KINDS},
+                'memoryEntries': len(self.memory),
+                'deriveVersion': self.derive_version
+            }
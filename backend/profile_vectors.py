@@ -0,0 +1,81 @@
+"""
+Per-field embeddings of profiles and jobs, computed once when a document is saved.
+
+A document's selected jobs (or a job posting's own title, industry and
+required skills) are embedded field by field, along with the overview
+text, and summarised into one unit-length centroid per field. Stored as
+plain lists, these make overview scoring and candidate search a few dot
+products instead of spaCy runs over whole overview documents. Title,
+industry and skill pairs are scored from the phrases the cascade
+scorers store instead (cascade_scorer, job_scoring).
+"""
+import numpy as np
+
+VECTOR_FIELDS = ('title', 'industry', 'skills', 'overview')
+# Stored vectors are rounded to keep documents small; cosine error stays below 1e-5
+VECTOR_PRECISION = 6
+
+
+def unit(vector):
+    """Unit-length float array, or None for a missing or all-zero vector"""
+    if vector is None:
+        return None
+    vector = np.asarray(vector, dtype=np.float64)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else None
+
+
+def to_list(vector):
+    return None if vector is None else [round(float(value), VECTOR_PRECISION) for value in vector]
+
+
+def centroid(vectors):
+    """Unit-length mean of the unit vectors, or None when there are none"""
+    units = [v for v in (unit(vector) for vector in vectors) if v is not None]
+    if not units:
+        return None
+    return unit(np.mean(units, axis=0))
+
+
+def embed_fields(jobs, overview, embed):
+    """
+    Vectors for a document.
+    jobs: [{'title', 'industry', 'skills': [names]}]; overview: text; embed: text -> vector.
+    Returns {'jobs': [{'title', 'industry', 'skills'}], 'overview', 'centroids'}
+    with every vector unit length (or None) and stored as a list.
+    """
+    embedded_jobs = []
+    for job in jobs:
+        embedded_jobs.append({
+            'title': unit(embed(job['title'])) if job.get('title') else None,
+            'industry': unit(embed(job['industry'])) if job.get('industry') else None,
+            'skills': [unit(embed(skill)) for skill in job.get('skills', []) if skill]
+        })
+    overview_vector = unit(embed(overview)) if overview else None
+
+    centroids = {
+        'title': centroid([job['title'] for job in embedded_jobs]),
+        'industry': centroid([job['industry'] for job in embedded_jobs]),
+        'skills': centroid([skill for job in embedded_jobs for skill in job['skills']]),
+        'overview': overview_vector
+    }
+    return {
+        'jobs': [
+            {
+                'title': to_list(job['title']),
+                'industry': to_list(job['industry']),
+                'skills': [to_list(skill) for skill in job['skills']]
+            }
+            for job in embedded_jobs
+        ],
+        'overview': to_list(overview_vector),
+        'centroids': {field: to_list(vector) for field, vector in centroids.items()}
+    }
+
+
+def cosine(vector1, vector2):
+    """Dot product of two stored unit vectors; 0 when either is missing"""
+    if vector1 is None or vector2 is None:
+        return 0.0
+    return float(np.dot(vector1, vector2))
+
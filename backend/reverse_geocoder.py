@@ -0,0 +1,153 @@
+"""
+Offline reverse geocoding against the bundled city gazetteer.
+
+Cities are indexed in a KD-tree over unit-sphere (x, y, z) coordinates, where
+straight-line distance orders points the same way great-circle distance
+does. Each city gets an approximate footprint radius from its population, so
+a point in Manhattan resolves to New York rather than the closer centroid of
+Hoboken. Lookups take microseconds; a point is only answered when it falls
+inside a city's footprint (plus a small slack for footprint error), and
+callers fall back to an upstream geocoder otherwise, so a neighbouring
+city missing from the gazetteer isn't reported as the big city next door.
+"""
+import math
+import os
+
+from locations import get_cities
+
+EARTH_RADIUS_KM = 6371.0
+# How far outside a city's estimated footprint a point may fall and still resolve to it
+REVERSE_GEOCODE_SLACK_KM = float(os.getenv('REVERSE_GEOCODE_SLACK_KM', '1'))
+
+# Footprint radius assumes a typical urban density (people per km2), capped for sprawling metros
+CITY_DENSITY_PER_KM2 = 4000
+MAX_CITY_RADIUS_KM = 15.0
+
+
+def _to_xyz(lat, lng):
+    lat, lng = math.radians(lat), math.radians(lng)
+    return (
+        math.cos(lat) * math.cos(lng),
+        math.cos(lat) * math.sin(lng),
+        math.sin(lat)
+    )
+
+
+def _chord_to_km(chord):
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2))
+
+
+def _km_to_chord(km):
+    return 2 * math.sin(min(math.pi / 2, km / (2 * EARTH_RADIUS_KM)))
+
+
+def city_radius_km(city):
+    """Rough radius of the area a city covers, from its population"""
+    area = city.get('population', 0) / CITY_DENSITY_PER_KM2
+    return min(MAX_CITY_RADIUS_KM, math.sqrt(area / math.pi))
+
+
+class KDTree:
+    """Static 3-d tree supporting nearest-neighbour queries"""
+
+    def __init__(self, points):
+        # points: list of (xyz, payload)
+        self.root = self._build(list(points), 0)
+
+    def _build(self, points, depth):
+        if not points:
+            return None
+        axis = depth % 3
+        points.sort(key=lambda p: p[0][axis])
+        middle = len(points) // 2
+        return (
+            points[middle],
+            axis,
+            self._build(points[:middle], depth + 1),
+            self._build(points[middle + 1:], depth + 1)
+        )
+
+    def nearest(self, target):
+        """Return (payload, squared chord distance) of the closest point"""
+        best = [None, float('inf')]
+
+        def search(node):
+            if node is None:
+                return
+            (xyz, payload), axis, left, right = node
+            dist = sum((a - b) ** 2 for a, b in zip(xyz, target))
+            if dist < best[1]:
+                best[0], best[1] = payload, dist
+            diff = target[axis] - xyz[axis]
+            near, far = (left, right) if diff < 0 else (right, left)
+            search(near)
+            if diff * diff < best[1]:
+                search(far)
+
+        search(self.root)
+        return best[0], best[1]
+
+    def within(self, target, radius):
+        """Return [(payload, squared chord distance)] for points within a chord radius"""
+        found = []
+        limit = radius * radius
+
+        def search(node):
+            if node is None:
+                return
+            (xyz, payload), axis, left, right = node
+            dist = sum((a - b) ** 2 for a, b in zip(xyz, target))
+            if dist <= limit:
+                found.append((payload, dist))
+            diff = target[axis] - xyz[axis]
+            if diff < 0 or diff * diff <= limit:
+                search(left)
+            if diff >= 0 or diff * diff <= limit:
+                search(right)
+
+        search(self.root)
+        return found
+
+
+class ReverseGeocoder:
+    """Nearest gazetteer city for a coordinate"""
+
+    def __init__(self, cities=None):
+        self.cities = cities
+        self.tree = None
+
+    def _ensure_index(self):
+        if self.tree is None:
+            cities = self.cities if self.cities is not None else get_cities()
+            self.tree = KDTree((_to_xyz(c['lat'], c['lng']), c) for c in cities)
+
+    def lookup(self, lat, lng, slack_km=REVERSE_GEOCODE_SLACK_KM):
+        """Return {'city', 'state', 'distanceKm'} or None unless the point is inside a city footprint (+ slack_km)"""
+        self._ensure_index()
+        target = _to_xyz(float(lat), float(lng))
+        nearest, squared = self.tree.nearest(target)
+        if nearest is None:
+            return None
+
+        # A larger city slightly further away can still contain the point
+        search_km = _chord_to_km(math.sqrt(squared)) + MAX_CITY_RADIUS_KM
+        best = None
+        for city, dist in self.tree.within(target, _km_to_chord(search_km)):
+            distance_km = _chord_to_km(math.sqrt(dist))
+            radius_km = max(0.5, city_radius_km(city))
+            # Rank by distance relative to footprint so small cities aren't swallowed by big neighbours
+            score = distance_km / radius_km
+            if best is None or score < best[0]:
+                best = (score, distance_km, radius_km, city)
+
+        _, distance_km, radius_km, city = best
+        if distance_km > radius_km + slack_km:
+            return None
+        return {
+            'city': city['city'],
+            'state': city['state'],
+            'distanceKm': round(distance_km, 2)
+        }
+
+
+reverse_geocoder = ReverseGeocoder()
@@ -0,0 +1,174 @@
+"""
+Salary statistics over the local postings corpus.
+
+Salary text ("$18–$22 an hour", "$55K a year", "4,000 - 5,000 a month") is
+parsed and normalized to an hourly rate in one vectorized pandas pass, then
+summarised into p25/p50/p75 tables per title x location. /suggest-salary
+answers from those tables and only goes upstream when a cell is too sparse.
+"""
+import os
+import re
+import threading
+import time
+
+import pandas as pd
+
+from postings_store import title_core
+
+SALARY_MIN_SAMPLES = int(os.getenv('SALARY_MIN_SAMPLES', '5'))
+SALARY_TABLE_REFRESH_SECONDS = int(os.getenv('SALARY_TABLE_REFRESH_SECONDS', '300'))
+
+HOURS_PER_YEAR = 52 * 40
+
+# Hourly multipliers per pay period; order matters ("hour" must win over "year" in "hourly, $50K/year" typos)
+PERIOD_PATTERNS = [
+    ('hour', r'\b(?:hour|hourly|hr)\b', 1.0),
+    ('day', r'\b(?:day|daily)\b', 1 / 8),
+    ('week', r'\b(?:week|weekly|wk)\b', 1 / 40),
+    ('month', r'\b(?:month|monthly|mo)\b', 12 / HOURS_PER_YEAR),
+    ('year', r'\b(?:year|yearly|yr|annual|annually)\b', 1 / HOURS_PER_YEAR),
+]
+
+AMOUNT_PATTERN = r'(\d+(?:\.\d+)?)\s*(k?)\b'
+RANGE_PATTERN = re.compile(rf'{AMOUNT_PATTERN}(?:\s*(?:-|to)\s*\$?\s*{AMOUNT_PATTERN})?')
+
+# Hourly rates outside this band are parse errors, not salaries
+PLAUSIBLE_HOURLY = (5.0, 500.0)
+
+
+def default_title_key(title):
+    """Lowercased core of a posting title"""
+    return title_core(title).lower()
+
+
+def parse_salary_texts(texts):
+    """
+    Vectorized parse of salary strings into hourly min/max.
+    Returns a DataFrame with min_hourly, max_hourly and period columns,
+    NaN where the text has no recognisable amount or pay period.
+    """
+    text = pd.Series(texts, dtype='object').fillna('').astype(str).str.lower()
+    text = text.str.replace(',', '', regex=False).str.replace('$', '', regex=False)
+    text = text.str.replace(r'[–—]', '-', regex=True)
+
+    amounts = text.str.extract(RANGE_PATTERN)
+    low = pd.to_numeric(amounts[0], errors='coerce') * amounts[1].eq('k').map({True: 1000, False: 1})
+    high = pd.to_numeric(amounts[2], errors='coerce') * amounts[3].eq('k').map({True: 1000, False: 1})
+    high = high.fillna(low)
+
+    period = pd.Series(pd.NA, index=text.index, dtype='object')
+    factor = pd.Series(float('nan'), index=text.index)
+    for name, pattern, multiplier in PERIOD_PATTERNS:
+        matches = text.str.contains(pattern, regex=True) & period.isna()
+        period[matches] = name
+        factor[matches] = multiplier
+
+    result = pd.DataFrame({
+        'min_hourly': low * factor,
+        'max_hourly': high * factor,
+        'period': period
+    })
+
+    lo, hi = PLAUSIBLE_HOURLY
+    valid = result['min_hourly'].between(lo, hi) & result['max_hourly'].between(lo, hi)
+    result.loc[~valid, ['min_hourly', 'max_hourly']] = float('nan')
+    return result
+
+
+def build_salary_tables(postings, title_key_fn=default_title_key):
+    """Summarise postings into {(title_key, location_id): stats} percentile tables"""
+    frame = pd.DataFrame(postings, columns=['title', 'location_id', 'salary_text'])
+    if frame.empty:
+        return {}
+
+    parsed = parse_salary_texts(frame['salary_text'])
+    frame = pd.concat([frame, parsed], axis=1).dropna(subset=['min_hourly', 'max_hourly'])
+    if frame.empty:
+        return {}
+
+    frame['title_key'] = frame['title'].map(title_key_fn)
+    frame['location_id'] = frame['location_id'].fillna('us')
+    frame['mid_hourly'] = (frame['min_hourly'] + frame['max_hourly']) / 2
+
+    tables = {}
+    # Per title x location cells, plus a nationwide cell per title
+    national = frame.assign(location_id='*')
+    for (title, location_id), group in pd.concat([frame, national]).groupby(['title_key', 'location_id']):
+        mids = group['mid_hourly']
+        tables[(title, location_id)] = {
+            'count': int(len(group)),
+            'p25': round(float(mids.quantile(0.25)), 2),
+            'p50': round(float(mids.quantile(0.50)), 2),
+            'p75': round(float(mids.quantile(0.75)), 2),
+            'avgMin': round(float(group['min_hourly'].mean()), 2),
+            'avgMax': round(float(group['max_hourly'].mean()), 2),
+        }
+    return tables
+
+
+class SalaryStats:
+    """Precomputed salary percentile tables, rebuilt from the postings corpus when it grows"""
+
+    def __init__(self, postings_store, title_key_fn=default_title_key,
+                 refresh_seconds=SALARY_TABLE_REFRESH_SECONDS):
+        self.postings_store = postings_store
+        self.title_key_fn = title_key_fn
+        self.refresh_seconds = refresh_seconds
+        self.tables = {}
+        self.built_at = 0
+        self.built_count = -1
+        self.lock = threading.Lock()
+        # Held for the whole rebuild so concurrent callers never rebuild twice
+        self.refresh_lock = threading.Lock()
+
+    def refresh(self, force=False):
+        """
+        Rebuild tables if the corpus changed and they're older than refresh_seconds.
+        Returns at once when another rebuild is already running.
+        """
+        if not self.refresh_lock.acquire(blocking=False):
+            return
+        try:
+            now = time.time()
+            if not force and now - self.built_at < self.refresh_seconds:
+                return
+            count = self.postings_store.count()
+            if not force and count == self.built_count:
+                self.built_at = now
+                return
+
+            postings = self.postings_store.find(with_salary=True, columns=['title', 'location_id', 'salary_text'])
+            tables = build_salary_tables(postings, self.title_key_fn)
+            with self.lock:
+                self.tables = tables
+                self.built_at = now
+                self.built_count = count
+            print(f"Built salary tables: {len(tables)} cells from {len(postings)} postings")
+        finally:
+            self.refresh_lock.release()
+
+    def refresh_in_background(self):
+        """Start a rebuild on a daemon thread when the tables are due and none is running"""
+        if time.time() - self.built_at < self.refresh_seconds or self.refresh_lock.locked():
+            return
+        threading.Thread(target=self.refresh, daemon=True).start()
+
+    def lookup(self, title, location_id, min_samples=SALARY_MIN_SAMPLES):
+        """
+        Return (stats, scope) for the best cell with enough samples, or (None, None).
+        Stale tables keep answering while they are rebuilt in the background.
+        """
+        self.refresh_in_background()
+        key = self.title_key_fn(title)
+        with self.lock:
+            local = self.tables.get((key, location_id))
+            national = self.tables.get((key, '*'))
+        if local and local['count'] >= min_samples:
+            return local, 'local'
+        if national and national['count'] >= min_samples and location_id in (None, 'us'):
+            return national, 'national'
+        return None, None
+
+    def get_stats(self):
+        with self.lock:
+            return {'cells': len(self.tables), 'postings': max(self.built_count, 0)}
@@ -0,0 +1,216 @@
+"""
+Shared cache for SerpApi responses.
+
+Requests are keyed by a canonical form of (engine, q, location, chips) plus
+any other query parameters, with locations reduced to their gazetteer id, so
+trivially different spellings of the same search share one entry. Each
+engine has its own TTL; engines without a TTL are never cached. Entries past
+their TTL are still served for a grace period while a single background
+refresh per key brings them up to date.
+"""
+import copy
+import json
+import re
+import threading
+import time
+
+from cache_store import PersistentTTLCache
+from locations import canonicalize_location
+
+# Seconds a response stays fresh, per SerpApi engine
+SERP_CACHE_TTLS = {
+    'google_jobs': 60 * 60,
+    'google_maps_reverse_geocoding': 30 * 24 * 60 * 60,
+}
+
+# How long past its TTL a stale response may still be served while refreshing
+SERP_STALE_GRACE = 24 * 60 * 60
+
+# How long a failed fetch (exception or error response) is replayed instead of refetched
+SERP_FAILURE_TTL = 30
+
+# Most keys whose last failure and refresh time are remembered; the oldest are forgotten first
+SERP_TRACKED_KEYS = 5000
+
+# Parameters that never change the response
+IGNORED_PARAMS = {'api_key', 'output', 'source', 'no_cache', 'async'}
+
+# Coordinate parameters are rounded so nearby fixes share an entry (~110m)
+COORD_PARAMS = {'lat': 3, 'lng': 3}
+
+
+def _collapse(value):
+    return ' '.join(str(value).lower().split())
+
+
+def canonical_query(params):
+    """Build a stable cache key for a SerpApi request"""
+    canonical = {}
+    for key, value in params.items():
+        if key in IGNORED_PARAMS or value is None or value == '':
+            continue
+        if key in COORD_PARAMS:
+            try:
+                canonical[key] = f"{float(value):.{COORD_PARAMS[key]}f}"
+                continue
+            except (TypeError, ValueError):
+                pass
+        if key == 'chips':
+            chips = [_collapse(chip) for chip in str(value).split(',') if chip.strip()]
+            canonical[key] = ','.join(sorted(chips))
+        elif key == 'location':
+            canonical[key] = canonicalize_location(value).id
+        elif key == 'q':
+            canonical[key] = re.sub(r'\s+', ' ', str(value).lower()).strip()
+        else:
+            canonical[key] = _collapse(value)
+    return json.dumps(canonical, sort_keys=True)
+
+
+class _Flight:
+    """One in-progress fetch: waiters block on event, then read its result or error"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def _remember(table, key, value, limit):
+    """Set table[key] as its newest entry, dropping the oldest beyond limit"""
+    table.pop(key, None)
+    table[key] = value
+    while len(table) > limit:
+        table.pop(next(iter(table)))
+
+
+def _replay(result, error):
+    """A shared result as the caller's own copy, or its error raised"""
+    if error is not None:
+        raise error
+    return copy.deepcopy(result)
+
+
+class SerpCache:
+    """TTL cache with stale-while-revalidate and single-flight fetching"""
+
+    def __init__(self, ttls=SERP_CACHE_TTLS, stale_grace=SERP_STALE_GRACE, store=None,
+                 failure_ttl=SERP_FAILURE_TTL, max_tracked=SERP_TRACKED_KEYS):
+        self.ttls = ttls
+        self.stale_grace = stale_grace
+        self.failure_ttl = failure_ttl
+        self.max_tracked = max_tracked
+        self.store = store or PersistentTTLCache('serpapi')
+        self.lock = threading.Lock()
+        self.inflight = {}  # key -> _Flight for fetches in progress
+        self.failures = {}  # key -> (failed_at, result, error) of the last failed fetch
+        self.last_refresh = {}  # key -> time of the last refresh attempt
+        self.stats = {
+            'hits': 0, 'staleHits': 0, 'misses': 0, 'refreshes': 0, 'bypassed': 0, 'failureHits': 0
+        }
+
+    def get_or_fetch(self, params, fetch):
+        """Return the cached response for params, calling fetch() only when needed"""
+        engine = params.get('engine', '')
+        ttl = self.ttls.get(engine)
+        if not ttl:
+            self._count('bypassed')
+            return fetch()
+
+        key = canonical_query(params)
+        value, stored_at = self.store.get(key)
+        if value is not None:
+            age = time.time() - stored_at
+            if age < ttl:
+                self._count('hits')
+                return value
+            if age < ttl + self.stale_grace:
+                self._count('staleHits')
+                self._refresh_in_background(key, fetch, ttl)
+                return value
+
+        self._count('misses')
+        return self._fetch_once(key, fetch)
+
+    def _fetch_once(self, key, fetch):
+        """
+        Fetch a key, letting concurrent callers wait on the same request.
+        Waiters share the owner's result or exception, and a failure is
+        replayed for failure_ttl seconds rather than refetched by every caller.
+        """
+        with self.lock:
+            failure = self.failures.get(key)
+            if failure and time.time() - failure[0] < self.failure_ttl:
+                self.stats['failureHits'] += 1
+                return _replay(failure[1], failure[2])
+            if failure:
+                del self.failures[key]
+            flight = self.inflight.get(key)
+            owner = flight is None
+            if owner:
+                flight = _Flight()
+                self.inflight[key] = flight
+                _remember(self.last_refresh, key, time.time(), self.max_tracked)
+
+        if not owner:
+            flight.event.wait()
+            return _replay(flight.result, flight.error)
+
+        try:
+            flight.result = fetch()
+            self._store(key, flight.result)
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self.lock:
+                self.inflight.pop(key, None)
+                if flight.error is not None or not self._cacheable(flight.result):
+                    _remember(self.failures, key, (time.time(), flight.result, flight.error), self.max_tracked)
+                else:
+                    self.failures.pop(key, None)
+            flight.event.set()
+
+    def _refresh_in_background(self, key, fetch, ttl):
+        with self.lock:
+            if key in self.inflight:
+                return
+            # Only one refresh per key per TTL, even if refreshes keep failing
+            if time.time() - self.last_refresh.get(key, 0) < ttl:
+                return
+            _remember(self.last_refresh, key, time.time(), self.max_tracked)
+            flight = _Flight()
+            self.inflight[key] = flight
+            self.stats['refreshes'] += 1
+
+        def refresh():
+            try:
+                flight.result = fetch()
+                self._store(key, flight.result)
+            except Exception as e:
+                flight.error = e
+                print(f"Error refreshing SerpApi cache entry: {str(e)}")
+            finally:
+                with self.lock:
+                    self.inflight.pop(key, None)
+                flight.event.set()
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    @staticmethod
+    def _cacheable(result):
+        # Don't cache quota or parameter errors
+        return isinstance(result, dict) and 'error' not in result
+
+    def _store(self, key, result):
+        if self._cacheable(result):
+            self.store.set(key, result)
+
+    def _count(self, stat):
+        with self.lock:
+            self.stats[stat] += 1
+
+    def get_stats(self):
+        with self.lock:
+            return dict(self.stats)
@@ -0,0 +1,73 @@
+"""
+Lexicon-based skill extraction from job descriptions.
+
+The skill lexicon (data/skills.csv: canonical name, category, aliases,
+ambiguous) is compiled once into a KeywordMatcher, so each description is
+scanned in a single pass and every alias resolves to its canonical skill
+name. Names or aliases listed as ambiguous are everyday words ("React",
+"Excel", "Shipping") and only count in context: spelled as the skill
+mid-sentence, or next to another skill of the same category. Batch
+extraction is cheap enough to run on every posting at ingestion time.
+"""
+import csv
+import os
+from functools import lru_cache
+
+from keyword_matcher import KeywordMatcher
+from locations import DATA_DIR
+
+SKILLS_PATH = os.path.join(DATA_DIR, 'skills.csv')
+
+
+@lru_cache(maxsize=1)
+def get_skill_lexicon():
+    """Return [{'skill', 'category', 'aliases', 'ambiguous'}] from the bundled lexicon"""
+    with open(SKILLS_PATH, newline='', encoding='utf-8') as f:
+        return [
+            {
+                'skill': row['skill'],
+                'category': row['category'],
+                'aliases': [alias for alias in row['aliases'].split('|') if alias],
+                'ambiguous': [term for term in (row.get('ambiguous') or '').split('|') if term]
+            }
+            for row in csv.DictReader(f)
+        ]
+
+
+class SkillExtractor:
+    """Canonical skill names mentioned in free text"""
+
+    def __init__(self, lexicon=None):
+        self.matcher = KeywordMatcher()
+        self.categories = {}
+        for entry in (lexicon if lexicon is not None else get_skill_lexicon()):
+            self.add_skill(entry['skill'], entry.get('category'), entry.get('aliases'), entry.get('ambiguous'))
+
+    def add_skill(self, skill, category=None, aliases=None, ambiguous=None):
+        """
+        Teach the extractor a skill (and aliases) not in the bundled lexicon.
+        ambiguous: the name or aliases that only count in context.
+        """
+        ambiguous = set(ambiguous or [])
+        if skill not in self.categories:
+            self.categories[skill] = category
+            self.matcher.add(skill, skill, group=category, ambiguous=skill in ambiguous)
+        for alias in aliases or []:
+            self.matcher.add(alias, skill, group=category, ambiguous=alias in ambiguous)
+
+    def extract(self, text, require_context=True):
+        """
+        Set of canonical skills mentioned in text.
+        require_context=False accepts ambiguous terms anywhere, for short skill phrases.
+        """
+        return self.matcher.find_all(text, require_context)
+
+    def extract_many(self, texts):
+        """Extract skills from a batch of texts, returning one set per text"""
+        return [self.matcher.find_all(text) for text in texts]
+
+    def category(self, skill):
+        return self.categories.get(skill)
+
+
+skill_extractor = SkillExtractor()
@@ -0,0 +1,104 @@
+"""
+Deterministic trending-skill ranking over the postings corpus.
+
+Each posting contributes the set of skills mentioned in its description.
+Skills for a title/location are scored by TF-IDF: how many of the matching
+postings mention the skill, weighted by how rare the skill is across the
+whole corpus, so "Communication" doesn't drown out "Epic EHR" for nurses.
+Ties break alphabetically, so identical inputs always give identical output.
+"""
+import math
+import threading
+
+
+class SkillDocumentFrequency:
+    """
+    Corpus-wide count of postings mentioning each skill, updated incrementally.
+    Uses skills stored at ingestion, extracting from the description otherwise.
+    """
+
+    def __init__(self, postings_store, extract):
+        self.postings_store = postings_store
+        self.extract = extract
+        self.counts = {}
+        self.documents = 0
+        self.watermark = None
+        # Postings stored at exactly the watermark time; only these can be read twice
+        self.boundary = set()
+        self.lock = threading.Lock()
+        self.refresh_lock = threading.Lock()
+
+    def refresh(self):
+        """
+        Fold postings stored since the last refresh into the counts.
+        Returns at once when another refresh is already running.
+        """
+        if not self.refresh_lock.acquire(blocking=False):
+            return
+        try:
+            postings = self.postings_store.find(
+                since=self.watermark, columns=['posting_id', 'fetched_at', 'skills', 'description']
+            )
+            counts = {}
+            added = 0
+            for posting in postings:
+                if posting['fetched_at'] == self.watermark and posting['posting_id'] in self.boundary:
+                    continue
+                skills = posting.get('skills')
+                if skills is None:
+                    skills = self.extract(posting.get('description'))
+                for skill in skills:
+                    counts[skill] = counts.get(skill, 0) + 1
+                added += 1
+
+            with self.lock:
+                for skill, count in counts.items():
+                    self.counts[skill] = self.counts.get(skill, 0) + count
+                self.documents += added
+                if postings:
+                    watermark = max(p['fetched_at'] for p in postings)
+                    if watermark != self.watermark:
+                        self.boundary = set()
+                    self.boundary.update(p['posting_id'] for p in postings if p['fetched_at'] == watermark)
+                    self.watermark = watermark
+        finally:
+            self.refresh_lock.release()
+
+    def refresh_in_background(self):
+        """Start refresh() on a daemon thread unless one is already running"""
+        if not self.refresh_lock.locked():
+            threading.Thread(target=self.refresh, daemon=True).start()
+
+    def idf(self, skill):
+        with self.lock:
+            total, count = self.documents, self.counts.get(skill, 0)
+        return math.log((1 + total) / (1 + count)) + 1
+
+    def get_stats(self):
+        with self.lock:
+            return {'documents': self.documents, 'skills': len(self.counts)}
+
+
+def rank_skills(documents, document_frequency=None, limit=15):
+    """
+    Rank skills across per-document skill sets.
+    Returns [(skill, score)] ordered by score, then name.
+    """
+    documents = [set(skills) for skills in documents if skills]
+    if not documents:
+        return []
+
+    df = {}
+    for skills in documents:
+        for skill in skills:
+            df[skill] = df.get(skill, 0) + 1
+
+    scored = []
+    for skill, count in df.items():
+        score = count / len(documents)
+        if document_frequency is not None:
+            score *= document_frequency.idf(skill)
+        scored.append((skill, round(score, 6)))
+
+    scored.sort(key=lambda item: (-item[1], item[0]))
+    return scored[:limit]
@@ -0,0 +1,175 @@
+"""
+Skill-to-skill relevance, decided by the cheapest source that is sure.
+
+Each pair is answered in order by: exact or canonical-id equality, a
+symmetric persistent cache of earlier LLM verdicts, the precomputed
+taxonomy relatedness table (positive verdicts only), the hand-written
+category term lists, and embedding similarity thresholds. Whatever is still uncertain goes to the
+LLM in one batched prompt per call, and the verdicts are cached so the
+same pair (in either order) never reaches the LLM twice. Pairs the LLM
+could not answer come back as None (unknown), never as "not relevant".
+"""
+import json
+import os
+import re
+import threading
+
+from typeahead import normalize
+
+# Taxonomy relatedness at or above this is relevant; lower scores leave the pair to later stages,
+# since taxonomy categories are narrower than SKILL_CATEGORY_TERMS ("Heavy Lifting" vs "Construction")
+SKILL_RELATED_THRESHOLD = float(os.getenv('SKILL_RELATED_THRESHOLD', '0.5'))
+# Embedding similarity bands for skills outside the taxonomy
+EMBEDDING_RELATED_THRESHOLD = float(os.getenv('EMBEDDING_RELATED_THRESHOLD', '0.8'))
+EMBEDDING_UNRELATED_THRESHOLD = float(os.getenv('EMBEDDING_UNRELATED_THRESHOLD', '0.3'))
+MAX_PAIRS_PER_PROMPT = 60
+
+# Related terms for skills phrased outside the taxonomy ("hands-on", "people skills")
+SKILL_CATEGORY_TERMS = {
+    "manual_labor": [
+        "manual labor", "physical work", "hands-on", "working with hands",
+        "manual dexterity", "physical strength", "lifting", "construction",
+        "assembly", "manufacturing", "mechanical"
+    ],
+    "customer_service": [
+        "customer service", "client relations", "people skills",
+        "interpersonal", "communication", "customer support",
+        "client interaction", "public relations"
+    ],
+}
+
+SOURCES = ('exact', 'cache', 'taxonomy', 'category', 'embedding', 'llm', 'unresolved')
+
+
+class SkillRelevance:
+    """Relevance matrix over two skill lists with a staged, cache-first resolution"""
+
+    def __init__(self, taxonomy, similarity, ask_llm, cache=None, category_terms=SKILL_CATEGORY_TERMS):
+        # similarity: (text1, text2) -> embedding similarity
+        # ask_llm: messages -> completion text
+        # cache: PersistentTTLCache-like store for LLM verdicts
+        self.taxonomy = taxonomy
+        self.similarity = similarity
+        self.ask_llm = ask_llm
+        self.cache = cache
+        self.category_terms = category_terms
+        self.counts = {source: 0 for source in SOURCES}
+        self.lock = threading.Lock()
+
+    def pair_key(self, skill1, skill2):
+        """Order-independent key, on canonical ids where the skills resolve"""
+        keys = []
+        for skill in (skill1, skill2):
+            entry = self.taxonomy.resolve(skill)
+            keys.append(entry['id'] if entry else normalize(skill))
+        return '|'.join(sorted(keys))
+
+    def _decide_locally(self, skill1, skill2):
+        """(is_relevant, source) when a local source is sure, else (None, None)"""
+        first, second = self.taxonomy.resolve(skill1), self.taxonomy.resolve(skill2)
+        if normalize(skill1) == normalize(skill2) or (first and second and first['id'] == second['id']):
+            return True, 'exact'
+
+        if self.cache is not None:
+            cached, _ = self.cache.get(self.pair_key(skill1, skill2))
+            if cached is not None:
+                return cached, 'cache'
+
+        if first and second and self.taxonomy.relatedness(first['id'], second['id']) >= SKILL_RELATED_THRESHOLD:
+            return True, 'taxonomy'
+
+        lowered1, lowered2 = skill1.lower(), skill2.lower()
+        for terms in self.category_terms.values():
+            if any(term in lowered1 for term in terms) and any(term in lowered2 for term in terms):
+                return True, 'category'
+
+        similarity = self.similarity(
+            first['name'] if first else skill1,
+            second['name'] if second else skill2
+        )
+        if similarity >= EMBEDDING_RELATED_THRESHOLD:
+            return True, 'embedding'
+        if similarity <= EMBEDDING_UNRELATED_THRESHOLD:
+            return False, 'embedding'
+        return None, None
+
+    def _ask(self, pairs):
+        """One LLM call for a batch of uncertain pairs; returns a list of bools or None"""
+        listing = '\n'.join(f"{i + 1}. {skill1} | {skill2}" for i, (skill1, skill2) in enumerate(pairs))
+        messages = [
+            {"role": "system", "content": """You are a skill matching expert.
+             Determine if pairs of skills are relevant or similar to each other.
+             Consider both direct and indirect relationships.
+             For example: 'Manual Labor' is relevant to 'Working with Hands'."""},
+            {"role": "user", "content": f"""For each numbered pair below, are the two skills related or relevant to each other?
+             {listing}
+
+             Answer with only a JSON array of {len(pairs)} true/false values, in the same order."""}
+        ]
+        response = self.ask_llm(messages)
+        match = re.search(r'\[.*\]', response or '', re.DOTALL)
+        try:
+            verdicts = json.loads(match.group(0).lower()) if match else None
+        except ValueError:
+            verdicts = None
+        if not isinstance(verdicts, list) or len(verdicts) != len(pairs):
+            print(f"Unexpected batch relevance response: {response}")
+            return None
+        return [verdict is True for verdict in verdicts]
+
+    def matrix(self, skills1, skills2):
+        """
+        Relevance of every skills1 x skills2 pair.
+        Returns (matrix, sources): a list of rows of bools, with None for
+        pairs that could not be decided, and the count of pairs answered by
+        each source.
+        """
+        decided = {}
+        uncertain = {}
+        sources = {}
+        for skill1 in skills1:
+            for skill2 in skills2:
+                key = self.pair_key(skill1, skill2)
+                if key in decided or key in uncertain:
+                    continue
+                verdict, source = self._decide_locally(skill1, skill2)
+                if source is None:
+                    uncertain[key] = (skill1, skill2)
+                else:
+                    decided[key] = verdict
+                    sources[source] = sources.get(source, 0) + 1
+
+        keys = list(uncertain)
+        for start in range(0, len(keys), MAX_PAIRS_PER_PROMPT):
+            batch = keys[start:start + MAX_PAIRS_PER_PROMPT]
+            try:
+                verdicts = self._ask([uncertain[key] for key in batch])
+            except Exception as e:
+                print(f"Error checking skill relevance batch: {str(e)}")
+                verdicts = None
+            if verdicts is None:
+                # Unknown, not irrelevant; left uncached so a later call retries them
+                for key in batch:
+                    decided[key] = None
+                sources['unresolved'] = sources.get('unresolved', 0) + len(batch)
+                continue
+            for key, verdict in zip(batch, verdicts):
+                decided[key] = verdict
+                if self.cache is not None:
+                    self.cache.set(key, verdict)
+            sources['llm'] = sources.get('llm', 0) + len(batch)
+
+        with self.lock:
+            for source, count in sources.items():
+                self.counts[source] += count
+        rows = [[decided[self.pair_key(skill1, skill2)] for skill2 in skills2] for skill1 in skills1]
+        return rows, sources
+
+    def is_relevant(self, skill1, skill2):
+        """True/False, or None when the pair could not be decided"""
+        rows, _ = self.matrix([skill1], [skill2])
+        return rows[0][0]
+
+    def get_stats(self):
+        with self.lock:
+            return dict(self.counts)
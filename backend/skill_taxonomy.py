@@ -0,0 +1,119 @@
+"""
+Canonical skill taxonomy.
+
+Built from the bundled skill lexicon (data/skills.csv): every skill gets a
+stable id and a category id, and every alias ("Team Work", "teamwork",
+"Team Collaboration") resolves to the same skill. Categories extend the
+manual_labor/customer_service groups check_skill_relevance used to hard-code.
+Skill-to-skill relatedness is a table computed once per id pair, so
+matching can short-circuit on ids instead of embedding strings per request.
+"""
+import re
+import threading
+from functools import lru_cache
+
+import numpy as np
+
+from skill_extractor import get_skill_lexicon
+from typeahead import normalize
+
+# Same category is only a prior for ordering: it sits between the relevance thresholds
+# (skill_relevance: unrelated <= 0.2, related >= 0.5), so same-category pairs still go
+# on to embedding or LLM checks unless their embeddings alone are close enough
+SAME_CATEGORY_RELATEDNESS = 0.3
+UNRELATED_RELATEDNESS = 0.1
+MAX_DISTINCT_RELATEDNESS = 0.95
+
+# Filler around a skill name in profiles and LLM output ("Strong communication skills")
+SKILL_FILLER = re.compile(
+    r'^(?:strong|proven|demonstrated|excellent|advanced|basic|proficient|good|great)\s+|'
+    r'\s+(?:skills?|experience|knowledge|proficiency|expertise|abilities)$'
+)
+
+
+def skill_id(name):
+    return re.sub(r'[^a-z0-9+#]+', '-', name.lower()).strip('-')
+
+
+def category_id(name):
+    return re.sub(r'[^a-z0-9]+', '_', name.lower().replace('&', 'and')).strip('_')
+
+
+class SkillTaxonomy:
+    """Alias index over canonical skills plus a precomputed id-pair relatedness table"""
+
+    def __init__(self, lexicon=None, extractor=None):
+        # extractor: optional SkillExtractor used to find a known skill inside longer phrases
+        self.extractor = extractor
+        self.entries = []
+        self.by_id = {}
+        self.aliases = {}
+        for row in (lexicon if lexicon is not None else get_skill_lexicon()):
+            entry = {
+                'id': skill_id(row['skill']),
+                'name': row['skill'],
+                'category': category_id(row['category']),
+                'aliases': list(row.get('aliases') or [])
+            }
+            self.entries.append(entry)
+            self.by_id[entry['id']] = entry
+            for text in [entry['name']] + entry['aliases']:
+                self.aliases.setdefault(normalize(text), entry['id'])
+        self.by_name = {entry['name']: entry for entry in self.entries}
+
+        self.positions = {entry['id']: i for i, entry in enumerate(self.entries)}
+        self.relatedness_table = self._base_relatedness()
+        self.lock = threading.Lock()
+        self.resolve = lru_cache(maxsize=20000)(self._resolve)
+
+    def _base_relatedness(self):
+        categories = np.asarray([entry['category'] for entry in self.entries])
+        same = categories[:, None] == categories[None, :]
+        matrix = np.where(same, SAME_CATEGORY_RELATEDNESS, UNRELATED_RELATEDNESS)
+        np.fill_diagonal(matrix, 1.0)
+        return matrix
+
+    def precompute_relatedness(self, vector_fn):
+        """Raise id-pair relatedness to the cosine of skill-name embeddings where that is higher"""
+        vectors = np.asarray([vector_fn(entry['name']) for entry in self.entries], dtype=np.float64)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms == 0, 1, norms)
+        cosine = np.clip(vectors @ vectors.T, 0.0, MAX_DISTINCT_RELATEDNESS)
+        matrix = np.maximum(self._base_relatedness(), cosine)
+        np.fill_diagonal(matrix, 1.0)
+        with self.lock:
+            self.relatedness_table = matrix
+
+    def _resolve(self, text):
+        """Canonical entry for a skill string, or None"""
+        key = normalize(text)
+        if not key:
+            return None
+        if key in self.aliases:
+            return self.by_id[self.aliases[key]]
+        stripped = SKILL_FILLER.sub('', SKILL_FILLER.sub('', key))
+        if stripped in self.aliases:
+            return self.by_id[self.aliases[stripped]]
+        if self.extractor is not None:
+            # A longer phrase naming exactly one known skill ("hands-on forklift operation")
+            found = self.extractor.extract(text, require_context=False)
+            if len(found) == 1:
+                return self.by_name.get(next(iter(found)))
+        return None
+
+    def get(self, skill_id_):
+        return self.by_id.get(skill_id_)
+
+    def relatedness(self, first_id, second_id):
+        with self.lock:
+            return float(self.relatedness_table[self.positions[first_id], self.positions[second_id]])
+
+    def get_stats(self):
+        info = self.resolve.cache_info()
+        return {
+            'skills': len(self.entries),
+            'aliases': len(self.aliases),
+            'categories': len({entry['category'] for entry in self.entries}),
+            'resolveHits': info.hits,
+            'resolveMisses': info.misses
+        }
@@ -0,0 +1,136 @@
+"""
+Typo correction for job-title and skill search terms.
+
+A SymSpell-style symmetric-delete index over every word in the title and
+skill vocabularies: each vocabulary word is stored under all strings
+reachable by deleting up to MAX_EDIT_DISTANCE characters from its prefix, so
+a misspelling is resolved by generating its own deletes and looking them up,
+with no scan of the vocabulary. Words already in the vocabulary, and ordinary
+dictionary words ("usher", "baker"), are never corrected; only unknown
+tokens are. Corrected phrases that match a known title or skill are returned
+in canonical form, so "recepionist" and "Receptionist" share caches and
+upstream queries.
+"""
+import threading
+
+from typeahead import normalize
+
+MAX_EDIT_DISTANCE = 2
+PREFIX_LENGTH = 7
+# Words this short are acronyms or too ambiguous to correct ("rn", "it", "hr")
+MIN_CORRECTABLE_LENGTH = 4
+
+
+def edit_distance(a, b, max_distance):
+    """Optimal string alignment distance, or max_distance + 1 once it's exceeded"""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous_previous = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+            row_min = min(row_min, current[j])
+        if row_min > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+    return previous[-1]
+
+
+def _deletes(word, max_distance):
+    """Every string reachable from word by deleting up to max_distance characters"""
+    found = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier if len(w) > 1 for i in range(len(w))}
+        found |= frontier
+    return found
+
+
+class SpellCorrector:
+    """Symmetric-delete word correction plus canonical phrase lookup per vocabulary kind"""
+
+    def __init__(self, max_distance=MAX_EDIT_DISTANCE, prefix_length=PREFIX_LENGTH, is_word=None):
+        # is_word: optional callable word -> bool for dictionary words, which are left as typed
+        self.is_word = is_word
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.words = {}  # word -> frequency
+        self.deletes = {}  # delete -> set of words
+        self.phrases = {}  # kind -> {normalized phrase: display text}
+        self.lock = threading.Lock()
+
+    def add(self, kind, text, frequency=1, canonical=None):
+        """Add a phrase and its words to the vocabulary; aliases pass the canonical text they stand for"""
+        key = normalize(text)
+        if not key:
+            return
+        with self.lock:
+            self.phrases.setdefault(kind, {}).setdefault(key, (canonical or text).strip())
+            for word in key.split(' '):
+                if word not in self.words:
+                    self.words[word] = 0
+                    for deleted in _deletes(word[:self.prefix_length], self.max_distance):
+                        self.deletes.setdefault(deleted, set()).add(word)
+                self.words[word] += frequency
+
+    def correct_word(self, word):
+        """Closest vocabulary word (fewest edits, then most frequent), or the word itself"""
+        if word in self.words or len(word) < MIN_CORRECTABLE_LENGTH or not word.isalpha():
+            return word
+        if self.is_word is not None and self.is_word(word):
+            return word
+        max_distance = 1 if len(word) <= 5 else self.max_distance
+
+        candidates = set()
+        for deleted in _deletes(word[:self.prefix_length], max_distance):
+            candidates |= self.deletes.get(deleted, set())
+
+        best = None
+        for candidate in candidates:
+            distance = edit_distance(word, candidate, max_distance)
+            if distance > max_distance:
+                continue
+            rank = (distance, -self.words[candidate], candidate)
+            if best is None or rank < best:
+                best = rank
+        return best[2] if best else word
+
+    def correct(self, text, kind=None):
+        """
+        Correct each word of text and canonicalize the phrase.
+        Returns the canonical display text for a known phrase of that kind,
+        otherwise the corrected words (or the original text if nothing changed).
+        """
+        key = normalize(text)
+        if not key:
+            return text
+        with self.lock:
+            corrected = ' '.join(self.correct_word(word) for word in key.split(' '))
+            phrases = self.phrases.get(kind, {}) if kind else {}
+            if corrected in phrases:
+                return phrases[corrected]
+        if corrected == key:
+            return text
+        return corrected.title() if text.strip()[:1].isupper() else corrected
+
+    def known_phrase(self, kind, text):
+        """Canonical display text if text is a known phrase of this kind, else None"""
+        with self.lock:
+            return self.phrases.get(kind, {}).get(normalize(text))
+
+    def known_word(self, word):
+        return word in self.words
+
+    def get_stats(self):
+        with self.lock:
+            return {
+                'words': len(self.words),
+                'deletes': len(self.deletes),
+                'phrases': {kind: len(phrases) for kind, phrases in self.phrases.items()}
+            }
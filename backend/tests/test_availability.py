@@ -0,0 +1,27 @@
+import pytest
+
+from availability import BLOCKS_PER_DAY, _minutes, availability_mask, overlap_hours
+
+
+@pytest.mark.parametrize('value, minutes', [
+    ('14:30', 14 * 60 + 30),
+    ('02:30 PM', 14 * 60 + 30),
+    ('2:30 pm', 14 * 60 + 30),
+    ('09:00 a.m.', 9 * 60),
+    ('12:00 AM', 0),
+    ('12:15 PM', 12 * 60 + 15),
+])
+def test_minutes_reads_24_and_12_hour_times(value, minutes):
+    assert _minutes(value) == minutes
+
+
+def test_afternoon_slots_written_by_the_app_land_in_the_afternoon():
+    # 2024-01-01 is a Monday
+    mask = availability_mask({'2024-01-01': {'slots': [{'startTime': '01:00 PM', 'endTime': '05:00 PM'}]}})
+    assert mask == availability_mask({'2024-01-01': {'slots': [{'startTime': '13:00', 'endTime': '17:00'}]}})
+    assert overlap_hours(mask, availability_mask({'2024-01-08': [{'startTime': '09:00 AM', 'endTime': '02:00 PM'}]})) == 1.0
+    assert mask >> BLOCKS_PER_DAY == 0
+
+
+def test_unparseable_slots_are_skipped():
+    assert availability_mask({'2024-01-01': {'slots': [{'startTime': '13:00 PM', 'endTime': '05:00 PM'}]}}) == 0
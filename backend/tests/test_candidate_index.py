@@ -0,0 +1,84 @@
+import threading
+
+import numpy as np
+import pytest
+
+import candidate_index
+from candidate_index import CandidateIndex
+
+
+def unit_vectors(count, dimension=8, seed=0):
+    vectors = np.random.default_rng(seed).normal(size=(count, dimension))
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+@pytest.fixture
+def index():
+    index = CandidateIndex(min_points=50, probes=2)
+    for i, vector in enumerate(unit_vectors(400)):
+        index.upsert(f'w{i}', vector)
+    if index.training is not None:
+        index.training.join()
+    index.train()
+    return index
+
+
+def test_training_runs_in_the_background_and_assigns_late_writes(monkeypatch):
+    release = threading.Event()
+    kmeans = candidate_index._kmeans
+
+    def blocked_kmeans(*args, **kwargs):
+        release.wait(5)
+        return kmeans(*args, **kwargs)
+
+    monkeypatch.setattr(candidate_index, '_kmeans', blocked_kmeans)
+    index = CandidateIndex(min_points=20, probes=2)
+    vectors = unit_vectors(60)
+    for i, vector in enumerate(vectors[:40]):
+        index.upsert(f'w{i}', vector)
+    training = index.training
+
+    # k-means is still blocked, yet upserts return and searches scan exactly
+    assert training.is_alive() and index.centres is None
+    for i, vector in enumerate(vectors[40:], start=40):
+        index.upsert(f'w{i}', vector)
+    index.remove('w0')
+    assert len(index.search(vectors[1], 5)[0]) == 5
+
+    release.set()
+    training.join()
+    assert index.centres is not None and index.trained_size >= 20
+    assert sorted(index.assignments) == sorted(index.vectors) and 'w0' not in index.vectors
+    assert sum(len(members) for members in index.lists) == len(index) == 59
+
+
+def test_small_candidate_sets_are_scored_exactly(index):
+    query = unit_vectors(1, seed=1)[0]
+    nearby = {f'w{i}' for i in range(0, 400, 40)}
+    ranked, examined = index.search(query, 3, candidates=nearby)
+
+    expected = sorted(nearby, key=lambda worker_id: -float(index.vectors[worker_id] @ query))[:3]
+    assert [worker_id for worker_id, _ in ranked] == expected
+    assert examined == len(nearby)
+
+
+def test_examined_counts_every_probed_worker_the_filter_saw(index):
+    query = unit_vectors(1, seed=2)[0]
+    ranked, examined = index.search(query, 5)
+    assert len(ranked) == 5
+    assert 5 <= examined < len(index)
+    assert index.get_stats()['avgExamined'] == examined
+
+
+def test_filters_run_outside_the_lock(index):
+    query = unit_vectors(1, seed=3)[0]
+
+    def allowed(worker_id):
+        # Fails if search still holds the lock while filtering
+        assert index.lock.acquire(blocking=False)
+        index.lock.release()
+        return worker_id.endswith('7')
+
+    ranked, examined = index.search(query, 5, allowed=allowed)
+    assert len(ranked) == 5 and all(worker_id.endswith('7') for worker_id, _ in ranked)
+    assert examined >= 5
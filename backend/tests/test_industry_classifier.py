@@ -0,0 +1,50 @@
+import pytest
+
+from industry_classifier import IndustryClassifier, strip_benefits
+
+# The app's industry_search_terms and INDUSTRY_KEYWORDS
+SEARCH_TERMS = {
+    'Technology': [
+        ['software', 'tech', 'IT', 'digital', 'computer'],
+        ['artificial intelligence', 'machine learning', 'data science'],
+        ['cybersecurity', 'cloud computing', 'blockchain']
+    ],
+    'Healthcare': [
+        ['medical', 'health', 'healthcare', 'clinical'],
+        ['hospital', 'pharmacy', 'nursing', 'dental'],
+        ['biotech', 'life sciences', 'pharmaceutical']
+    ],
+}
+INDUSTRY_NAMES = ['Technology', 'Healthcare', 'Finance', 'Education', 'Manufacturing', 'Retail', 'Hospitality']
+
+
+@pytest.fixture(scope='module')
+def classifier():
+    return IndustryClassifier(SEARCH_TERMS, INDUSTRY_NAMES)
+
+
+def test_benefits_boilerplate_does_not_outvote_the_posting(classifier):
+    cashier = {
+        'title': 'Cashier',
+        'company_name': 'Fresh Mart',
+        'description': (
+            "Join our retail team! Greet customers and run the register.\n"
+            "Benefits: medical, dental and vision. 401(k) with match."
+        )
+    }
+    assert 'Healthcare' not in classifier.score_posting(cashier)
+    assert classifier.classify_posting(cashier) == 'Retail'
+
+
+def test_benefits_sections_are_dropped_up_to_the_next_blank_line():
+    description = "Stock shelves.\nWhat we offer:\n- Medical\n- Dental\n\nWeekend availability required."
+    assert strip_benefits(description) == "Stock shelves.\nWeekend availability required."
+
+
+def test_title_outweighs_the_description(classifier):
+    nurse = {
+        'title': 'Hospital Staff Nurse',
+        'company_name': 'Mercy',
+        'description': 'Chart in our digital records system and use a computer daily.'
+    }
+    assert classifier.classify_posting(nurse) == 'Healthcare'
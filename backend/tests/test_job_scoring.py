@@ -0,0 +1,115 @@
+import zlib
+
+import numpy as np
+import pytest
+
+from cascade_scorer import CascadeScorer
+from job_scoring import best_job_score, document_jobs, map_phrases, match_components
+from salary_stats import default_title_key
+from skill_taxonomy import SkillTaxonomy
+from title_taxonomy import TitleTaxonomy, SAME_FAMILY_SIMILARITY
+
+
+def word_vector(word):
+    return np.random.default_rng(zlib.crc32(word.encode())).normal(size=32)
+
+
+def phrase_vector(text):
+    """Mean of per-word vectors, like a spaCy doc vector"""
+    words = text.lower().split()
+    return np.mean([word_vector(word) for word in words], axis=0) if words else np.zeros(32)
+
+
+def embed_similarity(text1, text2):
+    vector1, vector2 = phrase_vector(text1), phrase_vector(text2)
+    norms = np.linalg.norm(vector1) * np.linalg.norm(vector2)
+    return float(vector1 @ vector2 / norms) if norms else 0.0
+
+
+@pytest.fixture(scope='module')
+def scorers():
+    titles = TitleTaxonomy()
+    titles.precompute_similarity(phrase_vector)
+    skills = SkillTaxonomy()
+    skills.precompute_relatedness(phrase_vector)
+    return {
+        'title': CascadeScorer(
+            embed=lambda title1, title2: embed_similarity(default_title_key(title1), default_title_key(title2)),
+            resolve=lambda title: (titles.resolve(title) or {}).get('id'),
+            id_similarity=titles.similarity
+        ),
+        'industry': CascadeScorer(embed=embed_similarity),
+        'skills': CascadeScorer(
+            embed=embed_similarity,
+            resolve=lambda skill: (skills.resolve(skill) or {}).get('id'),
+            id_similarity=skills.relatedness
+        )
+    }
+
+
+@pytest.fixture(scope='module')
+def similarities(scorers):
+    embedders = {'title': lambda key: phrase_vector(default_title_key(key)), 'industry': phrase_vector, 'skills': phrase_vector}
+    return {
+        'text': {field: scorer.score for field, scorer in scorers.items()},
+        'stored': {field: scorer.score_phrases for field, scorer in scorers.items()},
+        'phrase': lambda field, text: scorers[field].phrase(text, embedders[field])
+    }
+
+
+def profile(*jobs, industry_prefs=()):
+    return {
+        'selectedJobs': [
+            {'title': title, 'industry': industry, 'skills': [{'name': skill} for skill in skills]}
+            for title, industry, skills in jobs
+        ],
+        'industryPrefs': list(industry_prefs)
+    }
+
+
+PROFILE_PAIRS = [
+    (profile(('Registered Nurse', 'Technology', ['Python'])),
+     profile(('Licensed Practical Nurse', 'Software', ['Java']))),
+    (profile(('RN', 'Healthcare', ['Patient Care', 'CPR'])),
+     profile(('Registered Nurse - Nights', 'Hospital', ['cpr certified', 'Scheduling']))),
+    (profile(('Barista', 'Food Service', ['Customer Service', 'Cash Handling']), ('Line Cook', 'Restaurants', [])),
+     profile(('Coffee Shop Attendant', 'Hospitality', ['Latte Art', 'Teamwork']))),
+    (profile(('Forklift Driver', 'Logistics', ['Forklift', 'Inventory Management'])),
+     profile(('Warehouse Associate', 'Logistics', ['Shipping', 'Receiving', 'Lifting']))),
+]
+
+
+@pytest.mark.parametrize('user, item', PROFILE_PAIRS)
+def test_stored_phrases_score_like_the_text_they_came_from(similarities, user, item):
+    user_jobs, item_jobs = document_jobs('profile', user), document_jobs('profile', item)
+    text_score = best_job_score(user_jobs, item_jobs, similarities['text'])
+    stored_score = best_job_score(
+        map_phrases(user_jobs, similarities['phrase']),
+        map_phrases(item_jobs, similarities['phrase']),
+        similarities['stored']
+    )
+    assert stored_score == pytest.approx(text_score, abs=1e-4)
+
+
+def test_resolved_titles_score_from_the_taxonomy_not_the_embedding(similarities):
+    phrase = similarities['phrase']
+    nurse, practical_nurse = phrase('title', 'Registered Nurse'), phrase('title', 'Licensed Practical Nurse')
+    assert (nurse['id'], practical_nurse['id']) == ('registered-nurse', 'licensed-practical-nurse')
+    # Same family, so at least SAME_FAMILY_SIMILARITY whatever the vectors say
+    assert similarities['stored']['title'](nurse, practical_nurse) >= SAME_FAMILY_SIMILARITY
+
+
+def test_match_components_agree_for_stored_documents(similarities):
+    job = {'jobTitle': 'Staff RN', 'industry': 'Healthcare', 'requiredSkills': [{'name': 'CPR'}, {'name': 'Charting'}]}
+    user = profile(('Registered Nurse', 'Hospital', ['BLS', 'CPR']), industry_prefs=['Health Care', 'Education'])
+    job_jobs, user_jobs = document_jobs('job', job), document_jobs('profile', user)
+
+    text = match_components(job_jobs[0], user_jobs, user['industryPrefs'], similarities['text'])
+    stored = match_components(
+        map_phrases(job_jobs, similarities['phrase'])[0],
+        map_phrases(user_jobs, similarities['phrase']),
+        [similarities['phrase']('industry', industry) for industry in user['industryPrefs']],
+        similarities['stored']
+    )
+    assert stored == pytest.approx(text, abs=1e-4)
+    assert text['title'] == 1.0
@@ -0,0 +1,20 @@
+import pytest
+
+from locations import canonicalize_location
+
+
+@pytest.mark.parametrize('text', [
+    '123 Main St, San Jose, CA',
+    '123 Main St, San Jose, CA 95112',
+    '123 Main St, Suite 4, San Jose, California, USA',
+])
+def test_street_addresses_resolve_to_their_city(text):
+    location = canonicalize_location(text)
+    assert location.id == canonicalize_location('San Jose, CA').id
+    assert (location.city, location.state, location.country) == ('San Jose', 'CA', 'US')
+
+
+def test_street_address_abroad_keeps_city_region_and_country():
+    location = canonicalize_location('10 King St W, Toronto, ON, Canada')
+    assert location.id == canonicalize_location('Toronto, ON, Canada').id
+    assert (location.city, location.country) == ('Toronto', 'Canada')
@@ -0,0 +1,47 @@
+import pytest
+
+from profile_store import ProfileStore, InvalidVersion, VersionConflict
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'profiles.sqlite3')
+
+
+def test_reads_see_writes_from_another_store(db_path):
+    first, second = ProfileStore(db_path=db_path), ProfileStore(db_path=db_path)
+    first.put('profile', 'w1', {'name': 'a'})
+    assert second.get('profile', 'w1')['document'] == {'name': 'a'}
+
+    second.put('profile', 'w1', {'name': 'b'})
+    entry = first.get('profile', 'w1')
+    assert entry['version'] == 2
+    assert entry['document'] == {'name': 'b'}
+
+    second.delete('profile', 'w1')
+    assert first.get('profile', 'w1') is None
+
+
+def test_get_returns_copies(db_path):
+    store = ProfileStore(db_path=db_path)
+    store.put('profile', 'w1', {'skills': ['Python']})
+    store.get('profile', 'w1')['document']['skills'].append('Java')
+    assert store.get('profile', 'w1')['document'] == {'skills': ['Python']}
+
+
+@pytest.mark.parametrize('version', ['abc', '1.5', 1.5, 0, '-1', True])
+def test_malformed_versions_are_rejected(db_path, version):
+    store = ProfileStore(db_path=db_path)
+    store.put('profile', 'w1', {})
+    with pytest.raises(InvalidVersion):
+        store.get('profile', 'w1', version)
+    with pytest.raises(InvalidVersion):
+        store.put('profile', 'w1', {}, version)
+
+
+def test_stale_versions_conflict(db_path):
+    store = ProfileStore(db_path=db_path)
+    store.put('profile', 'w1', {}, '3')
+    assert store.get('profile', 'w1', '3')['version'] == 3
+    with pytest.raises(VersionConflict):
+        store.put('profile', 'w1', {}, 2)
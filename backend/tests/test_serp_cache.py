@@ -0,0 +1,26 @@
+from cache_store import PersistentTTLCache
+from serp_cache import SerpCache
+
+
+def serp_cache(**kwargs):
+    return SerpCache(ttls={'google_jobs': 3600}, store=PersistentTTLCache('serpapi', db_path=':memory:'), **kwargs)
+
+
+def test_callers_cannot_change_a_cached_response():
+    cache = serp_cache()
+    params = {'engine': 'google_jobs', 'q': 'cashier'}
+    first = cache.get_or_fetch(params, lambda: {'jobs_results': [{'title': 'Cashier'}]})
+    first['jobs_results'].clear()
+
+    second = cache.get_or_fetch(params, lambda: {'jobs_results': []})
+    assert second == {'jobs_results': [{'title': 'Cashier'}]}
+    second['jobs_results'].append({'title': 'Stocker'})
+    assert cache.get_or_fetch(params, lambda: {})['jobs_results'] == [{'title': 'Cashier'}]
+
+
+def test_failure_and_refresh_bookkeeping_stays_bounded():
+    cache = serp_cache(max_tracked=10)
+    for i in range(50):
+        cache.get_or_fetch({'engine': 'google_jobs', 'q': f'query {i}'}, lambda: {'error': 'quota'})
+    assert len(cache.failures) == 10
+    assert len(cache.last_refresh) == 10
@@ -0,0 +1,44 @@
+import pytest
+
+from keyword_matcher import KeywordMatcher
+from skill_extractor import skill_extractor
+
+
+@pytest.mark.parametrize('text', [
+    "Must react quickly to customer needs.",
+    "Swift response to every incident.",
+    "Excel in a team environment.",
+    "Able to lift 50 lbs.",
+    "Free shipping on all orders.",
+    "Service delivery and overall strategy.",
+    "Day-to-day operations and testing of new ideas.",
+    "A lean team that paints on canvas.",
+])
+def test_everyday_words_are_not_skills(text):
+    assert skill_extractor.extract(text) == set()
+
+
+@pytest.mark.parametrize('text, skill', [
+    ("Experience building apps in React and TypeScript.", 'React'),
+    ("React, Redux and Node.js", 'React'),
+    ("Proficient in Excel and Outlook.", 'Excel'),
+    ("Native iOS apps with Swift", 'Swift'),
+    ("Shipping and receiving, forklift a plus", 'Shipping and Receiving'),
+    ("Courses are delivered through Canvas.", 'Learning Management Systems'),
+    ("Microsoft Excel", 'Excel'),
+])
+def test_ambiguous_skills_match_in_context(text, skill):
+    assert skill in skill_extractor.extract(text)
+
+
+def test_sentence_initial_capital_is_not_context():
+    matcher = KeywordMatcher()
+    matcher.add('React', 'React', group='tech', ambiguous=True)
+    matcher.add('Node.js', 'Node.js', group='tech')
+    assert matcher.find_all("React fast. Then relax.") == set()
+    assert matcher.find_all("Built in React.") == {'React'}
+    assert matcher.find_all("React and Node.js") == {'React', 'Node.js'}
+
+
+def test_short_phrases_can_skip_context():
+    assert skill_extractor.extract("react", require_context=False) == {'React'}
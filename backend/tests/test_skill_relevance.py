@@ -0,0 +1,33 @@
+import pytest
+
+from skill_relevance import SkillRelevance
+from skill_taxonomy import SkillTaxonomy
+
+
+def unsure_llm(messages):
+    raise AssertionError('local sources should settle these pairs')
+
+
+@pytest.fixture(scope='module')
+def relevance():
+    # Embedding similarity in the uncertain band, so only the taxonomy or category terms can decide
+    return SkillRelevance(SkillTaxonomy(), similarity=lambda text1, text2: 0.5, ask_llm=unsure_llm)
+
+
+@pytest.mark.parametrize('skill1, skill2', [
+    ('Manual Labor', 'Construction'),
+    ('Heavy Lifting', 'Construction'),
+    ('Customer Service', 'Communication'),
+    ('Customer Service', 'Interpersonal Skills'),
+])
+def test_category_terms_outrank_a_low_taxonomy_score(relevance, skill1, skill2):
+    assert relevance._decide_locally(skill1, skill2) == (True, 'category')
+    matrix, _ = relevance.matrix([skill1], [skill2])
+    assert matrix == [[True]]
+
+
+def test_taxonomy_still_settles_related_pairs():
+    taxonomy = SkillTaxonomy()
+    taxonomy.precompute_relatedness(lambda name: [1.0, 1.0] if name in ('Forklift', 'Inventory Management') else [1.0, -1.0])
+    relevance = SkillRelevance(taxonomy, similarity=lambda text1, text2: 0.5, ask_llm=unsure_llm)
+    assert relevance._decide_locally('Forklift', 'Inventory Management') == (True, 'taxonomy')
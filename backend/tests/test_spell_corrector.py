@@ -0,0 +1,28 @@
+from spell_corrector import SpellCorrector
+
+
+def make_corrector():
+    dictionary = {'usher', 'baker'}
+    corrector = SpellCorrector(is_word=lambda word: word in dictionary)
+    for title in ('User Researcher', 'Banker', 'Receptionist'):
+        corrector.add('title', title)
+    corrector.add('skill', 'JavaScript')
+    return corrector
+
+
+def test_dictionary_words_are_not_corrected():
+    corrector = make_corrector()
+    assert corrector.correct('Usher', 'title') == 'Usher'
+    assert corrector.correct('Baker', 'title') == 'Baker'
+
+
+def test_known_words_are_not_corrected():
+    assert make_corrector().correct_word('banker') == 'banker'
+
+
+def test_typos_are_corrected_to_canonical_phrases():
+    corrector = make_corrector()
+    assert corrector.correct('recepionist', 'title') == 'Receptionist'
+    assert corrector.correct('javscript', 'skill') == 'JavaScript'
+    # Not a title phrase, so only the word is fixed
+    assert corrector.correct('javscript', 'title') == 'javascript'
@@ -0,0 +1,78 @@
+import pytest
+
+from title_normalizer import TitleNormalizer, TITLE_NORMALIZER_MIN_CONFIDENCE
+
+KNOWN_TITLES = ['Registered Nurse', 'Night Auditor', 'Warehouse Associate', 'Cashier', 'Manager', 'Assistant']
+
+
+class Vocabulary:
+    """Stand-in for the SpellCorrector vocabulary the app passes in"""
+
+    def __init__(self, titles):
+        self.phrases = {title.lower(): title for title in titles}
+        self.words = {word for title in self.phrases for word in title.split()}
+
+    def known_phrase(self, kind, text):
+        return self.phrases.get(' '.join(text.lower().split()))
+
+    def known_word(self, word):
+        return word in self.words
+
+
+@pytest.fixture
+def normalizer():
+    return TitleNormalizer(Vocabulary(KNOWN_TITLES))
+
+
+@pytest.mark.parametrize('title', [
+    'Contract Manager',
+    'Hiring Manager',
+    'Night Auditor',
+    'PT Assistant',
+    'Remote Sensing Analyst',
+    'Days Inn Front Desk',
+])
+def test_qualifier_words_inside_real_titles_are_kept(normalizer, title):
+    assert normalizer.normalize(title)['title'] == title
+
+
+@pytest.mark.parametrize('title, expected', [
+    ('Registered Nurse - Nights', 'Registered Nurse'),
+    ('Registered Nurse (Nights)', 'Registered Nurse'),
+    ('Remote Registered Nurse', 'Registered Nurse'),
+    ('PT Registered Nurse Nights', 'Registered Nurse'),
+    ('Now Hiring: Warehouse Associate Full Time', 'Warehouse Associate'),
+    ('Night Auditor Full-Time', 'Night Auditor'),
+    ('Registered Nurse Night Shift', 'Registered Nurse'),
+])
+def test_leading_and_trailing_qualifiers_are_stripped(normalizer, title, expected):
+    assert normalizer.normalize(title)['title'] == expected
+
+
+def test_generic_single_word_result_is_not_confident(normalizer):
+    result = normalizer.normalize('Part Time Manager')
+    assert result['title'] == 'Manager'
+    assert not normalizer.is_confident(result, TITLE_NORMALIZER_MIN_CONFIDENCE)
+
+
+def test_without_vocabulary_only_unambiguous_qualifiers_are_stripped():
+    normalizer = TitleNormalizer()
+    assert normalizer.normalize('Remote Registered Nurse')['title'] == 'Remote Registered Nurse'
+    assert normalizer.normalize('Registered Nurse Full Time')['title'] == 'Registered Nurse'
+
+
+@pytest.mark.parametrize('title, expected', [
+    ('Cashier PT', 'Cashier'),
+    ('RN PT', 'Registered Nurse'),
+])
+def test_ambiguous_qualifier_is_stripped_when_the_rest_is_a_known_title(normalizer, title, expected):
+    result = normalizer.normalize(title)
+    assert result['title'] == expected
+    assert normalizer.is_confident(result)
+
+
+@pytest.mark.parametrize('title', ['Barista PT', 'Contract Manager', 'PT Assistant'])
+def test_unsettled_ambiguous_qualifier_goes_to_the_llm(normalizer, title):
+    result = normalizer.normalize(title)
+    assert result['title'] == title
+    assert not normalizer.is_confident(result)
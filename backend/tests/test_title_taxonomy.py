@@ -0,0 +1,58 @@
+import pytest
+
+from title_taxonomy import TitleTaxonomy, SAME_FAMILY_SIMILARITY
+
+
+@pytest.fixture(scope='module')
+def taxonomy():
+    return TitleTaxonomy()
+
+
+@pytest.mark.parametrize('title, related_id', [
+    ('Paramedic', 'emergency-medical-technician'),
+    ('Physical Therapy Assistant', 'physical-therapist'),
+    ('Personal Banker', 'bank-teller'),
+    ('Assistant Store Manager', 'store-manager'),
+    ('ML Engineer', 'data-scientist'),
+    ('Account Executive', 'sales-representative'),
+    ('Program Manager', 'project-manager'),
+    ('Executive Assistant', 'administrative-assistant'),
+    ('Night Auditor', 'hotel-front-desk-agent'),
+])
+def test_distinct_roles_are_separate_entries_in_the_same_family(taxonomy, title, related_id):
+    entry = taxonomy.resolve(title)
+    assert entry['id'] != related_id
+    assert entry['family'] == taxonomy.get(related_id)['family']
+    assert taxonomy.similarity(entry['id'], related_id) >= SAME_FAMILY_SIMILARITY
+
+
+@pytest.mark.parametrize('alias, title_id', [
+    ('RN', 'registered-nurse'),
+    ('CNA', 'certified-nursing-assistant'),
+    ('Physiotherapist', 'physical-therapist'),
+])
+def test_synonyms_resolve_to_their_canonical_title(taxonomy, alias, title_id):
+    assert taxonomy.resolve(alias)['id'] == title_id
+
+
+@pytest.mark.parametrize('title', ['Driver', 'Designer'])
+def test_generic_words_are_not_aliases(taxonomy, title):
+    assert taxonomy.resolve(title) is None
+
+
+@pytest.mark.parametrize('title', ['Senior Accountant', 'Shift Lead', 'Warehouse Lead', 'Head Chef', 'Executive Chef'])
+def test_seniority_variants_are_not_aliases(taxonomy, title):
+    assert all(
+        title.lower() not in [alias.lower() for alias in entry['aliases']]
+        for entry in taxonomy.entries
+    )
+
+
+@pytest.mark.parametrize('title, display', [
+    ('Senior Accountant', 'Senior Accountant'),
+    ('Sr Accountant', 'Senior Accountant'),
+    ('Head Chef', 'Head Chef'),
+    ('Staff RN', 'Registered Nurse'),
+])
+def test_display_title_keeps_seniority(taxonomy, title, display):
+    assert taxonomy.display_title(title) == display
@@ -0,0 +1,260 @@
+"""
+Deterministic job-title normalization.
+
+Applies the mechanical rewrites the LLM normalizer was prompted with:
+drop location/facility suffixes, bracketed notes, employment type (PT/FT,
+per diem), shift info, pay and bonus blurbs and trailing levels ("II",
+"Level 3"); expand abbreviations ("Sr Mgr" -> "Senior Manager"); contract
+"Information Technology" to "IT"; and fix acronym casing. Employment type,
+shift and urgency words are only removed as qualifiers: in brackets, after a
+dash, or at the start or end of the title. Words that also begin or end
+real titles ("Contract Manager", "Night Auditor", "PT Assistant") are only
+removed when what is left is a known title other than a bare role noun
+("Cashier PT" -> "Cashier"); otherwise they are kept and the result is
+marked unconfident so the LLM decides. Each result carries
+a confidence score from how much of it the known title vocabulary
+recognises, so callers only escalate unusual titles to the LLM.
+"""
+import os
+import re
+
+TITLE_NORMALIZER_MIN_CONFIDENCE = float(os.getenv('TITLE_NORMALIZER_MIN_CONFIDENCE', '0.75'))
+
+ABBREVIATIONS = {
+    'sr': 'Senior', 'snr': 'Senior', 'jr': 'Junior', 'mgr': 'Manager', 'mngr': 'Manager',
+    'asst': 'Assistant', 'assoc': 'Associate', 'tech': 'Technician', 'techn': 'Technician',
+    'eng': 'Engineer', 'engr': 'Engineer', 'dev': 'Developer', 'rep': 'Representative',
+    'coord': 'Coordinator', 'spec': 'Specialist', 'supv': 'Supervisor', 'supvr': 'Supervisor',
+    'dir': 'Director', 'exec': 'Executive', 'ops': 'Operations', 'cust': 'Customer',
+    'svc': 'Service', 'svcs': 'Services', 'maint': 'Maintenance', 'whse': 'Warehouse',
+    'admin': 'Administrative', 'acct': 'Accounting', 'mktg': 'Marketing', 'hr': 'HR',
+    'pharm': 'Pharmacy', 'med': 'Medical', 'ctr': 'Center', 'mech': 'Mechanic',
+    'prod': 'Production', 'mfg': 'Manufacturing', 'qual': 'Quality', 'tchr': 'Teacher',
+}
+
+# Abbreviations that name the role only at the end of a title ("Pharmacy Tech" vs "Tech Support")
+MODIFIER_ABBREVIATIONS = {
+    'tech': 'Technical', 'eng': 'Engineering', 'engr': 'Engineering', 'dev': 'Development',
+    'mech': 'Mechanical', 'spec': 'Special',
+}
+
+CONTRACTIONS = [
+    (re.compile(r'\binformation technology\b', re.IGNORECASE), 'IT'),
+    (re.compile(r'\bhuman resources\b', re.IGNORECASE), 'HR'),
+    (re.compile(r'\bquality assurance\b', re.IGNORECASE), 'QA'),
+    (re.compile(r'\bvice president\b', re.IGNORECASE), 'VP'),
+]
+
+ACRONYMS = {
+    'it', 'hr', 'qa', 'vp', 'svp', 'evp', 'ceo', 'cfo', 'cto', 'coo', 'rn', 'lpn', 'lvn', 'cna',
+    'np', 'pa', 'pt', 'emt', 'icu', 'er', 'cdl', 'hvac', 'cpa', 'ux', 'ui', 'ai', 'ml', 'seo',
+    'sql', 'aws', 'crm', 'erp', 'sap', 'bi', 'dba', 'cnc', 'plc', 'ekg', 'mri', 'ct', 'sdr', 'bdr',
+}
+# Titles that are nothing but a credential
+CREDENTIAL_TITLES = {
+    'RN': 'Registered Nurse', 'LPN': 'Licensed Practical Nurse', 'LVN': 'Licensed Vocational Nurse',
+    'CNA': 'Certified Nursing Assistant', 'NP': 'Nurse Practitioner', 'PA': 'Physician Assistant',
+    'EMT': 'Emergency Medical Technician', 'CPA': 'Certified Public Accountant',
+}
+# Role nouns that normally end a title; one at the front ("Director Technology Support") needs rewording
+HEAD_NOUNS = {'director', 'manager', 'supervisor', 'coordinator', 'specialist', 'vp', 'head'}
+LOWERCASE_WORDS = {'of', 'and', 'for', 'the', 'in', 'to', 'with', 'a', 'an', 'at', 'on'}
+SENIORITY_WORDS = {'lead', 'senior', 'junior', 'principal', 'staff', 'chief', 'head', 'associate'}
+
+NOISE_PATTERNS = [
+    ('brackets', re.compile(r'\[[^\]]*\]|\([^)]*\)|\{[^}]*\}')),
+    ('pay', re.compile(r'\$\s?[\d,.]+\s*[kK]?(?:\s*(?:-|to)\s*\$?\s?[\d,.]+\s*[kK]?)?(?:\s*/?\s*(?:hr|hour|yr|year))?')),
+    ('bonus', re.compile(r'\b(?:up to\s+)?(?:sign[\s-]?on|signing|retention|referral)\s+bonus\b.*$', re.IGNORECASE)),
+]
+
+# Qualifiers removed only at the start or end of a title: (rule, ambiguous, alternatives).
+# Ambiguous ones also begin or end real titles and need the rest to be a known title.
+QUALIFIER_PATTERNS = [
+    ('employment_type', False, r'full[\s-]?time|part[\s-]?time|ft|prn|per diem|temporary|seasonal|w2|1099'),
+    ('shift', False,
+     r'(?:1st|2nd|3rd|first|second|third|day|night|evening|overnight|weekend|swing|grave(?:yard)?)\s*shifts?|'
+     r'nights|evenings|overnights|weekends|noc'),
+    ('urgency', False, r'urgently|immediately|now hiring|needed|wanted|jobs?'),
+    ('employment_type', True, r'contract(?:or)?|remote|hybrid|on[\s-]?site|pt|temp'),
+    ('shift', True, r'night|days?|evening|overnight|weekend'),
+    ('urgency', True, r'urgent|immediate|hiring|opening'),
+]
+QUALIFIER_EDGES = [
+    (name, ambiguous, edge)
+    for name, ambiguous, alternatives in QUALIFIER_PATTERNS
+    for edge in (
+        re.compile(rf'^(?:{alternatives})\b[\s:,-]*', re.IGNORECASE),
+        re.compile(rf'[\s:,-]*\b(?:{alternatives})$', re.IGNORECASE),
+    )
+]
+# Role nouns too generic to stand alone once qualifiers were stripped ("Hiring Manager" -> "Manager")
+GENERIC_TITLE_WORDS = {
+    'manager', 'assistant', 'associate', 'analyst', 'auditor', 'specialist', 'coordinator', 'supervisor',
+    'technician', 'representative', 'director', 'worker', 'clerk', 'operator', 'agent', 'consultant',
+    'administrator', 'officer', 'lead', 'engineer', 'staff', 'helper', 'attendant',
+}
+GENERIC_TITLE_CONFIDENCE = 0.5
+# Kept an ambiguous edge word ("Contract", "PT") that may be a qualifier
+UNSETTLED_QUALIFIER_CONFIDENCE = 0.5
+
+SUFFIX_SPLIT = re.compile(r'\s+[-–—|@]\s+|\s+at\s+|,|;|\s+\|\s*')
+LEVEL_SUFFIX = re.compile(r'\s+(?:level\s+)?(?:[ivx]{1,4}|\d{1,2})$', re.IGNORECASE)
+
+
+class TitleNormalizer:
+    """Rule-based title cleanup with a confidence score against a known vocabulary"""
+
+    def __init__(self, vocabulary=None):
+        # vocabulary: object with known_phrase(kind, text) and known_word(word), e.g. a SpellCorrector
+        self.vocabulary = vocabulary
+
+    def normalize(self, title):
+        """Return {'title', 'confidence', 'rules'} for a raw job title"""
+        rules = []
+        unsettled = False  # an ambiguous qualifier was kept because the rest isn't a known title
+        text = ' '.join(str(title or '').split())
+
+        for name, pattern in NOISE_PATTERNS[:2]:
+            text, count = pattern.subn(' ', text)
+            if count:
+                rules.append(name)
+
+        # Location, facility and company suffixes
+        parts = [part for part in SUFFIX_SPLIT.split(text) if part.strip()]
+        if len(parts) > 1:
+            rules.append('suffix')
+        text = parts[0] if parts else ''
+
+        for name, pattern in NOISE_PATTERNS[2:]:
+            text, count = pattern.subn(' ', text)
+            if count:
+                rules.append(name)
+
+        # Leading/trailing qualifiers, unless the whole thing is already a known title
+        text = ' '.join(text.split())
+        if not self._known_title(text):
+            core, qualifier_rules, used_ambiguous = self._strip_qualifiers(text, ambiguous=True)
+            if used_ambiguous and not self._known_core(core):
+                core, qualifier_rules, _ = self._strip_qualifiers(text, ambiguous=False)
+                unsettled = True
+            text = core
+            rules.extend(qualifier_rules)
+
+        for pattern, replacement in CONTRACTIONS:
+            text, count = pattern.subn(replacement, text)
+            if count:
+                rules.append('contraction')
+
+        text = ' '.join(text.replace('/', ' / ').replace('&', ' & ').split())
+        text, count = LEVEL_SUFFIX.subn('', text)
+        if count:
+            rules.append('level')
+
+        words = []
+        ambiguous = False
+        tokens = text.split(' ') if text else []
+        for i, token in enumerate(tokens):
+            word = token.strip('.-')
+            lowered = word.lower()
+            if not word:
+                continue
+            if word == '/':
+                # "Lead/Senior Tech": keep the later of two seniority words
+                if words and i + 1 < len(tokens) and words[-1].lower() in SENIORITY_WORDS \
+                        and tokens[i + 1].lower() in SENIORITY_WORDS:
+                    words.pop()
+                    rules.append('seniority')
+                    continue
+                ambiguous = True
+                words.append('/')
+                continue
+            if lowered in ABBREVIATIONS:
+                is_last = i == len(tokens) - 1
+                word = ABBREVIATIONS[lowered] if is_last else MODIFIER_ABBREVIATIONS.get(lowered, ABBREVIATIONS[lowered])
+                rules.append('abbreviation')
+            elif lowered in ACRONYMS:
+                word = lowered.upper()
+            elif lowered in LOWERCASE_WORDS and words:
+                word = lowered
+            elif word.isupper() or word.islower() or not word[1:].islower():
+                word = word.capitalize()
+            words.append(word)
+
+        # Trailing connectors left behind by removed noise ("Nurse -", "Driver and")
+        while words and (words[-1] in ('/', '&') or words[-1] in LOWERCASE_WORDS):
+            words.pop()
+        normalized = ' '.join(words).replace(' / ', '/')
+        if normalized in CREDENTIAL_TITLES:
+            normalized = CREDENTIAL_TITLES[normalized]
+            rules.append('credential')
+        if ambiguous and '/' not in normalized:
+            ambiguous = False
+
+        canonical = self.vocabulary.known_phrase('title', normalized) if self.vocabulary is not None else None
+        confidence = 1.0 if canonical else self._confidence(normalized, ambiguous)
+        # Stripping noise down to one generic role noun probably lost part of the title
+        if rules and normalized.lower() in GENERIC_TITLE_WORDS:
+            confidence = min(confidence, GENERIC_TITLE_CONFIDENCE)
+        # "Contract Manager" may or may not be a contract job; the LLM decides
+        if unsettled and not canonical:
+            confidence = min(confidence, UNSETTLED_QUALIFIER_CONFIDENCE)
+        return {
+            'title': canonical or normalized,
+            'confidence': confidence,
+            'rules': sorted(set(rules))
+        }
+
+    def _known_title(self, text):
+        return bool(text) and self.vocabulary is not None and self.vocabulary.known_phrase('title', text) is not None
+
+    def _known_core(self, core):
+        """Whether an ambiguous qualifier may go: the rest is a known title that isn't one generic role noun"""
+        if not core or core.lower() in GENERIC_TITLE_WORDS:
+            return False
+        return self._known_title(core) or self._known_title(CREDENTIAL_TITLES.get(core.upper()))
+
+    @staticmethod
+    def _strip_qualifiers(text, ambiguous):
+        """Peel qualifiers off both ends; returns (rest, rule names, whether an ambiguous one was removed)"""
+        rules = []
+        used_ambiguous = False
+        changed = True
+        while changed and text:
+            changed = False
+            for name, is_ambiguous, edge in QUALIFIER_EDGES:
+                if is_ambiguous and not ambiguous:
+                    continue
+                stripped = edge.sub('', text, count=1).strip()
+                if stripped != text:
+                    text = stripped
+                    rules.append(name)
+                    used_ambiguous = used_ambiguous or is_ambiguous
+                    changed = True
+                    break
+        return text, rules, used_ambiguous
+
+    def _confidence(self, normalized, ambiguous):
+        if not normalized or len(normalized) < 2:
+            return 0.0
+
+        words = [word for word in normalized.replace('/', ' ').replace('&', ' ').split()
+                 if word.lower() not in LOWERCASE_WORDS]
+        if not words:
+            return 0.0
+        if self.vocabulary is not None:
+            known = sum(1 for word in words if self.vocabulary.known_word(word.lower()))
+            confidence = 0.4 + 0.5 * known / len(words)
+        else:
+            confidence = 0.7
+        if len(words) > 5:
+            confidence -= 0.2
+        if ambiguous:
+            confidence -= 0.2
+        if len(words) > 1 and words[0].lower() in HEAD_NOUNS and words[1].lower() != 'of':
+            confidence -= 0.3
+        if any(char.isdigit() for char in normalized):
+            confidence -= 0.1
+        return round(max(0.0, min(1.0, confidence)), 2)
+
+    def is_confident(self, result, min_confidence=TITLE_NORMALIZER_MIN_CONFIDENCE):
+        return result['confidence'] >= min_confidence
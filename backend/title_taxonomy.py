@@ -0,0 +1,134 @@
+"""
+Canonical job-title taxonomy.
+
+data/job_titles.json lists each canonical title with a stable id, a job
+family, linked industries and known aliases. Every spelling we see ("RN",
+"Registered Nurse - Nights", "Staff RN II") resolves to one id through the
+alias index, optionally after rule-based cleanup, so caches and matching
+key on ids instead of raw strings. Aliases are only true synonyms and
+abbreviations; related but distinct roles (EMT and Paramedic, Store Manager
+and Assistant Store Manager) are separate entries linked through their
+family. Title-to-title similarity is computed once per id pair at startup
+rather than embedded per request.
+"""
+import json
+import os
+import threading
+from functools import lru_cache
+
+import numpy as np
+
+from locations import DATA_DIR
+from typeahead import normalize
+
+JOB_TITLES_PATH = os.path.join(DATA_DIR, 'job_titles.json')
+
+# Prefixes that don't change which role a title names
+SENIORITY_PREFIXES = ('senior', 'sr', 'junior', 'jr', 'lead', 'staff', 'principal', 'chief', 'head', 'entry level')
+SENIORITY_DISPLAY = {'sr': 'Senior', 'jr': 'Junior'}
+
+# Id-pair similarity floors when embeddings say less
+SAME_FAMILY_SIMILARITY = 0.75
+SHARED_INDUSTRY_SIMILARITY = 0.3
+UNRELATED_SIMILARITY = 0.1
+# Distinct ids never score as an exact match
+MAX_DISTINCT_SIMILARITY = 0.95
+
+
+@lru_cache(maxsize=1)
+def get_job_titles():
+    with open(JOB_TITLES_PATH, encoding='utf-8') as f:
+        return json.load(f)
+
+
+class TitleTaxonomy:
+    """Alias index over canonical titles plus a precomputed id-pair similarity table"""
+
+    def __init__(self, entries=None, normalize_title=None):
+        # normalize_title: optional callable raw title -> cleaned title, tried when the raw text isn't an alias
+        self.entries = list(entries if entries is not None else get_job_titles())
+        self.normalize_title = normalize_title
+        self.by_id = {entry['id']: entry for entry in self.entries}
+        self.aliases = {}
+        for entry in self.entries:
+            for text in [entry['title']] + entry.get('aliases', []):
+                self.aliases.setdefault(normalize(text), entry['id'])
+
+        self.positions = {entry['id']: i for i, entry in enumerate(self.entries)}
+        self.similarities = self._base_similarities()
+        self.lock = threading.Lock()
+        self.resolve = lru_cache(maxsize=20000)(self._resolve)
+
+    def _base_similarities(self):
+        size = len(self.entries)
+        matrix = np.full((size, size), UNRELATED_SIMILARITY)
+        for i, first in enumerate(self.entries):
+            for j, second in enumerate(self.entries):
+                if i == j:
+                    matrix[i, j] = 1.0
+                elif first['family'] == second['family']:
+                    matrix[i, j] = SAME_FAMILY_SIMILARITY
+                elif set(first['industries']) & set(second['industries']):
+                    matrix[i, j] = SHARED_INDUSTRY_SIMILARITY
+        return matrix
+
+    def precompute_similarity(self, vector_fn):
+        """Raise id-pair similarities to the cosine of title embeddings where that is higher"""
+        vectors = np.asarray([vector_fn(entry['title']) for entry in self.entries], dtype=np.float64)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms == 0, 1, norms)
+        cosine = np.clip(vectors @ vectors.T, 0.0, MAX_DISTINCT_SIMILARITY)
+        matrix = np.maximum(self._base_similarities(), cosine)
+        np.fill_diagonal(matrix, 1.0)
+        with self.lock:
+            self.similarities = matrix
+
+    def _lookup(self, text):
+        """(title id, seniority prefix it was found under) or (None, None)"""
+        key = normalize(text)
+        if key in self.aliases:
+            return self.aliases[key], None
+        for prefix in SENIORITY_PREFIXES:
+            if key.startswith(prefix + ' ') and key[len(prefix) + 1:] in self.aliases:
+                return self.aliases[key[len(prefix) + 1:]], prefix
+        return None, None
+
+    def _match(self, text):
+        if not text:
+            return None, None
+        title_id, prefix = self._lookup(text)
+        if title_id is None and self.normalize_title is not None:
+            title_id, prefix = self._lookup(self.normalize_title(text))
+        return self.by_id.get(title_id), prefix
+
+    def _resolve(self, text):
+        """Canonical entry for a title, or None; seniority doesn't change the id"""
+        return self._match(text)[0]
+
+    def display_title(self, text):
+        """
+        The canonical title for text with its seniority kept ("Sr Accountant" ->
+        "Senior Accountant"), or None when text doesn't resolve.
+        """
+        entry, prefix = self._match(text)
+        if entry is None:
+            return None
+        if prefix is None:
+            return entry['title']
+        return f"{SENIORITY_DISPLAY.get(prefix, prefix.title())} {entry['title']}"
+
+    def get(self, title_id):
+        return self.by_id.get(title_id)
+
+    def similarity(self, first_id, second_id):
+        with self.lock:
+            return float(self.similarities[self.positions[first_id], self.positions[second_id]])
+
+    def get_stats(self):
+        info = self.resolve.cache_info()
+        return {
+            'titles': len(self.entries),
+            'aliases': len(self.aliases),
+            'resolveHits': info.hits,
+            'resolveMisses': info.misses
+        }
@@ -0,0 +1,39 @@
+"""
+Exact top-k selection with branch-and-bound pruning.
+
+Candidates are visited in order of a cheap upper bound on their score.
+Once k candidates are held, any candidate whose bound can't beat the
+weakest of them is skipped, and so is everything after it, because the
+bounds only decrease. The result is identical to scoring everything and
+sorting (score descending, ties in input order), provided the bound is
+never below the true score.
+"""
+import heapq
+
+
+def top_k(candidates, k, upper_bound, score):
+    """
+    Return ([(index, score)], evaluated) for the k best candidates.
+    upper_bound(candidate) must be >= score(candidate) for every candidate.
+    """
+    if k <= 0:
+        return [], 0
+    order = sorted(
+        ((upper_bound(candidate), i) for i, candidate in enumerate(candidates)),
+        key=lambda item: (-item[0], item[1])
+    )
+
+    best = []  # min-heap of (score, -index): the weakest kept candidate on top
+    evaluated = 0
+    for bound, i in order:
+        if len(best) == k and (bound, -i) < best[0]:
+            break
+        item = (score(candidates[i]), -i)
+        evaluated += 1
+        if len(best) < k:
+            heapq.heappush(best, item)
+        elif item > best[0]:
+            heapq.heapreplace(best, item)
+
+    ranked = sorted(best, reverse=True)
+    return [(-negative_index, value) for value, negative_index in ranked], evaluated
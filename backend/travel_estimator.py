@@ -0,0 +1,139 @@
+"""
+Offline travel-time estimates.
+
+Durations come from straight-line (haversine) distance scaled by a per-mode
+road-circuity factor and a per-mode speed profile. Each mode can be
+calibrated against real answers we've already paid for, so estimates drift
+toward what the directions API reports for our users. Estimates are
+instant and cost nothing upstream, which makes them usable both as a fast
+path for feeds and as a fallback when SerpApi is slow or out of quota.
+"""
+import os
+import re
+import threading
+from collections import deque
+
+METERS_PER_MILE = 1609.344
+
+# Straight-line to network distance multipliers
+CIRCUITY_FACTORS = {
+    'driving': 1.3,
+    'transit': 1.4,
+    'walking': 1.25,
+}
+
+# (network distance up to meters, average speed in km/h) bands, plus a fixed overhead in seconds
+SPEED_PROFILES = {
+    'driving': {'bands': [(3000, 25), (15000, 40), (50000, 65), (None, 90)], 'overhead': 120},
+    'transit': {'bands': [(5000, 15), (30000, 22), (None, 35)], 'overhead': 600},
+    'walking': {'bands': [(None, 4.8)], 'overhead': 0},
+}
+
+CALIBRATION_ENABLED = os.getenv('TRAVEL_ESTIMATE_CALIBRATE', 'true').lower() in ('1', 'true', 'yes')
+CALIBRATION_MIN_SAMPLES = int(os.getenv('TRAVEL_ESTIMATE_MIN_SAMPLES', '10'))
+CALIBRATION_WINDOW = 500
+CALIBRATION_BOUNDS = (0.5, 2.0)
+
+
+def parse_duration(text):
+    """Convert a Google-style duration ("1 hr 5 min", "25 mins", "2 days") to seconds"""
+    if not text or text == 'N/A':
+        return None
+    units = {'day': 86400, 'hour': 3600, 'hr': 3600, 'min': 60, 'sec': 1, 's': 1}
+    total = 0
+    found = False
+    for amount, unit in re.findall(r'(\d+(?:\.\d+)?)\s*(day|hour|hr|min|sec|s)', text.lower()):
+        total += float(amount) * units[unit]
+        found = True
+    return int(total) if found else None
+
+
+def format_duration(seconds):
+    minutes = max(1, int(round(seconds / 60)))
+    if minutes < 60:
+        return f"{minutes} min"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours} hr {minutes} min" if minutes else f"{hours} hr"
+
+
+def format_distance(meters):
+    miles = meters / METERS_PER_MILE
+    if miles < 0.1:
+        return f"{int(round(meters * 3.28084))} ft"
+    return f"{miles:.1f} mi"
+
+
+def _travel_seconds(mode, network_m):
+    """Integrate the speed bands for a mode over a network distance"""
+    profile = SPEED_PROFILES[mode]
+    seconds = profile['overhead']
+    covered = 0.0
+    for limit, speed_kmh in profile['bands']:
+        segment_end = network_m if limit is None else min(network_m, limit)
+        if segment_end > covered:
+            seconds += (segment_end - covered) / (speed_kmh * 1000 / 3600)
+            covered = segment_end
+        if covered >= network_m:
+            break
+    return seconds
+
+
+class TravelTimeEstimator:
+    """Per-mode duration estimates with optional calibration from real answers"""
+
+    def __init__(self):
+        self.ratios = {mode: deque(maxlen=CALIBRATION_WINDOW) for mode in SPEED_PROFILES}
+        self.lock = threading.Lock()
+
+    def calibration(self, mode):
+        """Median real/estimated ratio for a mode, or 1.0 until there are enough samples"""
+        if not CALIBRATION_ENABLED:
+            return 1.0
+        with self.lock:
+            ratios = sorted(self.ratios[mode])
+        if len(ratios) < CALIBRATION_MIN_SAMPLES:
+            return 1.0
+        low, high = CALIBRATION_BOUNDS
+        return min(high, max(low, ratios[len(ratios) // 2]))
+
+    def estimate(self, mode, distance_m):
+        """Estimate one mode from straight-line distance in meters"""
+        network_m = float(distance_m) * CIRCUITY_FACTORS[mode]
+        seconds = _travel_seconds(mode, network_m) * self.calibration(mode)
+        return {
+            'duration': format_duration(seconds),
+            'distance': format_distance(network_m),
+            'estimated': True
+        }
+
+    def estimate_all(self, distance_m, modes=None):
+        return {mode: self.estimate(mode, distance_m) for mode in (modes or SPEED_PROFILES)}
+
+    def observe(self, mode, distance_m, duration_text):
+        """Record a real answer so future estimates for this mode are calibrated"""
+        if mode not in self.ratios or not distance_m:
+            return
+        real = parse_duration(duration_text)
+        if not real:
+            return
+        predicted = _travel_seconds(mode, float(distance_m) * CIRCUITY_FACTORS[mode])
+        with self.lock:
+            self.ratios[mode].append(real / predicted)
+
+    def fill_missing(self, distance_m, results):
+        """Replace N/A modes with estimates, in place"""
+        for mode, result in results.items():
+            if result.get('duration') == 'N/A' and mode in SPEED_PROFILES:
+                results[mode] = self.estimate(mode, distance_m)
+        return results
+
+    def get_stats(self):
+        with self.lock:
+            samples = {mode: len(ratios) for mode, ratios in self.ratios.items()}
+        return {
+            mode: {'samples': count, 'calibration': round(self.calibration(mode), 3)}
+            for mode, count in samples.items()
+        }
+
+
+estimator = TravelTimeEstimator()
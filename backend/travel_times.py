@@ -0,0 +1,193 @@
+"""
+Travel-time lookups shared by the /travel-times endpoints.
+
+Directions for each mode are fetched concurrently, and answers are cached by
+(origin cell, destination cell, mode, arrival-time bucket). Coordinates are
+snapped to a configurable grid so users near the same job share answers.
+"""
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from cache_store import PersistentTTLCache
+
+TRAVEL_MODES = ['driving', 'transit', 'walking']
+
+# Grid size in degrees (0.005 is roughly 500m) and arrival-time bucket in seconds
+TRAVEL_GRID_DEGREES = float(os.getenv('TRAVEL_GRID_DEGREES', '0.005'))
+TRAVEL_ARRIVAL_BUCKET_SECONDS = int(os.getenv('TRAVEL_ARRIVAL_BUCKET_SECONDS', '900'))
+TRAVEL_CACHE_TTL = int(os.getenv('TRAVEL_CACHE_TTL', str(6 * 60 * 60)))
+
+NOT_AVAILABLE = {'duration': 'N/A', 'distance': 'N/A'}
+
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv('TRAVEL_MAX_WORKERS', '12')),
+    thread_name_prefix='travel'
+)
+
+
+def grid_cell(lat, lng, grid=TRAVEL_GRID_DEGREES):
+    """Snap a coordinate to its grid cell id"""
+    return f"{math.floor(float(lat) / grid)}:{math.floor(float(lng) / grid)}"
+
+
+def cell_center(cell, grid=TRAVEL_GRID_DEGREES):
+    """Approximate coordinate for a grid cell id"""
+    lat_index, lng_index = (int(part) for part in cell.split(':'))
+    return (lat_index + 0.5) * grid, (lng_index + 0.5) * grid
+
+
+def arrival_bucket(arrival_time, mode, bucket_seconds=TRAVEL_ARRIVAL_BUCKET_SECONDS):
+    """Bucket an arrival time (unix seconds); walking times don't depend on it"""
+    if mode == 'walking':
+        return 'any'
+    if not arrival_time:
+        return 'now'
+    try:
+        return str(int(float(arrival_time)) // bucket_seconds)
+    except (TypeError, ValueError):
+        return str(arrival_time)
+
+
+def cache_key(origin, destination, mode, arrival_time):
+    return '|'.join([
+        grid_cell(*origin),
+        grid_cell(*destination),
+        mode,
+        arrival_bucket(arrival_time, mode)
+    ])
+
+
+class TravelTimeCache:
+    """Coordinate-bucket cache of per-mode travel times"""
+
+    def __init__(self, ttl=TRAVEL_CACHE_TTL, store=None):
+        self.ttl = ttl
+        self.store = store or PersistentTTLCache('travel_times')
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def get(self, origin, destination, mode, arrival_time):
+        value, stored_at = self.store.get(cache_key(origin, destination, mode, arrival_time))
+        hit = value is not None and time.time() - stored_at < self.ttl
+        with self.lock:
+            self.stats['hits' if hit else 'misses'] += 1
+        return value if hit else None
+
+    def set(self, origin, destination, mode, arrival_time, result):
+        self.store.set(cache_key(origin, destination, mode, arrival_time), result)
+
+    def get_stats(self):
+        with self.lock:
+            return dict(self.stats)
+
+
+travel_cache = TravelTimeCache()
+
+
+def cached_answers():
+    """Yield (origin, destination, mode, result) for every cached travel time"""
+    for key, value, _ in travel_cache.store.items():
+        try:
+            origin_cell, destination_cell, mode, _ = key.split('|')
+            yield cell_center(origin_cell), cell_center(destination_cell), mode, value
+        except ValueError:
+            continue
+
+
+def get_travel_times(origin, destination, arrival_time, fetch_mode, modes=TRAVEL_MODES, on_fetched=None):
+    """
+    Return {mode: {'duration', 'distance'}} for an origin/destination pair.
+    fetch_mode(mode) does the upstream call and returns a result dict or None;
+    cached modes are answered locally and the rest are fetched concurrently.
+    on_fetched(mode, result) is called only for answers fetched upstream by this call.
+    """
+    results = {}
+    futures = {}
+    for mode in modes:
+        cached = travel_cache.get(origin, destination, mode, arrival_time)
+        if cached is not None:
+            results[mode] = cached
+        else:
+            futures[mode] = _executor.submit(fetch_mode, mode)
+
+    for mode, future in futures.items():
+        try:
+            result = future.result()
+        except Exception as e:
+            print(f"Error getting {mode} directions: {str(e)}")
+            result = None
+
+        if result:
+            travel_cache.set(origin, destination, mode, arrival_time, result)
+            results[mode] = result
+            if on_fetched:
+                on_fetched(mode, result)
+        else:
+            results[mode] = dict(NOT_AVAILABLE)
+
+    return {mode: results[mode] for mode in modes}
+
+
+# The Distance Matrix API accepts at most 25 destinations per origin per request
+MATRIX_BATCH_SIZE = 25
+
+
+def get_travel_time_matrix(origin, destinations, arrival_time, fetch_mode, batch_fetch=None, modes=TRAVEL_MODES,
+                           on_fetched=None):
+    """
+    Return {destination_id: {mode: result}} for one origin and many destinations.
+
+    destinations is a list of (destination_id, (lat, lng)). Cached cells are
+    answered locally. Misses go to batch_fetch(mode, coords) -> [result or None]
+    when a batch client is available, otherwise fetch_mode(destination, mode)
+    is called concurrently for each missing pair. on_fetched(destination_id,
+    mode, result) is called only for answers fetched upstream by this call.
+    """
+    results = {dest_id: {} for dest_id, _ in destinations}
+    misses = {mode: [] for mode in modes}
+    for dest_id, dest in destinations:
+        for mode in modes:
+            cached = travel_cache.get(origin, dest, mode, arrival_time)
+            if cached is not None:
+                results[dest_id][mode] = cached
+            else:
+                misses[mode].append((dest_id, dest))
+
+    futures = []
+    for mode, pending in misses.items():
+        if not pending:
+            continue
+        if batch_fetch:
+            for start in range(0, len(pending), MATRIX_BATCH_SIZE):
+                chunk = pending[start:start + MATRIX_BATCH_SIZE]
+                future = _executor.submit(batch_fetch, mode, [dest for _, dest in chunk])
+                futures.append((future, mode, chunk))
+        else:
+            for dest_id, dest in pending:
+                future = _executor.submit(lambda d=dest, m=mode: [fetch_mode(d, m)])
+                futures.append((future, mode, [(dest_id, dest)]))
+
+    for future, mode, chunk in futures:
+        try:
+            answers = future.result()
+        except Exception as e:
+            print(f"Error getting {mode} travel times: {str(e)}")
+            answers = []
+
+        for index, (dest_id, dest) in enumerate(chunk):
+            result = answers[index] if index < len(answers) else None
+            if result:
+                travel_cache.set(origin, dest, mode, arrival_time, result)
+                results[dest_id][mode] = result
+                if on_fetched:
+                    on_fetched(dest_id, mode, result)
+            else:
+                results[dest_id][mode] = dict(NOT_AVAILABLE)
+
+    return {
+        dest_id: {mode: by_mode[mode] for mode in modes}
+        for dest_id, by_mode in results.items()
+    }
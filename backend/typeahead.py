@@ -0,0 +1,106 @@
+"""
+In-memory typeahead over industries, job titles and skills.
+
+Every entry is indexed under its normalized text and under each word-start
+suffix ("nurse practitioner" is also findable as "practitioner"), kept in a
+sorted list per kind. A query is one bisect to the first key with that
+prefix plus a short scan, so prefix and infix completion answer in well
+under a millisecond. Multi-word queries match word by word, so "soft eng"
+finds "Software Engineer". Results rank whole-text prefix matches first,
+then by popularity, which grows as postings are ingested.
+"""
+import bisect
+import heapq
+import re
+import threading
+
+TYPEAHEAD_KINDS = ('industry', 'title', 'skill')
+MAX_SCAN = 5000
+
+
+def normalize(text):
+    return ' '.join(re.sub(r'[^\w\s+#./-]', ' ', str(text or '').lower()).split())
+
+
+def word_suffixes(key):
+    """The key itself plus every suffix starting at a later word"""
+    words = key.split(' ')
+    return [' '.join(words[i:]) for i in range(len(words))]
+
+
+class TypeaheadIndex:
+    """Prefix/infix completion with popularity ranking, one sorted key list per kind"""
+
+    def __init__(self, kinds=TYPEAHEAD_KINDS):
+        self.entries = {kind: {} for kind in kinds}  # key -> {'text', 'popularity', 'tags'}
+        self.keys = {kind: [] for kind in kinds}  # sorted (suffix, key, starts_text)
+        self.lock = threading.Lock()
+
+    def add(self, kind, text, popularity=1.0, tags=(), aliases=()):
+        """Add an entry or bump its popularity; aliases complete to the same entry"""
+        key = normalize(text)
+        if not key:
+            return
+        with self.lock:
+            entry = self.entries[kind].get(key)
+            if entry is None:
+                entry = {'text': text.strip(), 'popularity': 0.0, 'tags': set()}
+                self.entries[kind][key] = entry
+                self._insert_keys(kind, key, key)
+            entry['popularity'] += popularity
+            entry['tags'].update(tag for tag in tags if tag)
+            for alias in aliases:
+                alias_key = normalize(alias)
+                if alias_key and alias_key != key:
+                    self._insert_keys(kind, alias_key, key)
+
+    def _insert_keys(self, kind, indexed, key):
+        keys = self.keys[kind]
+        for i, suffix in enumerate(word_suffixes(indexed)):
+            item = (suffix, key, i == 0)
+            position = bisect.bisect_left(keys, item)
+            if position == len(keys) or keys[position] != item:
+                keys.insert(position, item)
+
+    def search(self, kind, query, limit=10, tag=None):
+        """Return up to limit entries matching query as a prefix of the text or of any later word"""
+        query = normalize(query)
+        with self.lock:
+            entries = self.entries[kind]
+            if not query:
+                candidates = {key: False for key in entries}
+            else:
+                # Bisect on the first word; later query words must prefix the following words
+                words = query.split(' ')
+                keys = self.keys[kind]
+                candidates = {}
+                position = bisect.bisect_left(keys, (words[0],))
+                end = min(len(keys), position + MAX_SCAN)
+                while position < end and keys[position][0].startswith(words[0]):
+                    suffix, key, starts_text = keys[position]
+                    position += 1
+                    if len(words) > 1:
+                        suffix_words = suffix.split(' ')
+                        if len(suffix_words) < len(words) or not all(
+                                word.startswith(part) for word, part in zip(suffix_words, words)):
+                            continue
+                    candidates[key] = candidates.get(key, False) or starts_text
+
+            ranked = heapq.nsmallest(
+                limit,
+                candidates.items(),
+                key=lambda item: (
+                    tag is not None and tag not in entries[item[0]]['tags'],
+                    not item[1],
+                    -entries[item[0]]['popularity'],
+                    item[0]
+                )
+            )
+            return [
+                {'text': entries[key]['text'], 'popularity': round(entries[key]['popularity'], 2)}
+                for key, _ in ranked
+            ]
+
+    def get_stats(self):
+        with self.lock:
+            return {kind: len(entries) for kind, entries in self.entries.items()}
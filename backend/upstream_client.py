@@ -0,0 +1,167 @@
+"""
+Shared client layer for slow upstream APIs (SerpApi, OpenAI).
+
+Every upstream call goes through call_upstream(), which records per-route
+latency and can optionally hedge: if the first attempt has not answered by
+the route's observed p95, a duplicate is fired and whichever returns first
+wins. A global token bucket caps the hedge rate so quota use stays bounded.
+"""
+import math
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+HEDGE_ENABLED = os.getenv('HEDGE_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+HEDGE_MAX_RATE = float(os.getenv('HEDGE_MAX_RATE', '0.05'))  # Max fraction of calls that may be hedged
+HEDGE_BURST = float(os.getenv('HEDGE_BURST', '5'))  # Max hedges that can be saved up
+HEDGE_PERCENTILE = float(os.getenv('HEDGE_PERCENTILE', '0.95'))
+HEDGE_MIN_SAMPLES = int(os.getenv('HEDGE_MIN_SAMPLES', '20'))  # Don't hedge until p95 is meaningful
+LATENCY_WINDOW = int(os.getenv('HEDGE_LATENCY_WINDOW', '200'))
+
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv('UPSTREAM_MAX_WORKERS', '16')),
+    thread_name_prefix='upstream'
+)
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies per route"""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.window = window
+        self.samples = {}
+        self.lock = threading.Lock()
+
+    def record(self, route, seconds):
+        with self.lock:
+            if route not in self.samples:
+                self.samples[route] = deque(maxlen=self.window)
+            self.samples[route].append(seconds)
+
+    def percentile(self, route, pct, min_samples=HEDGE_MIN_SAMPLES):
+        """Return the pct latency for a route, or None while there are too few samples"""
+        with self.lock:
+            samples = sorted(self.samples.get(route, ()))
+        if len(samples) < max(1, min_samples):
+            return None
+        index = min(len(samples) - 1, math.ceil(pct * len(samples)) - 1)
+        return samples[max(0, index)]
+
+    def routes(self):
+        with self.lock:
+            return list(self.samples.keys())
+
+
+class HedgeBudget:
+    """Token bucket shared by all routes: each call earns HEDGE_MAX_RATE tokens, each hedge spends one"""
+
+    def __init__(self, rate=HEDGE_MAX_RATE, burst=HEDGE_BURST):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = 0.0
+        self.calls = 0
+        self.hedges = 0
+        self.lock = threading.Lock()
+
+    def earn(self):
+        with self.lock:
+            self.calls += 1
+            self.tokens = min(self.burst, self.tokens + self.rate)
+
+    def try_spend(self):
+        with self.lock:
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                self.hedges += 1
+                return True
+            return False
+
+
+latency_tracker = LatencyTracker()
+hedge_budget = HedgeBudget()
+_route_stats = {}
+_stats_lock = threading.Lock()
+
+
+def _bump(route, key):
+    with _stats_lock:
+        stats = _route_stats.setdefault(route, {'calls': 0, 'hedged': 0, 'hedgeWins': 0, 'errors': 0})
+        stats[key] += 1
+
+
+def call_upstream(route, fn, *args, hedge=True, **kwargs):
+    """
+    Call fn(*args, **kwargs) for the given route, hedging stragglers when enabled.
+    Exceptions from fn propagate to the caller exactly as a direct call would.
+    """
+    _bump(route, 'calls')
+    start = time.monotonic()
+
+    def record_latency(future):
+        if not future.cancelled() and future.exception() is None:
+            latency_tracker.record(route, time.monotonic() - start)
+
+    delay = latency_tracker.percentile(route, HEDGE_PERCENTILE) if HEDGE_ENABLED and hedge else None
+    if delay is None:
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            _bump(route, 'errors')
+            raise
+        latency_tracker.record(route, time.monotonic() - start)
+        return result
+
+    hedge_budget.earn()
+    primary = _executor.submit(fn, *args, **kwargs)
+    primary.add_done_callback(record_latency)
+
+    done, _ = wait([primary], timeout=delay)
+    if done or not hedge_budget.try_spend():
+        try:
+            return primary.result()
+        except Exception:
+            _bump(route, 'errors')
+            raise
+
+    print(f"Hedging {route}: no answer after {delay:.2f}s")
+    _bump(route, 'hedged')
+    backup = _executor.submit(fn, *args, **kwargs)
+    pending = [primary, backup]
+    while pending:
+        done, not_done = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                if future is backup:
+                    _bump(route, 'hedgeWins')
+                return future.result()
+        pending = list(not_done)
+
+    # Both attempts failed; surface the primary's error
+    _bump(route, 'errors')
+    return primary.result()
+
+
+def get_upstream_stats():
+    """Snapshot of per-route latency and hedging counters"""
+    routes = {}
+    with _stats_lock:
+        counters = {route: dict(stats) for route, stats in _route_stats.items()}
+    for route in set(counters) | set(latency_tracker.routes()):
+        stats = counters.get(route, {'calls': 0, 'hedged': 0, 'hedgeWins': 0, 'errors': 0})
+        p50 = latency_tracker.percentile(route, 0.5, min_samples=1)
+        p95 = latency_tracker.percentile(route, 0.95, min_samples=1)
+        stats['p50'] = round(p50, 3) if p50 is not None else None
+        stats['p95'] = round(p95, 3) if p95 is not None else None
+        routes[route] = stats
+
+    with hedge_budget.lock:
+        calls, hedges = hedge_budget.calls, hedge_budget.hedges
+
+    return {
+        'hedgingEnabled': HEDGE_ENABLED,
+        'maxHedgeRate': HEDGE_MAX_RATE,
+        'hedgeRate': round(hedges / calls, 4) if calls else 0.0,
+        'routes': routes
+    }